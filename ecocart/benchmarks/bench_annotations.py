@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Per-frame annotation cost: previous draw_annotations vs cached in-place rendering
+
+720p frames with 20 detections per frame against a cart of 30 confirmed
+items. The previous path copied the frame, re-parsed and re-filtered every
+box and scanned the whole inventory per box to pick its color.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.catalog import SkuCatalog
+from src.ecocart.config import Config
+from src.ecocart.inference import Boxes, Detections
+from src.ecocart.main import DetectedItem, GroceryCartTracker
+from src.ecocart.matching import to_numpy
+from src.ecocart.utils.stats import StageStats
+
+FRAMES = 500
+DETECTIONS = 20
+CART_ITEMS = 30
+NAMES = {idx: f"item_{idx}" for idx in range(40)}
+
+
+def previous_draw_annotations(tracker, frame, results):
+    """draw_annotations before the cached renderer, kept here as the baseline"""
+    annotated_frame = frame.copy()
+    for box in results.boxes:
+        conf = float(box.conf[0])
+        if conf < tracker.config.CONFIDENCE_THRESHOLD:
+            continue
+        cls = int(box.cls[0])
+        label = tracker.model.names[cls]
+        catalog_item = tracker.catalog.get(label)
+        if catalog_item is None:
+            continue
+        x1, y1, x2, y2 = map(int, tracker.roi.to_frame(to_numpy(box.xyxy[0])))
+        color = (
+            (0, 255, 0)
+            if any(item.confirmed and item.label == label for item in tracker.cart_inventory.values())
+            else (0, 165, 255)
+        )
+        cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(annotated_frame, f"{label} ({catalog_item.sku}) {conf:.2f}", (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    cv2.putText(annotated_frame, f"Cart: {tracker.config.CART_ID}", (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    cv2.putText(annotated_frame, f"Items: {len(tracker.cart_inventory)}", (10, 55),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    return annotated_frame
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    xy = rng.uniform(0, 1100, (DETECTIONS, 2))
+    results = Detections(
+        Boxes(np.hstack([xy, xy + 120]).astype(np.float32), rng.uniform(0.3, 0.95, DETECTIONS).astype(np.float32),
+              rng.integers(0, len(NAMES), DETECTIONS).astype(np.float32)),
+        NAMES, frame.shape[:2],
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sku_map_path = os.path.join(temp_dir, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({name: {"sku": f"SKU{idx:05d}", "price": 1.0} for idx, name in NAMES.items()}, f)
+
+        def load_dependencies(tracker):
+            tracker.catalog = SkuCatalog(sku_map_path)
+            tracker.model = SimpleNamespace(names=NAMES)
+            tracker.api_client = Mock()
+
+        with patch.object(GroceryCartTracker, "load_dependencies", load_dependencies):
+            tracker = GroceryCartTracker(Config(DISPLAY_WINDOW=False, LOG_LEVEL="WARNING"))
+        for track_id in range(CART_ITEMS):
+            label = NAMES[track_id % 20]
+            tracker.cart_inventory[track_id] = DetectedItem(label, "SKU", 0.9, (0, 0, 1, 1), 0.0, confirmed=True)
+            tracker.cart_labels[label] += 1
+        tracker.process_detections(results, 0.0)
+
+        runs = [
+            ("previous", lambda: previous_draw_annotations(tracker, frame, results)),
+            ("buffer", lambda: tracker.draw_annotations(frame)),
+            ("in place", lambda: tracker.draw_annotations(frame, in_place=True)),
+        ]
+        print(f"{FRAMES} frames 1280x720, {DETECTIONS} detections, {CART_ITEMS} cart items")
+        print(f"{'render':>10}  {'avg (ms)':>8}  {'p95 (ms)':>8}")
+        for name, draw in runs:
+            stats = StageStats(window=FRAMES)
+            for _ in range(FRAMES):
+                start = time.perf_counter()
+                draw()
+                stats.record(time.perf_counter() - start)
+            snapshot = stats.snapshot()
+            print(f"{name:>10}  {snapshot['avg_ms']:>8.3f}  {snapshot['p95_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+/health latency while slow /item_info calls are in flight, blocking the event loop vs offloaded
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from fastapi import FastAPI, Request
+
+from src.ecocart.api.executors import create_executors
+from src.ecocart.api.routers import cart_router, health_router
+from src.ecocart.utils.stats import StageStats
+
+LLM_DELAY = 0.3  # seconds per simulated LLM call
+SLOW_REQUESTS = 8
+PROBES = 50
+PROBE_INTERVAL = 0.01  # seconds between /health probes
+
+
+class SlowVectorDB:
+    def query(self, query_text):
+        time.sleep(LLM_DELAY)
+        return f"info for {query_text}"
+
+
+def make_app(blocking):
+    app = FastAPI()
+    if blocking:
+        # The handler as it was before: blocking call inside async def
+        @app.get("/item_info/{item_name}")
+        async def get_item_info(item_name: str, request: Request):
+            return {"item_name": item_name, "info": request.app.state.vector_db.query(item_name)}
+    else:
+        app.include_router(cart_router.router)
+    app.include_router(health_router.router)
+    app.state.vector_db = SlowVectorDB()
+    app.state.executors = create_executors()
+    return app
+
+
+async def run(blocking):
+    app = make_app(blocking)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        slow = [asyncio.create_task(client.get(f"/item_info/item{idx}")) for idx in range(SLOW_REQUESTS)]
+
+        # Latency is measured from when each probe was due, so event loop stalls count
+        health = StageStats()
+        start = time.perf_counter()
+        for idx in range(PROBES):
+            due = start + idx * PROBE_INTERVAL
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/health")
+            health.record(time.perf_counter() - due)
+
+        responses = await asyncio.gather(*slow)
+        statuses = sorted({response.status_code for response in responses})
+    return health.snapshot(), statuses
+
+
+def main():
+    print(f"{SLOW_REQUESTS} concurrent /item_info calls, {LLM_DELAY * 1000:.0f} ms each")
+    for name, blocking in (("blocking", True), ("offloaded", False)):
+        stats, statuses = asyncio.run(run(blocking))
+        print(
+            f"{name:>10}: /health avg {stats['avg_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+            f"max {stats['max_ms']:8.2f} ms  item_info statuses {statuses}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Throughput of single-item /add_item vs batched /cart/{cart_id}/events requests
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.ecocart import database
+from src.ecocart.api.routers import cart_router
+
+TOTAL_EVENTS = 2000
+
+
+def make_event(idx):
+    return {"type": "add", "sku": "SKU00101", "label": "apple", "confidence": 0.9, "timestamp": float(idx)}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database.DATABASE_FILE = os.path.join(temp_dir, "billing.db")
+        database.SKU_MAP_PATH = os.path.join(temp_dir, "sku_map.json")
+        with open(database.SKU_MAP_PATH, "w") as f:
+            json.dump({"apple": {"sku": "SKU00101", "price": 1.50}}, f)
+        database.initialize_db()
+
+        app = FastAPI()
+        app.include_router(cart_router.router)
+        client = TestClient(app)
+
+        start = time.perf_counter()
+        for idx in range(TOTAL_EVENTS):
+            event = make_event(idx)
+            event.pop("type")
+            client.post("/add_item", json={"cart_id": "bench", **event})
+        single = TOTAL_EVENTS / (time.perf_counter() - start)
+        print(f"/add_item, 1 event/request: {single:>9.0f} events/s")
+
+        for batch_size in (1, 10, 100):
+            start = time.perf_counter()
+            for offset in range(0, TOTAL_EVENTS, batch_size):
+                events = [make_event(idx) for idx in range(offset, offset + batch_size)]
+                client.post("/cart/bench/events", json={"events": events})
+            rate = TOTAL_EVENTS / (time.perf_counter() - start)
+            print(f"/events, {batch_size:>3} events/request: {rate:>9.0f} events/s ({rate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Load test: 10k carts updated concurrently through the cart handler
+"""
+import os
+import random
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.api.handlers import cart_handler
+from src.ecocart.api.state import cart_store, get_app_state
+
+CARTS = 10_000
+THREADS = 32
+EVENTS_PER_CART = 20
+SKUS = [(f"SKU{idx:05d}", f"item_{idx}") for idx in range(50)]
+
+
+def shopper(cart_ids, seed):
+    rng = random.Random(seed)
+    for cart_id in cart_ids:
+        in_cart = []
+        for _ in range(EVENTS_PER_CART):
+            if in_cart and rng.random() < 0.3:
+                sku, label = in_cart.pop(rng.randrange(len(in_cart)))
+                cart_handler.remove_item(cart_id, sku, label, time.time())
+            else:
+                sku, label = rng.choice(SKUS)
+                in_cart.append((sku, label))
+                cart_handler.add_item(cart_id, sku, label, 0.9, time.time())
+        cart_handler.get_cart_summary(cart_id)
+        get_app_state()
+
+
+def main():
+    cart_ids = [f"cart_{idx}" for idx in range(CARTS)]
+    threads = [
+        threading.Thread(target=shopper, args=(cart_ids[offset::THREADS], offset))
+        for offset in range(THREADS)
+    ]
+
+    # Billing is exercised by its own benchmark, keep this one on cart state
+    with patch.object(cart_handler, "add_item_to_bill"):
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    total = sum(cart_store.item_count(cart_id) for cart_id in cart_ids)
+    assert total == cart_store.total_items, "global counter drifted from per-cart counts"
+
+    ops = CARTS * (EVENTS_PER_CART + 2)
+    print(f"{CARTS} carts, {THREADS} threads, {ops} operations in {elapsed:.2f}s ({ops / elapsed:,.0f} ops/s)")
+    print(f"items in carts: {cart_store.total_items}")
+
+
+if __name__ == "__main__":
+    main()
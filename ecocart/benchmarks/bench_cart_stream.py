@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Fan-out cost of cart deltas to thousands of server-sent event subscribers
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.api.stream import CartStreamHub, cart_event_stream
+
+EVENTS = 50  # one burst, within the per-client buffer
+SUBSCRIBER_COUNTS = [100, 1000, 5000, 10000]
+
+
+async def consume(stream, done, marker):
+    async for chunk in stream:
+        if marker in chunk:
+            done[0] += 1
+            return
+
+
+async def run(subscribers):
+    hub = CartStreamHub()
+    latest = [-1]
+    done = [0]
+    # A lagging client is resynced with a snapshot, which carries the latest quantity too
+    marker = f'"quantity": {EVENTS - 1},'
+    snapshot = lambda cart_id: {"cart_id": cart_id, "quantity": latest[0], "total": 0.0}
+    streams = [cart_event_stream(hub, "cart_001", snapshot) for _ in range(subscribers)]
+    tasks = [asyncio.create_task(consume(stream, done, marker)) for stream in streams]
+    while hub.subscriber_count("cart_001") < subscribers:
+        await asyncio.sleep(0.01)
+
+    def publish():
+        for n in range(EVENTS):
+            latest[0] = n
+            hub.publish("cart_001", [{"type": "add", "sku": "SKU00101", "quantity": n, "total": n * 1.5}])
+
+    # Publish from a worker thread, as the sync API handlers do
+    start = time.perf_counter()
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    while done[0] < subscribers:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    publisher.join()
+
+    stats = hub.stats()
+    await asyncio.gather(*tasks)
+    return elapsed, stats
+
+
+def main():
+    print(f"{EVENTS} deltas published to one cart")
+    print(f"{'subscribers':>11}  {'total (s)':>9}  {'per delta (ms)':>14}  {'deliveries/s':>12}  {'dropped':>7}")
+    for subscribers in SUBSCRIBER_COUNTS:
+        elapsed, stats = asyncio.run(run(subscribers))
+        print(
+            f"{subscribers:>11}  {elapsed:9.3f}  {elapsed / EVENTS * 1000:14.3f}  "
+            f"{stats['delivered'] / elapsed:12.0f}  {stats['dropped']:7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
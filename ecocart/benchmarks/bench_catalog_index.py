@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+VectorDB startup time: re-embedding the whole catalog vs incremental persistent index
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import chromadb
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.vector_db.index import HashEmbeddingFunction, build_document, sync_collection
+
+
+def make_catalog(size):
+    return {f"item_{idx}": {"sku": f"SKU{idx:07d}", "price": round(0.5 + idx % 100 / 10, 2)} for idx in range(size)}
+
+
+def full_rebuild(sku_map):
+    """The previous startup path: ephemeral client, embed every item"""
+    client = chromadb.EphemeralClient()
+    try:
+        client.delete_collection("catalog")
+    except Exception:
+        pass
+    collection = client.create_collection("catalog", embedding_function=HashEmbeddingFunction())
+    ids = list(sku_map)
+    for start in range(0, len(ids), 1000):
+        batch = ids[start:start + 1000]
+        collection.add(
+            ids=batch,
+            documents=[build_document(item_id, sku_map[item_id]) for item_id in batch],
+            metadatas=[{"name": item_id} for item_id in batch],
+        )
+
+
+def incremental(path, sku_map):
+    client = chromadb.PersistentClient(path=path)
+    collection = client.get_or_create_collection("catalog", embedding_function=HashEmbeddingFunction())
+    return sync_collection(collection, sku_map, os.path.join(path, "manifest.json"))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'full (s)':>9} {'cold (s)':>9} {'warm (s)':>9} {'1% changed (s)':>15}")
+    for size in args.sizes:
+        sku_map = make_catalog(size)
+        with tempfile.TemporaryDirectory() as path:
+            full, _ = timed(full_rebuild, sku_map)
+            cold, _ = timed(incremental, path, sku_map)
+            warm, stats = timed(incremental, path, sku_map)
+            assert stats["embedded"] == 0
+
+            for idx in range(0, size, 100):
+                sku_map[f"item_{idx}"]["price"] += 1
+            changed, stats = timed(incremental, path, sku_map)
+            assert stats["embedded"] == size // 100
+        print(f"{size:>8} {full:>9.2f} {cold:>9.2f} {warm:>9.2f} {changed:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Catalog filter per frame: label lookup per box vs the class id -> SKU table
+
+Times the confidence and catalog-membership mask process_detections builds
+for every frame, once with the previous per-box names[cls] in catalog check
+and once as a single index into the table built at model load.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.catalog import SkuCatalog
+
+NAMES = {idx: f"class_{idx}" for idx in range(80)}
+LOW_CONFIDENCE = 0.1
+
+
+def previous_mask(confs, classes, names, catalog):
+    """Filter before the table, kept here as the baseline"""
+    keep = confs >= LOW_CONFIDENCE
+    keep &= np.fromiter((names[int(cls)] in catalog for cls in classes), dtype=bool, count=len(classes))
+    return keep
+
+
+def table_mask(confs, classes, table):
+    return (confs >= LOW_CONFIDENCE) & table.mapped(classes)
+
+
+def per_frame_us(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boxes", type=int, nargs="+", default=[10, 50, 300])
+    parser.add_argument("--repeats", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "sku_map.json")
+        with open(path, "w") as f:
+            # Half the model's classes are in the catalog
+            json.dump({NAMES[idx]: {"sku": f"SKU{idx:05d}", "price": 1.0} for idx in range(0, 80, 2)}, f)
+        catalog = SkuCatalog(path)
+
+        start = time.perf_counter()
+        table = catalog.class_table(NAMES)
+        print(f"table for {len(NAMES)} classes built in {(time.perf_counter() - start) * 1e6:.0f} us")
+
+        print(f"{'boxes':>6} {'per box (us)':>13} {'table (us)':>11}")
+        for count in args.boxes:
+            confs = rng.random(count, dtype=np.float32)
+            classes = rng.integers(0, len(NAMES), count)
+            assert np.array_equal(previous_mask(confs, classes, NAMES, catalog), table_mask(confs, classes, table))
+            previous = per_frame_us(lambda: previous_mask(confs, classes, NAMES, catalog), args.repeats)
+            vectorized = per_frame_us(lambda: table_mask(confs, classes, table), args.repeats)
+            print(f"{count:>6} {previous:>13.2f} {vectorized:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Concurrent billing inserts/sec: connect-per-call vs pooled WAL connections with group commit
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart import database
+
+THREADS = 8
+INSERTS_PER_THREAD = 250
+
+
+def legacy_add_item_to_bill(item_name):
+    """The original write path: parse the SKU map, connect, insert, commit, close"""
+    item_info = database.get_sku_map()[item_name]
+    conn = sqlite3.connect(database.DATABASE_FILE, timeout=30)
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO billing (item_name, price) VALUES (?, ?)", (item_name, item_info["price"]))
+    conn.commit()
+    conn.close()
+
+
+def run(add_fn):
+    def worker():
+        for _ in range(INSERTS_PER_THREAD):
+            add_fn("apple")
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return THREADS * INSERTS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database.SKU_MAP_PATH = os.path.join(temp_dir, "sku_map.json")
+        with open(database.SKU_MAP_PATH, "w") as f:
+            json.dump({"apple": {"sku": "SKU00101", "price": 1.50}}, f)
+
+        database.DATABASE_FILE = os.path.join(temp_dir, "legacy.db")
+        conn = sqlite3.connect(database.DATABASE_FILE)
+        conn.execute("CREATE TABLE billing (id INTEGER PRIMARY KEY AUTOINCREMENT, item_name TEXT NOT NULL, "
+                     "price REAL NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.close()
+        before = run(legacy_add_item_to_bill)
+
+        database.DATABASE_FILE = os.path.join(temp_dir, "pooled.db")
+        database.initialize_db()
+        transactions = database._writer.transactions
+        after = run(database.add_item_to_bill)
+        transactions = database._writer.transactions - transactions
+        database.close_connections()
+
+    total = THREADS * INSERTS_PER_THREAD
+    print(f"{THREADS} threads x {INSERTS_PER_THREAD} inserts")
+    print(f"connect-per-call:      {before:>9.0f} inserts/s")
+    print(f"pooled + group commit: {after:>9.0f} inserts/s ({after / before:.1f}x, "
+          f"{total / transactions:.1f} inserts/transaction)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tracking parameter sweep over a recorded detection log, no model involved
+
+Records the seeded synthetic session from bench_tracking.py (or replays a
+log recorded with run_tracker.py --record), then replays it once per
+STABILIZATION_FRAMES x REMOVAL_TIMEOUT x IOU_THRESHOLD combination and
+reports the cart events each setting produced and how much faster than real
+time the replay ran.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_tracking import ITEMS, NAMES, TAKEN_OUT, make_session
+from src.ecocart.config import Config
+from src.ecocart.detection_log import DetectionLog, DetectionRecorder
+from src.ecocart.main import GroceryCartTracker
+
+STABILIZATION_FRAMES = (3, 5, 8)
+REMOVAL_TIMEOUT = (1, 3, 5)
+IOU_THRESHOLD = (0.3, 0.5, 0.7)
+
+
+def record_session(path):
+    frames, _, _ = make_session()
+    recorder = DetectionRecorder(path, NAMES)
+    for frame_time, boxes, conf, cls in frames:
+        recorder.append(frame_time, boxes, conf, cls)
+    recorder.close()
+
+
+def replay(log_path, sku_map_path, **overrides):
+    api_client = Mock()
+    api_client.add_item.return_value = True
+    api_client.remove_item.return_value = True
+    config = Config(
+        DISPLAY_WINDOW=False, LOG_LEVEL="WARNING", LABEL_MAP_PATH=sku_map_path,
+        REPLAY_DETECTIONS=log_path, **overrides
+    )
+    with patch("src.ecocart.main.create_api_client", return_value=api_client):
+        tracker = GroceryCartTracker(config)
+    start = time.perf_counter()
+    tracker.replay()
+    return api_client.add_item.call_count, api_client.remove_item.call_count, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracking parameter sweep over recorded detections")
+    parser.add_argument("--log", default=None, help="Recorded detection log (synthetic session if omitted)")
+    parser.add_argument("--sku-map", default=None, help="SKU map covering the log's labels")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = args.log
+        sku_map_path = args.sku_map
+        if log_path is None:
+            log_path = os.path.join(temp_dir, "session")
+            record_session(log_path)
+        if sku_map_path is None:
+            sku_map_path = os.path.join(temp_dir, "sku_map.json")
+            with open(sku_map_path, "w") as f:
+                json.dump({name: {"sku": f"SKU0010{idx}", "price": 1.0} for idx, name in NAMES.items()}, f)
+
+        log = DetectionLog(log_path)
+        print(f"{len(log)} frames, {log.detections} detections, {log.duration:.0f} s recorded")
+        if args.log is None:
+            print(f"expected {ITEMS} adds and {TAKEN_OUT} removes")
+        print(f"{'stab':>4}  {'timeout':>7}  {'iou':>4}  {'adds':>5}  {'removes':>7}  {'replay (ms)':>11}  {'x real time':>11}")
+
+        sweep_start = time.perf_counter()
+        grid = list(itertools.product(STABILIZATION_FRAMES, REMOVAL_TIMEOUT, IOU_THRESHOLD))
+        for stabilization, timeout, iou in grid:
+            adds, removes, elapsed = replay(
+                log_path, sku_map_path,
+                STABILIZATION_FRAMES=stabilization, REMOVAL_TIMEOUT=timeout, IOU_THRESHOLD=iou,
+            )
+            print(f"{stabilization:>4}  {timeout:>7}  {iou:>4}  {adds:>5}  {removes:>7}  "
+                  f"{elapsed * 1000:>11.0f}  {log.duration / elapsed:>11.0f}")
+        total = time.perf_counter() - sweep_start
+        print(f"{len(grid)} settings in {total:.1f} s, {len(grid) * log.duration / total:.0f}x real time overall")
+
+
+if __name__ == "__main__":
+    main()
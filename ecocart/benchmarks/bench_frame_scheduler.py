@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Inference calls under fixed FRAME_SKIP vs motion-adaptive scheduling
+
+Synthetic 640x480 camera feed with sensor noise: a mostly idle cart with a
+few bursts where a hand moves an item through the frame.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.config import Config
+from src.ecocart.scheduler import FrameScheduler
+
+FPS = 30
+SECONDS = 120
+BURSTS = [(10, 14), (40, 43), (75, 82), (100, 102)]  # seconds with motion
+
+
+def make_feed(seed=0):
+    rng = np.random.default_rng(seed)
+    background = rng.integers(40, 200, (480, 640, 3), dtype=np.uint8)
+    for frame_idx in range(FPS * SECONDS):
+        second = frame_idx / FPS
+        frame = background.copy()
+        moving = any(start <= second < end for start, end in BURSTS)
+        if moving:
+            x = int((frame_idx * 12) % 520)
+            frame[180:300, x:x + 120] = (30, 160, 220)
+        noise = rng.integers(-3, 4, frame.shape, dtype=np.int16)
+        yield np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8), moving
+
+
+def run(config):
+    scheduler = FrameScheduler.from_config(config)
+    moving_frames = moving_inferred = 0
+    start = time.perf_counter()
+    for frame, moving in make_feed():
+        inferred = scheduler.should_infer(frame)
+        if moving:
+            moving_frames += 1
+            moving_inferred += inferred
+    elapsed = time.perf_counter() - start
+    return scheduler.get_stats(), moving_inferred / moving_frames, elapsed
+
+
+def main():
+    print(f"{SECONDS} s at {FPS} fps, motion in {sum(end - start for start, end in BURSTS)} s")
+    print(f"{'schedule':>18}  {'inferences':>10}  {'rate':>6}  {'moving covered':>14}  {'scoring p95 (ms)':>16}")
+    configs = [
+        ("fixed skip 2", Config(FRAME_SKIP=2)),
+        ("adaptive 1..15", Config(FRAME_SKIP=2, ADAPTIVE_FRAME_SKIP=True)),
+        ("adaptive 1..30", Config(FRAME_SKIP=2, ADAPTIVE_FRAME_SKIP=True, MAX_FRAME_SKIP=30)),
+    ]
+    for name, config in configs:
+        stats, coverage, _ = run(config)
+        print(
+            f"{name:>18}  {stats['inferences']:>10}  {stats['inference_rate']:>6.3f}  "
+            f"{coverage:>14.1%}  {stats['scoring']['p95_ms']:>16.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Parity and CPU latency of the inference backends against PyTorch ultralytics
+
+Exports MODEL_PATH to ONNX (and an INT8 dynamic-quantized copy) when
+onnxruntime is installed, then runs every backend on the same frames.
+Parity is the share of PyTorch boxes that a backend finds again with the
+same class at IoU >= 0.5, plus the mean confidence difference of those
+matches. "onnx pre/post" runs the exported graph's exact preprocessing
+and decode/NMS on the PyTorch module, so it checks the torch-free code
+path even where onnxruntime is missing.
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.inference import OnnxBackend, export_onnx, ort
+from src.ecocart.matching import extract_detections, iou_matrix
+from src.ecocart.utils.stats import StageStats
+
+
+class TorchGraphBackend(OnnxBackend):
+    """OnnxBackend pre/post-processing around the PyTorch module instead of an ONNX session"""
+
+    def __init__(self, model: YOLO):
+        self.module = model.model.eval()
+        self.names = model.names
+        self.input_shape = [1, 3, "height", "width"]
+        self.conf = 0.25
+        self.iou = 0.7
+
+    def run_graph(self, blob):
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(blob))[0].numpy()
+
+
+def load_frames(video, count):
+    if video is None:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8) for _ in range(count)]
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_backend(model, frames, imgsz, conf):
+    model(frames[0], imgsz=imgsz, conf=conf, verbose=False)  # warm-up
+    stats = StageStats(window=len(frames))
+    detections = []
+    for frame in frames:
+        start = time.perf_counter()
+        results = model(frame, imgsz=imgsz, conf=conf, verbose=False)[0]
+        stats.record(time.perf_counter() - start)
+        detections.append(extract_detections(results))
+    return stats.snapshot(), detections
+
+
+def parity(reference, detections):
+    """(recall of reference boxes, mean |conf difference| of the matches)"""
+    found = total = 0
+    conf_diff = []
+    for (ref_boxes, ref_conf, ref_cls), (boxes, conf, cls) in zip(reference, detections):
+        total += len(ref_boxes)
+        if len(ref_boxes) == 0 or len(boxes) == 0:
+            continue
+        iou = iou_matrix(ref_boxes, boxes)
+        iou[ref_cls[:, None] != cls[None, :]] = 0.0
+        best = iou.argmax(axis=1)
+        hit = iou[np.arange(len(ref_boxes)), best] >= 0.5
+        found += int(np.count_nonzero(hit))
+        conf_diff.extend(np.abs(ref_conf[hit] - conf[best[hit]]).tolist())
+    recall = found / total if total else float("nan")
+    return recall, float(np.mean(conf_diff)) if conf_diff else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference backend parity and CPU latency")
+    parser.add_argument("--model", default="models/yolov8n.pt")
+    parser.add_argument("--video", default=None, help="Recorded cart video (synthetic frames if omitted)")
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25, help="Random-init weights need about 1e-5 to produce boxes")
+    args = parser.parse_args()
+
+    pretrained = os.path.exists(args.model)
+    model = YOLO(args.model if pretrained else "yolov8n.yaml")
+    frames = load_frames(args.video, args.frames)
+
+    backends = [("pytorch", model), ("onnx pre/post", TorchGraphBackend(model))]
+    if ort is None:
+        print("onnxruntime not installed, skipping the onnx and onnx int8 backends")
+    elif pretrained:
+        onnx_path = export_onnx(args.model, imgsz=args.imgsz)
+        backends.append(("onnx", OnnxBackend(onnx_path)))
+        backends.append(("onnx int8", OnnxBackend(export_onnx(args.model, imgsz=args.imgsz, int8=True))))
+    else:
+        print(f"{args.model} not found, skipping export to onnx")
+
+    print(f"{len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]}, imgsz {args.imgsz}, "
+          f"{'weights ' + args.model if pretrained else 'random-init weights'}, {torch.get_num_threads()} threads")
+    print(f"{'backend':>14}  {'avg (ms)':>8}  {'p95 (ms)':>8}  {'boxes':>6}  {'recall':>6}  {'conf diff':>9}")
+
+    reference = None
+    for name, backend in backends:
+        stats, detections = run_backend(backend, frames, args.imgsz, args.conf)
+        if reference is None:
+            reference = detections
+        recall, conf_diff = parity(reference, detections)
+        boxes = sum(len(xyxy) for xyxy, _, _ in detections)
+        print(f"{name:>14}  {stats['avg_ms']:>8.1f}  {stats['p95_ms']:>8.1f}  {boxes:>6}  "
+              f"{recall:>6.1%}  {conf_diff:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
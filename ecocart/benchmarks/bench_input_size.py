@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Inference latency by input size, full frame vs cropped cart ROI
+
+Runs the detector at each imgsz on full frames and on the ROI crop. With real
+weights, detections are also compared against the 640 full-frame reference:
+recall counts reference boxes of the same class found again at IoU >= 0.5.
+Without weights a random-init model is used and only latency is reported.
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.matching import extract_detections, iou_matrix
+from src.ecocart.roi import RegionOfInterest
+from src.ecocart.utils.stats import StageStats
+
+SIZES = (640, 512, 416, 320)
+
+
+def load_frames(video, count):
+    if video is None:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8) for _ in range(count)]
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def detect(model, frames, roi, imgsz, conf):
+    stats = StageStats(window=len(frames))
+    detections = []
+    for frame in frames:
+        start = time.perf_counter()
+        results = model(roi.apply(frame), imgsz=imgsz, conf=conf, verbose=False)[0]
+        stats.record(time.perf_counter() - start)
+        xyxy, _, classes = extract_detections(results)
+        detections.append((roi.to_frame(xyxy), classes))
+    return stats.snapshot(), detections
+
+
+def recall(reference, detections):
+    found = total = 0
+    for (ref_boxes, ref_cls), (boxes, cls) in zip(reference, detections):
+        total += len(ref_boxes)
+        if len(ref_boxes) == 0 or len(boxes) == 0:
+            continue
+        iou = iou_matrix(ref_boxes, boxes)
+        iou[ref_cls[:, None] != cls[None, :]] = 0.0
+        found += int(np.count_nonzero(iou.max(axis=1) >= 0.5))
+    return found / total if total else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference latency by input size and ROI")
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--video", default=None, help="Recorded cart video (synthetic frames if omitted)")
+    parser.add_argument("--roi", type=int, nargs=4, default=[160, 60, 1120, 700], metavar=("X1", "Y1", "X2", "Y2"))
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--conf", type=float, default=0.25)
+    args = parser.parse_args()
+
+    pretrained = os.path.exists(args.model)
+    model = YOLO(args.model if pretrained else "yolov8n.yaml")
+    frames = load_frames(args.video, args.frames)
+    # Warm up so the first timed call does not pay for model fusing
+    model(frames[0], imgsz=SIZES[0], verbose=False)
+
+    print(f"{len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]}, roi {args.roi}, "
+          f"{'weights ' + args.model if pretrained else 'random-init weights, latency only'}")
+    print(f"{'input':>10}  {'imgsz':>5}  {'avg (ms)':>8}  {'p95 (ms)':>8}  {'recall':>6}")
+
+    reference = None
+    for name, roi in (("full frame", RegionOfInterest()), ("roi", RegionOfInterest(box=args.roi))):
+        for imgsz in SIZES:
+            stats, detections = detect(model, frames, roi, imgsz, args.conf)
+            if reference is None:
+                reference = detections
+            score = f"{recall(reference, detections):>6.1%}" if pretrained else f"{'-':>6}"
+            print(f"{name:>10}  {imgsz:>5}  {stats['avg_ms']:>8.1f}  {stats['p95_ms']:>8.1f}  {score}")
+
+
+if __name__ == "__main__":
+    main()
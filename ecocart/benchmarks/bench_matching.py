@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-pair calculate_iou scan vs vectorized IoU matrix + assignment
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.matching import greedy_assign, iou_matrix
+
+IOU_THRESHOLD = 0.5
+
+
+def make_boxes(rng, count):
+    xy = rng.integers(0, 1200, size=(count, 2))
+    wh = rng.integers(20, 120, size=(count, 2))
+    return np.hstack([xy, xy + wh])
+
+
+def loop_match(detections, tracks):
+    """Baseline: first track above threshold per detection, one Python call per pair"""
+    matched = []
+    for det in detections:
+        for idx, track in enumerate(tracks):
+            if GroceryCartTracker.calculate_iou(None, det, track) > IOU_THRESHOLD:
+                matched.append(idx)
+                break
+    return matched
+
+
+def vectorized_match(detections, tracks):
+    return greedy_assign(iou_matrix(detections, tracks), IOU_THRESHOLD)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'boxes':>6} {'loop (ms)':>10} {'numpy (ms)':>11} {'speedup':>8}")
+    for count in (10, 50, 200):
+        tracks = make_boxes(rng, count)
+        detections = tracks + rng.integers(-4, 5, size=tracks.shape)
+        det_list = [tuple(box) for box in detections.tolist()]
+        track_list = [tuple(box) for box in tracks.tolist()]
+
+        number = max(1, 2000 // count)
+        loop = min(timeit.repeat(lambda: loop_match(det_list, track_list), number=number, repeat=3)) / number
+        vec = min(timeit.repeat(lambda: vectorized_match(detections, tracks), number=number, repeat=3)) / number
+        print(f"{count:>6} {loop * 1000:>10.3f} {vec * 1000:>11.3f} {loop / vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Headless end-to-end replay of GroceryCartTracker against a local stub backend
+
+Replays a recorded video, a recorded detection log, or (by default) the
+seeded synthetic session from bench_tracking.py as fast as possible. Frame
+timestamps come from the frame index and the source fps, so removal timeouts
+behave as they would live. Cart events go through the real API client to a
+local HTTP server that accepts everything.
+
+Reports end-to-end FPS, per-stage latency percentiles (decode, inference,
+matching, dispatch), add/remove events and peak RSS, optionally as JSON.
+With --baseline the run is compared against an earlier JSON report and the
+script exits non-zero when FPS dropped by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_tracking import FPS as SYNTHETIC_FPS, NAMES as SYNTHETIC_NAMES, make_session
+from src.ecocart.config import Config
+from src.ecocart.detection_log import DetectionLog
+from src.ecocart.inference import Boxes, Detections
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.utils.stats import StageStats
+
+STAGES = ("decode", "inference", "matching", "dispatch")
+
+
+class StubBackend:
+    """Local HTTP server answering every cart API call with 200 and counting the events it received"""
+
+    def __init__(self):
+        self.events = {"add": 0, "remove": 0}
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._reply()
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path == "/add_item":
+                    stub.count(["add"])
+                elif self.path == "/remove_item":
+                    stub.count(["remove"])
+                elif self.path.endswith("/events"):
+                    stub.count([event["type"] for event in body.get("events", [])])
+                self._reply()
+
+            def _reply(self):
+                payload = b'{"status": "ok"}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def count(self, event_types):
+        with self._lock:
+            self.requests += 1
+            for event_type in event_types:
+                self.events[event_type] = self.events.get(event_type, 0) + 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class DispatchTimer:
+    """Times every add/remove call the tracker makes on client, keeping a running total"""
+
+    def __init__(self, client, stats):
+        self.stats = stats
+        self.total = 0.0
+        for name in ("add_item", "remove_item"):
+            setattr(client, name, self._timed(getattr(client, name)))
+
+    def _timed(self, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.total += elapsed
+                self.stats.record(elapsed)
+
+        return timed
+
+
+def replay_detections(tracker, frames, stages, dispatch):
+    """Feed stored detections straight into process_detections, no model involved"""
+    for frame_time, xyxy, conf, cls in frames:
+        start = time.perf_counter()
+        results = Detections(Boxes(xyxy, conf, cls), tracker.model.names, (0, 0))
+        stages["decode"].record(time.perf_counter() - start)
+        run_matching(tracker, results, frame_time, stages, dispatch)
+    return len(frames), len(frames)
+
+
+def replay_video(tracker, path, stages, dispatch, max_frames):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open video {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    tracker.infer(np.zeros((height, width, 3), dtype=np.uint8))  # warm-up, keeps model setup out of the percentiles
+    frames = inferred = 0
+    try:
+        while max_frames is None or frames < max_frames:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            stages["decode"].record(time.perf_counter() - start)
+            frames += 1
+            if not tracker.should_infer(frame):
+                continue
+
+            frame_time = frames / fps
+            start = time.perf_counter()
+            results = tracker.infer(frame)
+            stages["inference"].record(time.perf_counter() - start)
+            inferred += 1
+            run_matching(tracker, results, frame_time, stages, dispatch)
+    finally:
+        cap.release()
+    return frames, inferred
+
+
+def run_matching(tracker, results, frame_time, stages, dispatch):
+    """Time process_detections, minus the API calls it made, which count as dispatch"""
+    dispatched = dispatch.total
+    start = time.perf_counter()
+    tracker.process_detections(results, frame_time)
+    elapsed = time.perf_counter() - start
+    stages["matching"].record(elapsed - (dispatch.total - dispatched))
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless tracker replay benchmark")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", help="Recorded cart video, run through the model")
+    source.add_argument("--detections", help="Detection log directory recorded with --save-detections")
+    parser.add_argument("--save-detections", help="Record the video's detections to this log directory")
+    parser.add_argument("--frames", type=int, default=None, help="Stop after this many video frames")
+    parser.add_argument("--model", default="models/yolov8n.pt", help="Falls back to random-init yolov8n")
+    parser.add_argument("--api", choices=("inline", "async", "batch"), default="inline", help="API client mode")
+    parser.add_argument("--adaptive-skip", action="store_true")
+    parser.add_argument("--json", help="Write the report as JSON to this path, - for stdout")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare FPS against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed FPS drop vs the baseline")
+    args = parser.parse_args()
+
+    if args.video is not None:
+        names = None
+        label = args.video
+    elif args.detections is not None:
+        frames = DetectionLog(args.detections)
+        names, label = frames.names, args.detections
+    else:
+        frames, _, _ = make_session()
+        names, label = SYNTHETIC_NAMES, f"synthetic session at {SYNTHETIC_FPS} fps"
+
+    stages = {name: StageStats(window=100_000) for name in STAGES}
+    rss_before = peak_rss_mb()
+
+    with StubBackend() as backend:
+        config = Config(
+            BACKEND_URL=backend.url,
+            DISPLAY_WINDOW=False,
+            LOG_LEVEL="WARNING",
+            MODEL_PATH=args.model,
+            ADAPTIVE_FRAME_SKIP=args.adaptive_skip,
+            API_ASYNC_DELIVERY=args.api == "async",
+            API_BATCH_EVENTS=args.api == "batch",
+            RECORD_DETECTIONS=args.save_detections,
+        )
+        model = SimpleNamespace(names=names) if names is not None else None
+        if model is None and not os.path.exists(args.model):
+            from ultralytics import YOLO
+
+            print(f"{args.model} not found, using random-init yolov8n")
+            model = YOLO("yolov8n.yaml")
+        tracker = GroceryCartTracker(config, model=model)
+        dispatch = DispatchTimer(tracker.api_client, stages["dispatch"])
+
+        start = time.perf_counter()
+        if args.video is not None:
+            frame_count, inferred = replay_video(
+                tracker, args.video, stages, dispatch, args.frames
+            )
+        else:
+            frame_count, inferred = replay_detections(tracker, frames, stages, dispatch)
+        tracker.api_client.flush(timeout=config.API_TIMEOUT)
+        elapsed = time.perf_counter() - start
+        if hasattr(tracker.api_client, "close"):
+            tracker.api_client.close(timeout=config.API_TIMEOUT)
+
+    tracker.stop_recording()
+
+    report = {
+        "source": label,
+        "api": args.api,
+        "frames": frame_count,
+        "inferred_frames": inferred,
+        "elapsed_s": round(elapsed, 3),
+        "fps": round(frame_count / elapsed, 1) if elapsed else 0.0,
+        "stages": {name: stats.snapshot() for name, stats in stages.items()},
+        "events": {"add": backend.events["add"], "remove": backend.events["remove"], "requests": backend.requests},
+        "cart_items": len(tracker.cart_inventory),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+    print(f"{label}: {frame_count} frames ({inferred} inferred) in {elapsed:.2f} s, {report['fps']} fps")
+    print(f"{'stage':>10}  {'count':>6}  {'avg (ms)':>8}  {'p50 (ms)':>8}  {'p95 (ms)':>8}  {'p99 (ms)':>8}")
+    for name, stats in report["stages"].items():
+        print(f"{name:>10}  {stats['count']:>6}  {stats['avg_ms']:>8.3f}  {stats['p50_ms']:>8.3f}  "
+              f"{stats['p95_ms']:>8.3f}  {stats['p99_ms']:>8.3f}")
+    print(f"events: {report['events']['add']} add, {report['events']['remove']} remove, "
+          f"{report['cart_items']} items left, peak RSS {report['peak_rss_mb']} MB")
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        change = report["fps"] / baseline["fps"] - 1 if baseline["fps"] else 0.0
+        print(f"fps {baseline['fps']} -> {report['fps']} ({change:+.1%})")
+        if change < -args.tolerance:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
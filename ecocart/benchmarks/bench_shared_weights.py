@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Worker start-up with memory-mapped shared weights vs loading the checkpoint per worker
+
+Starts N fresh worker processes the way the supervisor does, each loading the
+model and running one prediction, once with YOLO(model.pt) and once from a
+file prepared with export_shared_weights. Reports per-worker load time, the
+anonymous (private) memory the model added, and the worker's proportional
+set size (PSS) while all N are alive, so pages shared through the page cache
+are split between them.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.inference import export_shared_weights, load_shared_weights
+
+
+def memory_mb():
+    """Anonymous RSS and PSS of this process"""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            fields = line.split()
+            if fields[-1] == "kB":
+                values[fields[0].rstrip(":")] = int(fields[1]) / 1024
+    return values["Anonymous"], values["Pss"]
+
+
+def worker(mode, path, imgsz, results, ready, done):
+    import torch
+    from ultralytics import YOLO
+
+    torch.set_num_threads(1)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    anon_before, _ = memory_mb()
+    start = time.perf_counter()
+    model = load_shared_weights(path) if mode == "shared" else YOLO(path)
+    model(frame, imgsz=imgsz, verbose=False)
+    elapsed = time.perf_counter() - start
+    anon_after, _ = memory_mb()
+    ready.wait()  # every worker holds its model before PSS is read
+    _, pss = memory_mb()
+    results.put((elapsed, anon_after - anon_before, pss))
+    done.wait()
+
+
+def run(mode, path, workers, imgsz):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    ready, done = context.Barrier(workers + 1), context.Event()
+    processes = [context.Process(target=worker, args=(mode, path, imgsz, results, ready, done)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    ready.wait()
+    samples = [results.get() for _ in processes]
+    done.set()
+    for process in processes:
+        process.join()
+    return [sum(column) / len(samples) for column in zip(*samples)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared vs per-worker model weights")
+    parser.add_argument("--model", default="yolov8m.yaml", help=".pt checkpoint, or a .yaml for random init")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--imgsz", type=int, default=320)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        checkpoint = args.model
+        if checkpoint.endswith((".yaml", ".yml")):
+            from ultralytics import YOLO
+
+            checkpoint = os.path.join(temp_dir, "model.pt")
+            YOLO(args.model).save(checkpoint)
+        shared = export_shared_weights(checkpoint, os.path.join(temp_dir, "model.shared.pt"))
+        print(f"{args.model}: checkpoint {os.path.getsize(checkpoint) / 2**20:.1f} MB, "
+              f"shared file {os.path.getsize(shared) / 2**20:.1f} MB, {args.workers} workers")
+
+        print(f"{'weights':>10}  {'load + 1st predict (s)':>22}  {'private MB':>10}  {'PSS MB':>7}")
+        for mode, path in (("per-worker", checkpoint), ("shared", shared)):
+            elapsed, private, pss = run(mode, path, args.workers, args.imgsz)
+            print(f"{mode:>10}  {elapsed:>22.2f}  {private:>10.1f}  {pss:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Cart add/remove events and per-frame cost: label-index keying vs persistent track IDs
+
+Replays a seeded synthetic shopping session: items enter the cart, drift and
+jitter, are missed or detected with low confidence now and then, come back in
+a different order every frame, and some are taken out again.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.catalog import SkuCatalog
+from src.ecocart.config import Config
+from src.ecocart.main import DetectedItem, GroceryCartTracker
+from src.ecocart.matching import ASSIGNERS, extract_detections, iou_matrix
+from src.ecocart.utils.stats import StageStats
+
+FPS = 15
+FRAMES = 3000
+ITEMS = 8  # items placed in the cart during the session
+TAKEN_OUT = 3  # of which this many are removed again
+MISS_RATE = 0.1
+LOW_CONF_RATE = 0.1
+NAMES = {0: "apple", 1: "orange", 2: "carrot"}
+
+
+class FakeBoxes(SimpleNamespace):
+    def __len__(self):
+        return len(self.conf)
+
+
+def make_session(seed=0):
+    """Per-frame (timestamp, boxes, confidences, classes) for one synthetic session"""
+    rng = np.random.default_rng(seed)
+    start = np.sort(rng.integers(0, FRAMES // 2, ITEMS))
+    end = np.full(ITEMS, FRAMES)
+    taken = rng.choice(ITEMS, TAKEN_OUT, replace=False)
+    end[taken] = start[taken] + rng.integers(FRAMES // 10, FRAMES // 3, TAKEN_OUT)
+    origin = rng.uniform(50, 500, (ITEMS, 2))
+    size = rng.uniform(60, 120, (ITEMS, 2))
+    drift = rng.uniform(-0.3, 0.3, (ITEMS, 2))  # pixels per frame as the cart moves
+    classes = rng.integers(0, len(NAMES), ITEMS)
+
+    frames = []
+    for frame in range(FRAMES):
+        visible = np.flatnonzero((start <= frame) & (frame < end) & (rng.random(ITEMS) >= MISS_RATE))
+        rng.shuffle(visible)
+        xy = origin[visible] + drift[visible] * frame + rng.normal(0, 2.0, (len(visible), 2))
+        boxes = np.hstack([xy, xy + size[visible]]).astype(np.float32)
+        conf = np.where(rng.random(len(visible)) < LOW_CONF_RATE, 0.25, rng.uniform(0.6, 0.95, len(visible)))
+        frames.append((frame / FPS, boxes, conf.astype(np.float32), classes[visible].astype(np.float32)))
+    return frames, ITEMS, TAKEN_OUT
+
+
+class LabelKeyedTracker(GroceryCartTracker):
+    """The previous process_detections: items keyed by f"{label}_{index}" within the frame"""
+
+    def reset_state(self):
+        super().reset_state()
+        self.detection_history = defaultdict(lambda: deque(maxlen=self.config.STABILIZATION_FRAMES))
+
+    def match_detections(self, labels, bboxes):
+        matched = [None] * len(labels)
+        detections_by_label = defaultdict(list)
+        for idx, label in enumerate(labels):
+            detections_by_label[label].append(idx)
+
+        inventory_by_label = defaultdict(list)
+        for key, item in self.cart_inventory.items():
+            if item.label in detections_by_label:
+                inventory_by_label[item.label].append(key)
+
+        assign = ASSIGNERS[self.config.MATCHING_METHOD]
+        for label, keys in inventory_by_label.items():
+            det_idx = detections_by_label[label]
+            iou = iou_matrix(bboxes[det_idx], [self.cart_inventory[key].bbox for key in keys])
+            rows, cols = assign(iou, self.config.IOU_THRESHOLD)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                matched[det_idx[row]] = keys[col]
+        return matched
+
+    def process_detections(self, results, frame_time):
+        current_detections = {}
+        xyxy, confs, classes = extract_detections(results)
+        keep = confs >= self.config.CONFIDENCE_THRESHOLD
+        bboxes = xyxy[keep].astype(int)
+        confs = confs[keep]
+        labels = [self.model.names[int(cls)] for cls in classes[keep]]
+        matched_keys = self.match_detections(labels, bboxes)
+
+        for idx, label in enumerate(labels):
+            catalog_item = self.catalog.get(label)
+            if catalog_item is None:
+                continue
+            bbox = tuple(bboxes[idx].tolist())
+            conf = float(confs[idx])
+            matched_key = matched_keys[idx]
+            if matched_key:
+                item = self.cart_inventory[matched_key]
+                item.bbox = bbox
+                item.confidence = max(item.confidence, conf)
+                item.last_seen = frame_time
+                item.detection_count += 1
+                current_detections[matched_key] = item
+            else:
+                item_key = f"{label}_{len(current_detections)}"
+                current_detections[item_key] = DetectedItem(
+                    label=label, sku=catalog_item.sku, confidence=conf, bbox=bbox,
+                    last_seen=frame_time, detection_count=1,
+                )
+
+        for key, item in current_detections.items():
+            self.detection_history[key].append(frame_time)
+            if not item.confirmed and len(self.detection_history[key]) >= self.config.STABILIZATION_FRAMES:
+                item.confirmed = True
+                self.cart_inventory[key] = item
+                self.add_item_to_cart(item)
+
+        to_remove = []
+        for key, item in list(self.cart_inventory.items()):
+            if key not in current_detections:
+                if frame_time - item.last_seen > self.config.REMOVAL_TIMEOUT:
+                    to_remove.append(key)
+            else:
+                self.cart_inventory[key] = current_detections[key]
+
+        for key in to_remove:
+            if self.remove_item_from_cart(self.cart_inventory[key]):
+                del self.cart_inventory[key]
+                self.detection_history.pop(key, None)
+
+
+def make_tracker(cls, sku_map_path):
+    def load_dependencies(tracker):
+        tracker.catalog = SkuCatalog(sku_map_path)
+        tracker.model = SimpleNamespace(names=NAMES)
+        tracker.api_client = Mock()
+        tracker.api_client.add_item.return_value = True
+        tracker.api_client.remove_item.return_value = True
+
+    with patch.object(GroceryCartTracker, "load_dependencies", load_dependencies):
+        return cls(Config(DISPLAY_WINDOW=False, LOG_LEVEL="WARNING"))
+
+
+def replay(tracker, frames):
+    stats = StageStats(window=len(frames))
+    for frame_time, boxes, conf, cls in frames:
+        results = SimpleNamespace(boxes=FakeBoxes(xyxy=boxes, conf=conf, cls=cls))
+        start = time.perf_counter()
+        tracker.process_detections(results, frame_time)
+        stats.record(time.perf_counter() - start)
+    return tracker.api_client.add_item.call_count, tracker.api_client.remove_item.call_count, stats.snapshot()
+
+
+def main():
+    frames, items, taken_out = make_session()
+    print(f"{len(frames)} frames at {FPS} fps, {items} items placed, {taken_out} taken out again")
+    print(f"{'keying':>12}  {'adds':>5}  {'removes':>7}  {'avg (ms)':>8}  {'p95 (ms)':>8}")
+    print(f"{'expected':>12}  {items:>5}  {taken_out:>7}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sku_map_path = os.path.join(temp_dir, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({name: {"sku": f"SKU0010{idx}", "price": 1.0} for idx, name in NAMES.items()}, f)
+
+        for name, cls in (("label index", LabelKeyedTracker), ("track id", GroceryCartTracker)):
+            adds, removes, stats = replay(make_tracker(cls, sku_map_path), frames)
+            print(f"{name:>12}  {adds:>5}  {removes:>7}  {stats['avg_ms']:>8.3f}  {stats['p95_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
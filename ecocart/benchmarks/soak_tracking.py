@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Long-run soak of process_detections: memory and live track count over 1M frames
+
+Synthetic 15 fps stream: a handful of items sit in the cart with jitter and
+occasional misses, one item is swapped out every few minutes, and every
+frame carries a few confident false positives at random places that never
+repeat. Current RSS, live Python objects and live tracks are sampled at
+intervals. The script exits non-zero when RSS grows by more than --max-growth
+MB after warm-up.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ecocart.catalog import SkuCatalog
+from src.ecocart.config import Config
+from src.ecocart.inference import Boxes, Detections
+from src.ecocart.main import GroceryCartTracker
+
+FPS = 15
+ITEMS = 6
+SWAP_EVERY = FPS * 180  # frames between taking one item out and putting a new one in
+FALSE_POSITIVES = 3  # per frame
+MISS_RATE = 0.1
+NAMES = {0: "apple", 1: "orange", 2: "carrot"}
+CHUNK = 10_000
+
+
+class CountingAPIClient:
+    """Stand-in backend client that keeps counts only, a Mock would record every call"""
+
+    def __init__(self):
+        self.adds = 0
+        self.removes = 0
+
+    def add_item(self, *args):
+        self.adds += 1
+        return True
+
+    def remove_item(self, *args):
+        self.removes += 1
+        return True
+
+    def flush(self, timeout=None):
+        return True
+
+
+def make_chunk(rng, start, slots):
+    """Detections for frames [start, start + CHUNK) as per-frame (boxes, conf, cls)"""
+    frames = []
+    jitter = rng.normal(0, 2.0, (CHUNK, ITEMS, 2))
+    visible = rng.random((CHUNK, ITEMS)) >= MISS_RATE
+    noise_xy = rng.uniform(0, 1200, (CHUNK, FALSE_POSITIVES, 2))
+    noise_cls = rng.integers(0, len(NAMES), (CHUNK, FALSE_POSITIVES))
+    for offset in range(CHUNK):
+        frame = start + offset
+        if frame % SWAP_EVERY == 0:
+            # One item leaves and a new one takes its place elsewhere in the basket
+            slot = (frame // SWAP_EVERY) % ITEMS
+            slots[slot] = (rng.uniform(50, 500, 2), int(rng.integers(0, len(NAMES))))
+        origin = np.array([slots[i][0] for i in range(ITEMS)])
+        xy = origin[visible[offset]] + jitter[offset][visible[offset]]
+        xy = np.vstack([xy, noise_xy[offset]])
+        boxes = np.hstack([xy, xy + 80]).astype(np.float32)
+        cls = np.concatenate([[slots[i][1] for i in np.flatnonzero(visible[offset])], noise_cls[offset]])
+        conf = np.full(len(cls), 0.8, dtype=np.float32)
+        frames.append((boxes, conf, cls.astype(np.float32)))
+    return frames
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_detections memory soak")
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=10, help="Memory samples over the run")
+    parser.add_argument("--warmup", type=int, default=50_000, help="Frames before the baseline sample")
+    parser.add_argument("--max-growth", type=float, default=5.0, help="Allowed RSS growth after warm-up, MB")
+    parser.add_argument("--json", help="Write the samples as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sku_map_path = os.path.join(temp_dir, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({name: {"sku": f"SKU0010{idx}", "price": 1.0} for idx, name in NAMES.items()}, f)
+
+        api_client = CountingAPIClient()
+
+        def load_dependencies(tracker):
+            tracker.catalog = SkuCatalog(sku_map_path)
+            tracker.model = SimpleNamespace(names=NAMES)
+            tracker.api_client = api_client
+
+        with patch.object(GroceryCartTracker, "load_dependencies", load_dependencies):
+            tracker = GroceryCartTracker(Config(DISPLAY_WINDOW=False, LOG_LEVEL="WARNING"))
+
+        rng = np.random.default_rng(0)
+        slots = {slot: (rng.uniform(50, 500, 2), int(rng.integers(0, len(NAMES)))) for slot in range(ITEMS)}
+        every = max(1, (args.frames - args.warmup) // args.samples)
+        samples = []
+        baseline = None
+        start = time.perf_counter()
+        print(f"{'frame':>9}  {'rss (MB)':>8}  {'objects':>8}  {'tracks':>6}  {'cart':>4}  {'frames/s':>8}")
+
+        for chunk_start in range(0, args.frames, CHUNK):
+            for offset, (boxes, conf, cls) in enumerate(make_chunk(rng, chunk_start, slots)):
+                frame = chunk_start + offset
+                tracker.process_detections(Detections(Boxes(boxes, conf, cls), NAMES, (720, 1280)), frame / FPS)
+
+                done = frame + 1
+                if done == args.warmup or (done > args.warmup and (done - args.warmup) % every == 0):
+                    gc.collect()
+                    sample = {
+                        "frame": done,
+                        "rss_mb": round(rss_mb(), 1),
+                        "objects": len(gc.get_objects()),
+                        "tracks": len(tracker.object_tracker.tracks),
+                        "cart_items": len(tracker.cart_inventory),
+                        "frames_per_s": round(done / (time.perf_counter() - start)),
+                    }
+                    samples.append(sample)
+                    baseline = baseline or sample
+                    print(f"{done:>9}  {sample['rss_mb']:>8.1f}  {sample['objects']:>8}  {sample['tracks']:>6}  "
+                          f"{sample['cart_items']:>4}  {sample['frames_per_s']:>8}")
+                if done >= args.frames:
+                    break
+
+    growth = samples[-1]["rss_mb"] - baseline["rss_mb"]
+    print(f"{api_client.adds} adds, {api_client.removes} removes, "
+          f"RSS growth after warm-up {growth:+.1f} MB, objects {samples[-1]['objects'] - baseline['objects']:+d}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"samples": samples, "adds": api_client.adds, "removes": api_client.removes}, f, indent=2)
+    if growth > args.max_growth:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ log = logging.getLogger("EcoCartDiagnostics")
 # Paths
 MODEL_PATH = "models/yolov8n.pt"
 SKU_MAP_PATH = "config/sku_map.json"
-CONFIG_PATH = "config/tracker_config.yaml"
+CONFIG_PATH = os.environ.get("ECOCART_CONFIG", "config/tracker_config.yaml")
 VIDEO_SAMPLE_PATH = "data/test_videos/sample.mp4"
 
 # Helpers
@@ -54,6 +54,16 @@ def validate_sku_map(data):
     log.info(f"[✔] SKU map contains {len(data)} items")
     return True
 
+def load_tracker_config():
+    from src.ecocart.config import ConfigError, load_config
+    try:
+        config = load_config(CONFIG_PATH)
+        log.info(f"[✔] Valid config: {CONFIG_PATH} (cart {config.CART_ID})")
+        return config
+    except ConfigError as e:
+        log.error(f"[✘] {e}")
+        return None
+
 def test_model_inference(path):
     try:
         model = YOLO(path)
@@ -160,16 +170,20 @@ def run():
     results = []
 
     # File & Config Checks
-    results.append(file_exists(MODEL_PATH))
-    sku = is_valid_json(SKU_MAP_PATH)
-    results.append(sku is not None and validate_sku_map(sku))
     results.append(file_exists(CONFIG_PATH))
+    config = load_tracker_config()
+    results.append(config is not None)
+    model_path = config.MODEL_PATH if config else MODEL_PATH
+    sku_map_path = config.LABEL_MAP_PATH if config else SKU_MAP_PATH
+    results.append(file_exists(model_path))
+    sku = is_valid_json(sku_map_path)
+    results.append(sku is not None and validate_sku_map(sku))
     results.append(file_exists("run_tracker.py"))
     # results.append(file_exists("cli.py", critical=False))
 
     # Inference & Pipeline
-    results.append(test_model_inference(MODEL_PATH))
-    results.append(test_video_inference(VIDEO_SAMPLE_PATH, MODEL_PATH))
+    results.append(test_model_inference(model_path))
+    results.append(test_video_inference(VIDEO_SAMPLE_PATH, model_path))
     results.append(test_tracker_main())
     results.append(test_main_function())
     results.append(test_run_tracker_help())
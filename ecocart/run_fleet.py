@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import logging
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from src.ecocart.fleet import MultiCartRunner
+from src.ecocart.config import BACKENDS, ConfigError, load_fleet_config
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cart(spec: str):
+    """Parse CART_ID=SOURCE, numeric sources are camera indices"""
+    cart_id, sep, source = spec.partition("=")
+    if not sep or not cart_id or not source:
+        raise argparse.ArgumentTypeError(f"Expected CART_ID=SOURCE, got '{spec}'")
+    return cart_id, int(source) if source.isdigit() else source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grocery Cart Fleet Tracker")
+    parser.add_argument(
+        "carts",
+        nargs="+",
+        type=parse_cart,
+        help="Carts as CART_ID=SOURCE (camera index or video path)",
+    )
+    parser.add_argument(
+        "--backend-url", default=None, help="Backend URL"
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=None, help="Confidence threshold"
+    )
+    parser.add_argument(
+        "--max-batch", type=int, default=None, help="Max frames per inference call"
+    )
+    parser.add_argument(
+        "--max-wait-ms", type=float, default=None, help="Max wait for a full batch"
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default=None, help="Inference backend"
+    )
+    parser.add_argument(
+        "--onnx-model", default=None, help="Exported model for the onnx backend"
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Tracker config file (default: $ECOCART_CONFIG or config/tracker_config.yaml)",
+    )
+
+    args = parser.parse_args()
+
+    # Configuration shared by all carts and each cart's own ROI, unset flags fall back
+    # to ECOCART_* variables, then the config file
+    try:
+        config, cart_overrides = load_fleet_config(args.config, [cart_id for cart_id, _ in args.carts], overrides={
+            "BACKEND_URL": args.backend_url,
+            "CONFIDENCE_THRESHOLD": args.confidence,
+            "DISPLAY_WINDOW": False,
+            "MAX_BATCH_SIZE": args.max_batch,
+            "BATCH_MAX_WAIT_MS": args.max_wait_ms,
+            "INFERENCE_BACKEND": args.backend,
+            "ONNX_MODEL_PATH": args.onnx_model,
+        })
+    except ConfigError as e:
+        parser.error(str(e))
+
+    # INFERENCE_SIZE is fleet-wide: one batched model call takes frames of a single size
+    for cart_id, overrides in cart_overrides.items():
+        if overrides.pop("INFERENCE_SIZE", None) is not None:
+            logger.warning(
+                f"Ignoring INFERENCE_SIZE set for {cart_id}, batched carts use the shared {config.INFERENCE_SIZE}"
+            )
+
+    # Initialize and run all carts on one shared model
+    runner = MultiCartRunner(args.carts, config, cart_overrides=cart_overrides)
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import logging
+from dataclasses import replace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from src.ecocart.supervisor import FleetSupervisor, load_fleet
+from src.ecocart.config import BACKENDS, ConfigError, load_fleet_config
+from src.ecocart.inference import export_shared_weights
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grocery Cart Tracker Supervisor")
+    parser.add_argument(
+        "--fleet", default="config/fleet.yaml", help="Carts to run and how they are grouped into workers"
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Tracker config file (default: $ECOCART_CONFIG or config/tracker_config.yaml)",
+    )
+    parser.add_argument(
+        "--backend-url", default=None, help="Backend URL"
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=None, help="Confidence threshold"
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default=None, help="Inference backend"
+    )
+    parser.add_argument("--model", default=None, help="PyTorch model")
+    parser.add_argument(
+        "--onnx-model", default=None, help="Exported model for the onnx backend"
+    )
+    parser.add_argument(
+        "--shared-weights",
+        default=None,
+        help="Prepared weights memory-mapped by all workers (default: next to --model)",
+    )
+    parser.add_argument(
+        "--no-shared-weights", action="store_true", help="Load the model separately in every worker"
+    )
+    parser.add_argument(
+        "--port", type=int, default=None, help="Local status endpoint port"
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    workers = load_fleet(args.fleet)
+
+    # Configuration shared by all workers and each cart's own ROI, unset flags fall back
+    # to ECOCART_* variables, then the config file
+    cart_ids = [cart_id for worker in workers for cart_id, _ in worker.carts]
+    try:
+        config, cart_overrides = load_fleet_config(args.config, cart_ids, overrides={
+            "BACKEND_URL": args.backend_url,
+            "CONFIDENCE_THRESHOLD": args.confidence,
+            "DISPLAY_WINDOW": False,
+            "MODEL_PATH": args.model,
+            "INFERENCE_BACKEND": args.backend,
+            "ONNX_MODEL_PATH": args.onnx_model,
+            "STATUS_PORT": args.port,
+        })
+    except ConfigError as e:
+        parser.error(str(e))
+
+    # INFERENCE_SIZE is fleet-wide: one batched model call takes frames of a single size
+    for cart_id, overrides in cart_overrides.items():
+        if overrides.pop("INFERENCE_SIZE", None) is not None:
+            logger.warning(
+                f"Ignoring INFERENCE_SIZE set for {cart_id}, batched carts use the shared {config.INFERENCE_SIZE}"
+            )
+
+    # Prepare the weights once, workers map the same file instead of each loading a copy
+    if config.INFERENCE_BACKEND == "ultralytics" and not args.no_shared_weights:
+        model = config.MODEL_PATH
+        shared = args.shared_weights or config.SHARED_WEIGHTS_PATH or os.path.splitext(model)[0] + ".shared.pt"
+        if not os.path.exists(shared) or (
+            os.path.exists(model) and os.path.getmtime(shared) < os.path.getmtime(model)
+        ):
+            export_shared_weights(model, shared)
+        config = replace(config, SHARED_WEIGHTS_PATH=shared)
+    elif args.no_shared_weights:
+        config = replace(config, SHARED_WEIGHTS_PATH=None)
+
+    supervisor = FleetSupervisor(workers, config, cart_overrides=cart_overrides)
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()
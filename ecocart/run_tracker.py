@@ -7,35 +7,78 @@ import argparse
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
 from src.ecocart.main import GroceryCartTracker
-from src.ecocart.config import Config
+from src.ecocart.config import BACKENDS, ConfigError, load_config
+
+
+def parse_source(source: str):
+    """Numeric sources are camera indices, anything else a video path"""
+    return int(source) if source.isdigit() else source
 
 
 def main():
+    # Flags left unset fall back to ECOCART_* variables, then the config file, then Config defaults
     parser = argparse.ArgumentParser(description="Grocery Cart Tracker")
-    parser.add_argument("--cart-id", default="cart_001", help="Cart ID")
+    parser.add_argument("--cart-id", default=None, help="Cart ID")
+    parser.add_argument("--backend-url", default=None, help="Backend URL")
     parser.add_argument(
-        "--backend-url", default="http://localhost:8000", help="Backend URL"
+        "--video-source", type=parse_source, default=None, help="Camera index (0 for webcam) or video path"
     )
     parser.add_argument(
-        "--video-source", type=int, default=0, help="Video source (0 for webcam)"
+        "--confidence", type=float, default=None, help="Confidence threshold (default: confidence_threshold from --config)"
     )
     parser.add_argument(
-        "--confidence", type=float, default=0.3, help="Confidence threshold"
+        "--no-display", action="store_true", help="Disable video display"
     )
     parser.add_argument(
-        "--no-display", action="store_true", help="Disable video display"
+        "--pipeline",
+        action="store_true",
+        help="Run capture, inference and API dispatch as separate stages",
+    )
+    parser.add_argument(
+        "--adaptive-skip",
+        action="store_true",
+        help="Skip inference while the cart scene is static",
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, default=None, help="Inference backend"
+    )
+    parser.add_argument(
+        "--onnx-model", default=None, help="Exported model for the onnx backend"
+    )
+    parser.add_argument(
+        "--record", default=None, help="Record per-frame detections to this directory"
+    )
+    parser.add_argument(
+        "--replay", default=None, help="Replay a recorded detections directory instead of the video"
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Tracker config file (default: $ECOCART_CONFIG or config/tracker_config.yaml)",
+    )
+    parser.add_argument(
+        "--imgsz", type=int, default=None, help="Model input size, overrides the config file"
     )
 
     args = parser.parse_args()
 
-    # Create configuration
-    config = Config(
-        CART_ID=args.cart_id,
-        BACKEND_URL=args.backend_url,
-        VIDEO_SOURCE=args.video_source,
-        CONFIDENCE_THRESHOLD=args.confidence,
-        DISPLAY_WINDOW=not args.no_display,
-    )
+    try:
+        config = load_config(args.config, overrides={
+            "CART_ID": args.cart_id,
+            "BACKEND_URL": args.backend_url,
+            "VIDEO_SOURCE": args.video_source,
+            "CONFIDENCE_THRESHOLD": args.confidence,
+            "DISPLAY_WINDOW": False if args.no_display else None,
+            "PIPELINE_MODE": True if args.pipeline else None,
+            "ADAPTIVE_FRAME_SKIP": True if args.adaptive_skip else None,
+            "INFERENCE_BACKEND": args.backend,
+            "ONNX_MODEL_PATH": args.onnx_model,
+            "RECORD_DETECTIONS": args.record,
+            "REPLAY_DETECTIONS": args.replay,
+            "INFERENCE_SIZE": args.imgsz,
+        })
+    except ConfigError as e:
+        parser.error(str(e))
 
     # Initialize and run tracker
     tracker = GroceryCartTracker(config)
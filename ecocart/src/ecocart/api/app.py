@@ -1,21 +1,50 @@
 # src/ecocart/api/app.py
 
-import json
+import asyncio
 from fastapi import FastAPI
+from src.ecocart.api.enrichment import enrichment_service
+from src.ecocart.api.executors import create_executors
 from src.ecocart.api.routers import cart_router, health_router
+from src.ecocart.api.state import SNAPSHOT_PATH, cart_store
+from src.ecocart.catalog import get_catalog
 from src.ecocart.database import initialize_db
 from src.vector_db import VectorDB
 
 
+SNAPSHOT_INTERVAL = 5.0  # seconds between cart snapshots while carts change
+
+
+async def snapshot_carts_periodically():
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        if cart_store.dirty:
+            await asyncio.to_thread(cart_store.snapshot, SNAPSHOT_PATH)
+
+
 def create_app() -> FastAPI:
     app = FastAPI(title="EcoCart API")
 
     @app.on_event("startup")
     async def startup_event():
         initialize_db()
-        with open("/home/himanshu/projects/walmart/config/sku_map.json", "r") as f:
-            sku_map_data = json.load(f)
-        app.state.vector_db = VectorDB(sku_map_data)
+        app.state.executors = create_executors()
+        app.state.catalog = get_catalog()
+        app.state.vector_db = VectorDB(app.state.catalog.as_dict(), catalog=app.state.catalog)
+        app.state.enrichment = enrichment_service
+        enrichment_service.start(app.state.vector_db)
+
+        if SNAPSHOT_PATH:
+            cart_store.restore(SNAPSHOT_PATH)
+            app.state.snapshot_task = asyncio.create_task(snapshot_carts_periodically())
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        for executor in app.state.executors.values():
+            executor.shutdown()
+        enrichment_service.stop()
+        if SNAPSHOT_PATH:
+            app.state.snapshot_task.cancel()
+            cart_store.snapshot(SNAPSHOT_PATH)
 
     app.include_router(cart_router.router)
     app.include_router(health_router.router)
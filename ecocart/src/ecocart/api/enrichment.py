@@ -0,0 +1,95 @@
+# src/ecocart/api/enrichment.py
+
+import logging
+import queue
+import threading
+from typing import Iterable, Optional
+
+from src.ecocart import database
+
+
+class EnrichmentService:
+    """Computes each item's bill enrichment once, in the background, when it is first billed"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.vector_db = None
+        self.enriched = 0
+        self.failed = 0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._done = set()
+        self._pending = set()
+        self._thread = None
+
+    def start(self, vector_db):
+        """Start the worker and queue every billed item that is not enriched yet"""
+        self.vector_db = vector_db
+        with self._lock:
+            self._done = database.get_enriched_items()
+            self._pending = set()
+        self._thread = threading.Thread(target=self._run, name="bill-enrichment", daemon=True)
+        self._thread.start()
+        self.request(database.get_unenriched_items())
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def request(self, item_names: Iterable[str]):
+        """Queue items that have not been enriched, a set lookup for those that have"""
+        if self._thread is None:
+            return
+        with self._lock:
+            for item_name in item_names:
+                if item_name in self._done or item_name in self._pending:
+                    continue
+                self._pending.add(item_name)
+                self._queue.put(item_name)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued item is processed, e.g. in tests"""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _run(self):
+        while True:
+            item_name = self._queue.get()
+            try:
+                if item_name is None:
+                    return
+                self._enrich(item_name)
+            finally:
+                self._queue.task_done()
+
+    def _enrich(self, item_name: str):
+        try:
+            info = self.vector_db.query(item_name)
+            catalog_item = self.vector_db.catalog.get(item_name) if self.vector_db.catalog else None
+            database.save_enrichment(item_name, catalog_item.sku if catalog_item else None, info)
+        except Exception as e:
+            # Left pending-free so the next billing of this item retries it
+            self.logger.error(f"Failed to enrich '{item_name}': {e}")
+            self.failed += 1
+            with self._lock:
+                self._pending.discard(item_name)
+            return
+
+        self.enriched += 1
+        with self._lock:
+            self._pending.discard(item_name)
+            self._done.add(item_name)
+
+    def stats(self) -> dict:
+        return {
+            "enriched": self.enriched,
+            "failed": self.failed,
+            "pending": len(self._pending),
+            "known": len(self._done),
+        }
+
+
+enrichment_service = EnrichmentService()
@@ -0,0 +1,91 @@
+# src/ecocart/api/executors.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from fastapi import HTTPException, Request
+
+from src.ecocart.utils.stats import StageStats
+
+# name: (worker threads, extra calls allowed to queue, seconds before a caller gives up)
+POOL_SIZES = {
+    "db": (8, 32, 5.0),
+    "llm": (4, 8, 30.0),
+}
+
+
+class BoundedExecutor:
+    """Named thread pool that rejects work when saturated instead of queueing without limit"""
+
+    def __init__(self, name: str, max_workers: int, max_pending: int, timeout: float):
+        self.name = name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.capacity = max_workers + max_pending
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=f"ecocart-{name}")
+        # A slot is held until the call finishes in its worker, even if the caller timed out
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.latency = StageStats()
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    async def run(self, func: Callable, *args):
+        """Run func(*args) on the pool, raising 429 when saturated and 504 on timeout"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"{self.name} pool saturated, retry later",
+                headers={"Retry-After": "1"},
+            )
+
+        with self._lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise HTTPException(status_code=504, detail=f"{self.name} call timed out")
+        finally:
+            self.latency.record(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "latency": self.latency.snapshot(),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_executors(sizes: Dict[str, tuple] = None) -> Dict[str, BoundedExecutor]:
+    return {
+        name: BoundedExecutor(name, max_workers, max_pending, timeout)
+        for name, (max_workers, max_pending, timeout) in (sizes or POOL_SIZES).items()
+    }
+
+
+def get_executor(request: Request, name: str) -> BoundedExecutor:
+    return request.app.state.executors[name]
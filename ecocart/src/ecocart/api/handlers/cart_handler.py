@@ -1,41 +1,80 @@
 # src/ecocart/api/handlers/cart_handler.py
 
-from typing import Dict
-from src.ecocart.api.state import cart_db
+from typing import Dict, List, Optional
+from src.ecocart import database
+from src.ecocart.api.enrichment import enrichment_service
+from src.ecocart.api.state import cart_store
+from src.ecocart.api.stream import cart_stream_hub
+from src.ecocart.catalog import get_catalog
 import time
-from src.ecocart.database import add_item_to_bill
+from src.ecocart.database import add_item_to_bill, add_items_to_bill
 
-def add_item(cart_id: str, sku: str, label: str, confidence: float, timestamp: float) -> Dict:
-    item = {
+def _price(label: str) -> float:
+    catalog_item = get_catalog(database.SKU_MAP_PATH).get(label)
+    return catalog_item.price if catalog_item and catalog_item.price is not None else 0.0
+
+def _delta(event_type: str, cart_id: str, sku: str, label: str, quantity: int) -> Dict:
+    return {
+        "type": event_type,
         "sku": sku,
         "label": label,
-        "confidence": confidence,
-        "timestamp": timestamp
+        "quantity": quantity,
+        "item_count": cart_store.item_count(cart_id),
+        "total": round(cart_store.cart_total(cart_id), 2),
     }
-    cart_db[cart_id].append(item)
-    add_item_to_bill(label) # Add item to the SQLite database
-    return {"status": "success", "message": f"Item {label} added."}
 
-
-def remove_item(cart_id: str, sku: str, label: str, timestamp: float) -> Dict:
-    if cart_id not in cart_db:
+def _remove(cart_id: str, sku: str, label: str, deltas: List[Dict]) -> Dict:
+    if cart_id not in cart_store:
         return {"status": "error", "message": "Cart not found"}
 
-    original_len = len(cart_db[cart_id])
-    cart_db[cart_id] = [
-        item for item in cart_db[cart_id]
-        if item["sku"] != sku or item["label"] != label
-    ]
-    if len(cart_db[cart_id]) == original_len:
+    quantity: Optional[int] = cart_store.remove(cart_id, sku, label)
+    if quantity is None:
         return {"status": "warning", "message": f"Item {label} not found"}
 
+    deltas.append(_delta("remove", cart_id, sku, label, quantity))
     return {"status": "success", "message": f"Item {label} removed."}
 
+def add_item(cart_id: str, sku: str, label: str, confidence: float, timestamp: float) -> Dict:
+    quantity = cart_store.add(cart_id, sku, label, confidence, timestamp, _price(label))
+    add_item_to_bill(label, cart_id) # Add item to the SQLite database
+    enrichment_service.request([label])
+    cart_stream_hub.publish(cart_id, [_delta("add", cart_id, sku, label, quantity)])
+    return {"status": "success", "message": f"Item {label} added."}
+
+
+def remove_item(cart_id: str, sku: str, label: str, timestamp: float) -> Dict:
+    deltas = []
+    result = _remove(cart_id, sku, label, deltas)
+    cart_stream_hub.publish(cart_id, deltas)
+    return result
+
+def apply_events(cart_id: str, events: List[Dict]) -> Dict:
+    """Apply an ordered batch of add/remove events, billing all adds in one transaction"""
+    results = []
+    billed = []
+    deltas = []
+    for event in events:
+        if event["type"] == "add":
+            quantity = cart_store.add(
+                cart_id, event["sku"], event["label"], event["confidence"], event["timestamp"],
+                _price(event["label"])
+            )
+            billed.append(event["label"])
+            deltas.append(_delta("add", cart_id, event["sku"], event["label"], quantity))
+            results.append({"status": "success", "message": f"Item {event['label']} added."})
+        else:
+            results.append(_remove(cart_id, event["sku"], event["label"], deltas))
+
+    add_items_to_bill(billed, cart_id)
+    enrichment_service.request(billed)
+    cart_stream_hub.publish(cart_id, deltas)
+    return {"status": "success", "applied": len(events), "results": results}
+
 def get_cart_summary(cart_id: str) -> Dict:
-    items = cart_db.get(cart_id, [])
     return {
         "cart_id": cart_id,
         "timestamp": time.time(),
-        "item_count": len(items),
-        "items": items
+        "item_count": cart_store.item_count(cart_id),
+        "total": round(cart_store.cart_total(cart_id), 2),
+        "items": cart_store.get_items(cart_id)
     }
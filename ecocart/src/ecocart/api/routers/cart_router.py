@@ -1,12 +1,15 @@
 # src/ecocart/api/routers/cart_router.py
 
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
+from typing import List, Literal, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel
+from src.ecocart.api.executors import get_executor
 from src.ecocart.api.handlers import cart_handler
+from src.ecocart.api.stream import cart_event_stream, cart_stream_hub
 from src.ecocart.database import (
     get_total_bill,
-    get_all_billed_items,
+    get_bill_lines,
     clear_bill,
     remove_item_from_bill,
 )
@@ -34,6 +37,18 @@ class RemoveItemRequest(BaseModel):
     timestamp: float
 
 
+class CartEvent(BaseModel):
+    type: Literal["add", "remove"]
+    sku: str
+    label: str
+    confidence: float = 0.0
+    timestamp: float
+
+
+class CartEventsRequest(BaseModel):
+    events: List[CartEvent]
+
+
 @router.post("/add_item")
 def add_item(req: AddItemRequest):
     return cart_handler.add_item(
@@ -46,32 +61,63 @@ def remove_item(req: RemoveItemRequest):
     return cart_handler.remove_item(req.cart_id, req.sku, req.label, req.timestamp)
 
 
+@router.post("/cart/{cart_id}/events")
+def apply_cart_events(cart_id: str, req: CartEventsRequest):
+    return cart_handler.apply_events(
+        cart_id, [event.model_dump() for event in req.events]
+    )
+
+
 @router.get("/cart/{cart_id}/summary")
 def cart_summary(cart_id: str):
     return cart_handler.get_cart_summary(cart_id)
 
 
-@router.get("/bill")
-async def get_bill(request: Request):
-    total = get_total_bill()
-    items = get_all_billed_items()
+def load_bill(cart_id: Optional[str], limit: Optional[int], before: Optional[Tuple[str, int]]):
+    if cart_id is None or limit is None:
+        limit = before = None
+    return get_total_bill(cart_id), get_bill_lines(cart_id, limit, before)
 
-    items_with_info = []
-    for item in items:
-        item_name = item[1]  # Assuming item name is at index 1
-        vector_db = request.app.state.vector_db
-        # item_info = vector_db.query(item_name)
-        items_with_info.append((
-            *item,
-            "",
-        ))  # Append item_info to the existing item tuple
 
-    return {"total_bill": total, "items": items_with_info}
+@router.get("/cart/{cart_id}/stream")
+async def cart_stream(cart_id: str):
+    """Server-sent events: a summary snapshot, then add/remove deltas with running totals"""
+    return StreamingResponse(
+        cart_event_stream(cart_stream_hub, cart_id, cart_handler.get_cart_summary),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/bill")
+async def get_bill(
+    request: Request,
+    cart_id: Optional[str] = None,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    before_timestamp: Optional[str] = None,
+):
+    # The page cursor is the last row's (timestamp, id), both come back as next_before_*
+    if (before_id is None) != (before_timestamp is None):
+        raise HTTPException(status_code=400, detail="before_id and before_timestamp must be given together")
+    before = (before_timestamp, before_id) if before_id is not None else None
+
+    # Each row is (id, item_name, price, timestamp, item_info), enrichment is precomputed
+    total, items = await get_executor(request, "db").run(load_bill, cart_id, limit, before)
+    paginated = cart_id is not None and limit is not None
+
+    last = items[-1] if paginated and len(items) == limit else None
+    return {
+        "total_bill": total,
+        "items": items,
+        "next_before_id": last[0] if last else None,
+        "next_before_timestamp": last[3] if last else None,
+    }
 
 
 @router.post("/bill/clear")
-def clear_current_bill():
-    clear_bill()
+def clear_current_bill(cart_id: Optional[str] = None):
+    clear_bill(cart_id)
     return {"status": "success", "message": "Bill cleared."}
 
 
@@ -84,10 +130,10 @@ def remove_billed_item(item_id: int):
 @router.get("/item_info/{item_name}")
 async def get_item_info(item_name: str, request: Request):
     vector_db = request.app.state.vector_db
-    info = vector_db.query(item_name)
+    info = await get_executor(request, "llm").run(vector_db.query, item_name)
     return {"item_name": item_name, "info": info}
 
 
 @router.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
+def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -1,9 +1,30 @@
 # src/ecocart/api/routers/health_router.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from src.ecocart.api.stream import cart_stream_hub
 
 router = APIRouter()
 
 @router.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@router.get("/metrics/item_info")
+def item_info_metrics(request: Request):
+    return request.app.state.vector_db.cache.stats()
+
+
+@router.get("/metrics/executors")
+def executor_metrics(request: Request):
+    return {name: executor.stats() for name, executor in request.app.state.executors.items()}
+
+
+@router.get("/metrics/enrichment")
+def enrichment_metrics(request: Request):
+    return request.app.state.enrichment.stats()
+
+
+@router.get("/metrics/stream")
+def stream_metrics():
+    return cart_stream_hub.stats()
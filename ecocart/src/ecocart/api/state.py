@@ -1,10 +1,163 @@
-from collections import defaultdict
-from typing import Dict, List
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
 
-cart_db: Dict[str, List[dict]] = defaultdict(list)
+SNAPSHOT_PATH = os.environ.get("ECOCART_CART_SNAPSHOT")  # unset disables snapshots
+
+
+class CartLine:
+    """One SKU in a cart with its quantity"""
+
+    __slots__ = ("sku", "label", "quantity", "confidence", "timestamp", "price")
+
+    def __init__(self, sku: str, label: str, quantity: int, confidence: float, timestamp: float,
+                 price: float = 0.0):
+        self.sku = sku
+        self.label = label
+        self.quantity = quantity
+        self.confidence = confidence
+        self.timestamp = timestamp
+        self.price = price
+
+    def to_dict(self) -> dict:
+        return {
+            "sku": self.sku,
+            "label": self.label,
+            "quantity": self.quantity,
+            "confidence": self.confidence,
+            "timestamp": self.timestamp,
+            "price": self.price,
+        }
+
+
+class CartStore:
+    """Thread-safe cart state keyed by cart and SKU with incrementally maintained counters"""
+
+    def __init__(self):
+        self._carts: Dict[str, Dict[str, CartLine]] = {}
+        self._item_counts: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.total_items = 0
+        self.dirty = False
+
+    def add(self, cart_id: str, sku: str, label: str, confidence: float, timestamp: float,
+            price: float = 0.0) -> int:
+        """Add one unit of sku, returns the new quantity"""
+        with self._lock:
+            lines = self._carts.get(cart_id)
+            if lines is None:
+                lines = self._carts[cart_id] = {}
+                self._item_counts[cart_id] = 0
+                self._totals[cart_id] = 0.0
+
+            line = lines.get(sku)
+            if line is None:
+                line = lines[sku] = CartLine(sku, label, 0, confidence, timestamp, price)
+            line.quantity += 1
+            line.confidence = max(line.confidence, confidence)
+            line.timestamp = timestamp
+
+            self._item_counts[cart_id] += 1
+            self._totals[cart_id] += line.price
+            self.total_items += 1
+            self.dirty = True
+            return line.quantity
+
+    def remove(self, cart_id: str, sku: str, label: str) -> Optional[int]:
+        """Remove one unit of sku, returns the remaining quantity or None if absent"""
+        with self._lock:
+            lines = self._carts.get(cart_id, {})
+            line = lines.get(sku)
+            if line is None or line.label != label:
+                return None
+
+            line.quantity -= 1
+            if line.quantity == 0:
+                del lines[sku]
+
+            self._item_counts[cart_id] -= 1
+            self._totals[cart_id] = self._totals[cart_id] - line.price if self._item_counts[cart_id] else 0.0
+            self.total_items -= 1
+            self.dirty = True
+            return line.quantity
+
+    def get_items(self, cart_id: str) -> List[dict]:
+        with self._lock:
+            return [line.to_dict() for line in self._carts.get(cart_id, {}).values()]
+
+    def item_count(self, cart_id: str) -> int:
+        return self._item_counts.get(cart_id, 0)
+
+    def cart_total(self, cart_id: str) -> float:
+        return self._totals.get(cart_id, 0.0)
+
+    def cart_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._carts)
+
+    def clear(self):
+        with self._lock:
+            self._carts.clear()
+            self._item_counts.clear()
+            self._totals.clear()
+            self.total_items = 0
+            self.dirty = True
+
+    def __contains__(self, cart_id: str) -> bool:
+        return cart_id in self._carts
+
+    def __len__(self) -> int:
+        return len(self._carts)
+
+    def snapshot(self, path: str):
+        """Atomically write all carts to path"""
+        with self._lock:
+            data = {
+                "timestamp": time.time(),
+                "carts": {
+                    cart_id: [line.to_dict() for line in lines.values()]
+                    for cart_id, lines in self._carts.items()
+                },
+            }
+            self.dirty = False
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> bool:
+        """Load carts from a snapshot, returns False if there is none"""
+        if not os.path.exists(path):
+            return False
+        with open(path) as f:
+            data = json.load(f)
+
+        with self._lock:
+            self._carts = {
+                cart_id: {line["sku"]: CartLine(**line) for line in lines}
+                for cart_id, lines in data["carts"].items()
+            }
+            self._item_counts = {
+                cart_id: sum(line.quantity for line in lines.values())
+                for cart_id, lines in self._carts.items()
+            }
+            self._totals = {
+                cart_id: sum(line.quantity * line.price for line in lines.values())
+                for cart_id, lines in self._carts.items()
+            }
+            self.total_items = sum(self._item_counts.values())
+            self.dirty = False
+        return True
+
+
+cart_store = CartStore()
 
 def get_app_state():
     return {
-        "carts": list(cart_db.keys()),
-        "total_items": sum(len(items) for items in cart_db.values())
+        "carts": cart_store.cart_ids(),
+        "total_items": cart_store.total_items
     }
@@ -0,0 +1,150 @@
+# src/ecocart/api/stream.py
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, Set
+
+SUBSCRIBER_BUFFER = 64  # messages buffered per client before the oldest is dropped
+HEARTBEAT_INTERVAL = 15.0  # seconds of silence before a keep-alive comment is sent
+
+
+class Subscription:
+    """One client's bounded buffer of encoded server-sent events"""
+
+    __slots__ = ("cart_id", "buffer", "ready", "dropped", "lagged")
+
+    def __init__(self, cart_id: str, maxsize: int):
+        self.cart_id = cart_id
+        self.buffer = deque(maxlen=maxsize)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.lagged = False
+
+    def push(self, message: str):
+        if len(self.buffer) == self.buffer.maxlen:
+            # deque drops the oldest message, the client gets a fresh snapshot instead
+            self.dropped += 1
+            self.lagged = True
+        self.buffer.append(message)
+        self.ready.set()
+
+
+class CartStreamHub:
+    """Fans cart deltas out to subscribers on the event loop, publishable from any thread"""
+
+    def __init__(self, buffer_size: int = SUBSCRIBER_BUFFER):
+        self.buffer_size = buffer_size
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._sequences: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, cart_id: str) -> Subscription:
+        """Register a client, must be called from the event loop that serves it"""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(cart_id, self.buffer_size)
+        self._subscribers.setdefault(cart_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.cart_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        self.dropped += subscription.dropped
+        if not subscribers:
+            del self._subscribers[subscription.cart_id]
+
+    def subscriber_count(self, cart_id: Optional[str] = None) -> int:
+        if cart_id is not None:
+            return len(self._subscribers.get(cart_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, cart_id: str, events: Iterable[dict]):
+        """Queue events for a cart's subscribers, one loop wake-up per call"""
+        loop = self._loop
+        if loop is None or cart_id not in self._subscribers:
+            return
+
+        # Encode once here, on the publishing thread, and share the text with every client
+        with self._lock:
+            messages = []
+            for event in events:
+                sequence = self._sequences.get(cart_id, 0) + 1
+                self._sequences[cart_id] = sequence
+                messages.append(encode_event(sequence, event["type"], event))
+            if not messages:
+                return
+
+            # Scheduled under the lock so callbacks run in sequence order
+            try:
+                loop.call_soon_threadsafe(self._fan_out, cart_id, messages)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _fan_out(self, cart_id: str, messages):
+        subscribers = self._subscribers.get(cart_id, ())
+        for subscription in subscribers:
+            for message in messages:
+                subscription.push(message)
+        self.published += len(messages)
+        self.delivered += len(messages) * len(subscribers)
+
+    def stats(self) -> dict:
+        return {
+            "carts": len(self._subscribers),
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped + sum(
+                subscription.dropped
+                for subscribers in self._subscribers.values()
+                for subscription in subscribers
+            ),
+        }
+
+
+def encode_event(sequence: int, event_type: str, data: dict) -> str:
+    return f"id: {sequence}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+async def cart_event_stream(hub: CartStreamHub, cart_id: str, snapshot: Callable[[str], dict],
+                            heartbeat: float = HEARTBEAT_INTERVAL):
+    """Server-sent events for one client: a snapshot, then deltas as they are published
+
+    Deltas carry absolute quantities and totals, so one that is already
+    reflected in the snapshot is harmless to apply again.
+    """
+    subscription = hub.subscribe(cart_id)
+    try:
+        yield encode_event(0, "snapshot", snapshot(cart_id))
+        while True:
+            try:
+                await asyncio.wait_for(subscription.ready.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            subscription.ready.clear()
+            if subscription.lagged:
+                # Deltas were dropped, resynchronise from current state
+                subscription.lagged = False
+                subscription.buffer.clear()
+                yield encode_event(0, "snapshot", snapshot(cart_id))
+                continue
+
+            # Everything buffered goes out as one chunk
+            messages = "".join(subscription.buffer)
+            subscription.buffer.clear()
+            yield messages
+    finally:
+        hub.unsubscribe(subscription)
+
+
+cart_stream_hub = CartStreamHub()
@@ -0,0 +1,157 @@
+"""
+EcoCart SKU Catalog
+Shared, indexed SKU map with mtime-based hot reload
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SKU_MAP_PATH = os.environ.get("ECOCART_SKU_MAP", "config/sku_map.json")
+CHECK_INTERVAL = 1.0  # seconds between file mtime checks
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    label: str
+    sku: str
+    price: Optional[float]
+    details: Any  # raw SKU map entry
+
+
+@dataclass(frozen=True)
+class ClassSkuTable:
+    """Catalog items by model class id, built once per catalog version"""
+    sku_index: np.ndarray  # index into items per class id, -1 for classes outside the catalog
+    items: Tuple[CatalogItem, ...]
+    unmapped: Tuple[str, ...]  # model labels with no SKU
+    version: str  # catalog version the table was built from
+
+    def mapped(self, classes: np.ndarray) -> np.ndarray:
+        """Boolean mask of the class ids that have a SKU"""
+        return self.sku_index[classes] >= 0
+
+    def item(self, cls: int) -> Optional[CatalogItem]:
+        index = self.sku_index[cls]
+        return self.items[index] if index >= 0 else None
+
+
+class SkuCatalog:
+    """SKU map loaded once and indexed by label and SKU, reloaded when the file changes"""
+
+    def __init__(self, path: str, check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.logger = logging.getLogger(__name__)
+        self.version = ""
+        self.reloads = 0
+
+        self._lock = threading.Lock()
+        self._stat = None
+        self._last_check = 0.0
+        self._raw: Dict[str, Any] = {}
+        self._by_label: Dict[str, CatalogItem] = {}
+        self._by_sku: Dict[str, CatalogItem] = {}
+
+        self.reload()
+
+    def _file_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """Parse the SKU map and swap in new indexes"""
+        with self._lock:
+            stat = self._file_stat()
+            with open(self.path, "rb") as f:
+                content = f.read()
+            raw = json.loads(content)
+
+            by_label = {}
+            by_sku = {}
+            for label, entry in raw.items():
+                if isinstance(entry, dict):
+                    item = CatalogItem(label, entry.get("sku", ""), entry.get("price"), entry)
+                else:
+                    item = CatalogItem(label, str(entry), None, entry)
+                by_label[label] = item
+                by_sku[item.sku] = item
+
+            # Readers grab whole dicts, so swapping references is enough
+            self._raw, self._by_label, self._by_sku = raw, by_label, by_sku
+            self._stat = stat
+            self._last_check = time.monotonic()
+            self.version = hashlib.sha1(content).hexdigest()[:12]
+            self.reloads += 1
+            self.logger.info(f"Loaded {len(by_label)} SKU mappings from {self.path} (version {self.version})")
+
+    def refresh(self) -> bool:
+        """Reload if the file changed, checking at most once per check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        try:
+            if self._file_stat() == self._stat:
+                return False
+            self.reload()
+            return True
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to reload SKU map {self.path}, keeping version {self.version}: {e}")
+            return False
+
+    def class_table(self, names: Mapping[int, str]) -> ClassSkuTable:
+        """Dense class id -> SKU table for a model's class names"""
+        with self._lock:
+            by_label, version = self._by_label, self.version
+        items = tuple(by_label.values())
+        positions = {item.label: index for index, item in enumerate(items)}
+        sku_index = np.full(max(names, default=-1) + 1, -1, dtype=np.int32)
+        for cls, label in names.items():
+            sku_index[cls] = positions.get(label, -1)
+        unmapped = tuple(label for cls, label in sorted(names.items()) if label not in positions)
+        return ClassSkuTable(sku_index, items, unmapped, version)
+
+    def get(self, label: str) -> Optional[CatalogItem]:
+        return self._by_label.get(label)
+
+    def get_by_sku(self, sku: str) -> Optional[CatalogItem]:
+        return self._by_sku.get(sku)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The raw SKU map, label -> entry"""
+        return self._raw
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._by_label
+
+    def __iter__(self) -> Iterator[CatalogItem]:
+        return iter(self._by_label.values())
+
+    def __len__(self) -> int:
+        return len(self._by_label)
+
+
+_catalogs: Dict[str, SkuCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(path: Optional[str] = None) -> SkuCatalog:
+    """Shared catalog for path, loaded on first use and refreshed on access"""
+    path = os.path.abspath(path or DEFAULT_SKU_MAP_PATH)
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(path)
+            if catalog is None:
+                catalog = _catalogs[path] = SkuCatalog(path)
+                return catalog
+    catalog.refresh()
+    return catalog
@@ -1,12 +1,45 @@
+import difflib
+import os
 from dataclasses import dataclass
+from typing import (
+    Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union, get_args, get_origin, get_type_hints
+)
+
+import numpy as np
+import yaml
+
+BACKENDS = ("ultralytics", "onnx")
+MATCHING_METHODS = ("greedy", "hungarian")
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+DEFAULT_CONFIG_PATH = "config/tracker_config.yaml"
+CONFIG_ENV = "ECOCART_CONFIG"  # config file to load when none is passed
+ENV_PREFIX = "ECOCART_"  # ECOCART_<SETTING> overrides the config file
+OTHER_ENV = frozenset({  # ECOCART_* variables read by other modules, not Config fields
+    CONFIG_ENV,
+    "ECOCART_SKU_MAP",  # catalog
+    "ECOCART_CART_SNAPSHOT",  # api.state
+    "ECOCART_QUERY_CACHE",  # vector_db
+    "ECOCART_INDEX_PATH",  # vector_db
+    "ECOCART_LLM_BACKEND",  # vector_db
+})
 
 
 @dataclass
 class Config:
     # Model Configuration
     MODEL_PATH: str = "models/yolov8n.pt"
+    INFERENCE_BACKEND: str = "ultralytics"  # "ultralytics" (PyTorch) or "onnx" (ONNX Runtime CPU)
+    ONNX_MODEL_PATH: str = "models/yolov8n.onnx"  # exported model used by the onnx backend
+    INFERENCE_THREADS: int = 0  # ONNX Runtime intra-op threads, 0 lets the runtime decide
     CONFIDENCE_THRESHOLD: float = 0.4
+    CLASS_CONFIDENCE: Optional[Dict[str, float]] = None  # per-label CONFIDENCE_THRESHOLD overrides
     IOU_THRESHOLD: float = 0.5
+    MATCHING_METHOD: str = "greedy"  # "greedy" or "hungarian"
+    INFERENCE_SIZE: int = 640  # model input size (imgsz), a multiple of 32
+    ROI: Optional[List[int]] = None  # [x1, y1, x2, y2] basket crop in frame pixels, None for full frame
+    ROI_MASK: Optional[List[List[int]]] = None  # polygon [[x, y], ...] blacking out the rest of the crop
+    TRACK_LOW_CONFIDENCE: float = 0.1  # weaker detections only extend existing tracks
+    TRACK_TENTATIVE_MISSES: int = 1  # unconfirmed tracks are dropped after more consecutive misses
     LOG_TO_FILE: bool = False
     LOG_LEVEL: str = "INFO"
 
@@ -14,17 +47,341 @@ class Config:
     CART_ID: str = "cart_001"
     BACKEND_URL: str = "http://localhost:8000"
     LABEL_MAP_PATH: str = "config/sku_map.json"
+    CART_CONFIG_DIR: Optional[str] = "config/carts"  # per-cart override files named <cart_id>.yaml
 
     # Detection Settings
     REMOVAL_TIMEOUT: int = 3  # seconds
     STABILIZATION_FRAMES: int = 5  # frames to confirm detection
     FRAME_SKIP: int = 2  # process every nth frame
+    ADAPTIVE_FRAME_SKIP: bool = False  # skip by scene motion instead of FRAME_SKIP
+    MOTION_THRESHOLD: float = 0.5  # percent of downscaled pixels changed that counts as motion
+    MIN_FRAME_SKIP: int = 1  # while moving, infer at most every nth frame
+    MAX_FRAME_SKIP: int = 15  # while static, infer at least every nth frame (keep under REMOVAL_TIMEOUT)
 
     # API Settings
     MAX_RETRY_ATTEMPTS: int = 3
     RETRY_DELAY: float = 1.0
     API_TIMEOUT: int = 5
+    API_ASYNC_DELIVERY: bool = False  # queue events and send from a worker thread
+    OUTBOX_MAX_SIZE: int = 1000  # oldest adds are dropped when full, removes never are
+    COALESCE_WINDOW: float = 2.0  # seconds in which add + remove cancel out
+    API_BATCH_EVENTS: bool = False  # send queued events via /cart/{cart_id}/events
+    BATCH_WINDOW_MS: float = 5.0  # time a burst may accumulate before flushing
+    MAX_EVENTS_PER_BATCH: int = 100
 
     # Video Settings
-    VIDEO_SOURCE: int = 0  # 0 for webcam, or path to video file
+    VIDEO_SOURCE: Union[int, str] = 0  # 0 for webcam, or path to video file
     DISPLAY_WINDOW: bool = True
+    DISPLAY_MAX_FPS: float = 15.0  # preview refresh cap, independent of inference rate, 0 for uncapped
+
+    # Pipeline Settings
+    PIPELINE_MODE: bool = False  # run capture / inference / dispatch as stages
+    FRAME_QUEUE_SIZE: int = 2  # oldest frames are dropped when full
+    EVENT_QUEUE_SIZE: int = 256
+    STATS_LOG_INTERVAL: float = 10.0  # seconds
+
+    # Detection Recording
+    RECORD_DETECTIONS: Optional[str] = None  # log directory for per-frame detections, "{cart_id}" is filled in
+    REPLAY_DETECTIONS: Optional[str] = None  # recorded log run through the tracker instead of the model
+
+    # Fleet Settings
+    MAX_BATCH_SIZE: int = 16  # frames per batched inference call
+    BATCH_MAX_WAIT_MS: float = 20.0  # max wait for a full batch
+    SHARED_WEIGHTS_PATH: Optional[str] = None  # prepared model memory-mapped by every worker (ultralytics backend)
+
+    # Supervisor Settings
+    STATUS_PORT: int = 8090  # local status endpoint, 0 picks a free port
+    STATUS_REPORT_INTERVAL: float = 2.0  # seconds between worker metric reports
+    WORKER_RESTART_DELAY: float = 1.0  # first restart delay, doubles per consecutive crash
+    WORKER_RESTART_MAX_DELAY: float = 60.0  # cap on the delay, a worker up this long counts as healthy again
+
+
+FIELD_TYPES: Dict[str, Any] = get_type_hints(Config)
+
+
+class ConfigError(ValueError):
+    """Invalid settings, every problem found is listed at once"""
+
+    def __init__(self, problems: Sequence[str]):
+        self.problems = list(problems)
+        super().__init__("Invalid configuration:\n  " + "\n  ".join(self.problems))
+
+
+def _type_name(annotation: Any) -> str:
+    return getattr(annotation, "__name__", None) or str(annotation).replace("typing.", "")
+
+
+def _coerce(value: Any, annotation: Any) -> Any:
+    """value as the field type, TypeError when it does not fit (ints are accepted for floats)"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        for option in get_args(annotation):
+            if option is type(None):
+                if value is None:
+                    return None
+                continue
+            try:
+                return _coerce(value, option)
+            except TypeError:
+                pass
+        raise TypeError
+    if origin is list:
+        if not isinstance(value, (list, tuple)):
+            raise TypeError
+        (item,) = get_args(annotation)
+        return [_coerce(v, item) for v in value]
+    if origin is dict:
+        if not isinstance(value, Mapping):
+            raise TypeError
+        key_type, value_type = get_args(annotation)
+        return {_coerce(k, key_type): _coerce(v, value_type) for k, v in value.items()}
+    if isinstance(value, bool) and annotation is not bool:
+        raise TypeError
+    if annotation is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, annotation):
+        raise TypeError
+    return value
+
+
+def _settings(data: Mapping[str, Any], source: str, problems: List[str]) -> Dict[str, Any]:
+    """Settings keyed by field name from a mapping with keys in any case, problems are collected"""
+    values = {}
+    for key, value in data.items():
+        name = str(key).upper()
+        if name not in FIELD_TYPES:
+            close = difflib.get_close_matches(name, FIELD_TYPES, n=1)
+            hint = f", did you mean {close[0].lower()!r}?" if close else ""
+            problems.append(f"{source}: unknown setting {key!r}{hint}")
+            continue
+        try:
+            values[name] = _coerce(value, FIELD_TYPES[name])
+        except TypeError:
+            problems.append(f"{source}: {key} should be {_type_name(FIELD_TYPES[name])}, got {value!r}")
+    return values
+
+
+def _environment_settings(environ: Mapping[str, str], problems: List[str]) -> Dict[str, Any]:
+    """ECOCART_<SETTING> variables, values are parsed as YAML so lists and numbers work"""
+    values = {}
+    for key, raw in environ.items():
+        if not key.startswith(ENV_PREFIX) or key in OTHER_ENV:
+            continue
+        name = key[len(ENV_PREFIX):]
+        if name not in FIELD_TYPES:
+            problems.append(f"environment: unknown setting {key}")
+            continue
+        try:
+            parsed = yaml.safe_load(raw)
+        except yaml.YAMLError:
+            parsed = raw
+        for candidate in (parsed, raw):  # "001" is still a valid CART_ID
+            try:
+                values[name] = _coerce(candidate, FIELD_TYPES[name])
+                break
+            except TypeError:
+                pass
+        else:
+            problems.append(f"environment: {key} should be {_type_name(FIELD_TYPES[name])}, got {raw!r}")
+    return values
+
+
+def _read_yaml(path: str, problems: List[str]) -> Dict[str, Any]:
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        problems.append(f"{path}: expected a mapping of settings")
+        return {}
+    return data
+
+
+def _base_layers(
+    path: Optional[str], overrides: Optional[Mapping[str, Any]], environ: Mapping[str, str], problems: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """(config file, inline cart sections, environment, overrides) settings"""
+    if path is None:
+        path = environ.get(CONFIG_ENV)
+    if path is None and os.path.exists(DEFAULT_CONFIG_PATH):
+        path = DEFAULT_CONFIG_PATH
+
+    data = _read_yaml(path, problems) if path is not None else {}
+    carts = data.pop("carts", None) or {}
+    if not isinstance(carts, dict):
+        problems.append(f"{path}: carts should map cart ids to settings")
+        carts = {}
+    file_settings = _settings(data, path, problems)
+    env_settings = _environment_settings(environ, problems)
+    override_settings = _settings(
+        {key: value for key, value in (overrides or {}).items() if value is not None}, "overrides", problems
+    )
+    return file_settings, carts, env_settings, override_settings
+
+
+def _cart_settings(
+    cart_id: str, carts: Mapping[str, Any], cart_config_dir: Optional[str], problems: List[str]
+) -> Dict[str, Any]:
+    """A cart's section of the config file, then its own <cart_id>.yaml on top"""
+    section = carts.get(cart_id) or {}
+    if not isinstance(section, dict):
+        problems.append(f"carts.{cart_id}: expected a mapping of settings")
+        section = {}
+    values = _settings(section, f"carts.{cart_id}", problems)
+
+    if cart_config_dir:
+        cart_file = os.path.join(cart_config_dir, f"{cart_id}.yaml")
+        if os.path.exists(cart_file):
+            values.update(_settings(_read_yaml(cart_file, problems), cart_file, problems))
+    return values
+
+
+def load_config(
+    path: Optional[str] = None,
+    cart_id: Optional[str] = None,
+    overrides: Optional[Mapping[str, Any]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Config:
+    """Validated Config from defaults < config file < cart settings < ECOCART_* environment < overrides
+
+    path defaults to $ECOCART_CONFIG, then config/tracker_config.yaml if it
+    exists. Keys match Config fields in any case. overrides (e.g. command
+    line flags) skip None values. The cart whose settings apply is cart_id,
+    otherwise the CART_ID the other layers arrive at. Raises ConfigError
+    listing every invalid setting.
+    """
+    environ = os.environ if environ is None else environ
+    problems: List[str] = []
+    file_settings, carts, env_settings, override_settings = _base_layers(path, overrides, environ, problems)
+
+    base = {**file_settings, **env_settings, **override_settings}
+    cart_id = cart_id or base.get("CART_ID", Config.CART_ID)
+    cart_settings = _cart_settings(cart_id, carts, base.get("CART_CONFIG_DIR", Config.CART_CONFIG_DIR), problems)
+    if problems:
+        raise ConfigError(problems)
+
+    config = Config(**{**file_settings, **cart_settings, **env_settings, **override_settings, "CART_ID": cart_id})
+    validate_config(config)
+    return config
+
+
+def load_fleet_config(
+    path: Optional[str],
+    cart_ids: Sequence[str],
+    overrides: Optional[Mapping[str, Any]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Tuple[Config, Dict[str, Dict[str, Any]]]:
+    """Config shared by a fleet, without any cart's settings, and each cart's differences from it"""
+    environ = os.environ if environ is None else environ
+    problems: List[str] = []
+    file_settings, carts, env_settings, override_settings = _base_layers(path, overrides, environ, problems)
+    shared_settings = {**file_settings, **env_settings, **override_settings}
+    cart_config_dir = shared_settings.get("CART_CONFIG_DIR", Config.CART_CONFIG_DIR)
+    per_cart = {cart_id: _cart_settings(cart_id, carts, cart_config_dir, problems) for cart_id in cart_ids}
+    if problems:
+        raise ConfigError(problems)
+
+    shared = Config(**shared_settings)
+    validate_config(shared)
+    cart_overrides = {}
+    for cart_id, cart_settings in per_cart.items():
+        # Environment and overrides still win over the cart's own settings
+        settings = {**cart_settings, **env_settings, **override_settings, "CART_ID": cart_id}
+        validate_config(Config(**{**file_settings, **settings}))
+        cart_overrides[cart_id] = {
+            name: value for name, value in settings.items()
+            if name != "CART_ID" and value != getattr(shared, name)
+        }
+    return shared, cart_overrides
+
+
+def validate_config(config: Config):
+    """Check value ranges and cross-field constraints, raises ConfigError listing every problem"""
+    problems = []
+
+    def check(condition: bool, message: str):
+        if not condition:
+            problems.append(message)
+
+    for name in ("CONFIDENCE_THRESHOLD", "IOU_THRESHOLD", "TRACK_LOW_CONFIDENCE"):
+        check(0.0 <= getattr(config, name) <= 1.0, f"{name} must be between 0 and 1, got {getattr(config, name)}")
+    check(
+        config.TRACK_LOW_CONFIDENCE <= config.CONFIDENCE_THRESHOLD,
+        f"TRACK_LOW_CONFIDENCE ({config.TRACK_LOW_CONFIDENCE}) must not exceed "
+        f"CONFIDENCE_THRESHOLD ({config.CONFIDENCE_THRESHOLD})",
+    )
+    for label, threshold in (config.CLASS_CONFIDENCE or {}).items():
+        check(
+            config.TRACK_LOW_CONFIDENCE <= threshold <= 1.0,
+            f"CLASS_CONFIDENCE[{label!r}] must be between TRACK_LOW_CONFIDENCE and 1, got {threshold}",
+        )
+
+    check(
+        config.INFERENCE_SIZE > 0 and config.INFERENCE_SIZE % 32 == 0,
+        f"INFERENCE_SIZE must be a positive multiple of 32, got {config.INFERENCE_SIZE}",
+    )
+    for name in (
+        "STABILIZATION_FRAMES", "FRAME_SKIP", "MIN_FRAME_SKIP", "MAX_FRAME_SKIP", "REMOVAL_TIMEOUT", "API_TIMEOUT",
+        "OUTBOX_MAX_SIZE", "MAX_EVENTS_PER_BATCH", "FRAME_QUEUE_SIZE", "EVENT_QUEUE_SIZE", "MAX_BATCH_SIZE",
+        "STATS_LOG_INTERVAL", "STATUS_REPORT_INTERVAL",
+    ):
+        check(getattr(config, name) > 0, f"{name} must be positive, got {getattr(config, name)}")
+    for name in (
+        "INFERENCE_THREADS", "TRACK_TENTATIVE_MISSES", "MOTION_THRESHOLD", "MAX_RETRY_ATTEMPTS", "RETRY_DELAY",
+        "COALESCE_WINDOW", "BATCH_WINDOW_MS", "DISPLAY_MAX_FPS", "BATCH_MAX_WAIT_MS", "WORKER_RESTART_DELAY",
+        "WORKER_RESTART_MAX_DELAY",
+    ):
+        check(getattr(config, name) >= 0, f"{name} must not be negative, got {getattr(config, name)}")
+    check(
+        config.MIN_FRAME_SKIP <= config.MAX_FRAME_SKIP,
+        f"MIN_FRAME_SKIP ({config.MIN_FRAME_SKIP}) must not exceed MAX_FRAME_SKIP ({config.MAX_FRAME_SKIP})",
+    )
+    check(0 <= config.STATUS_PORT <= 65535, f"STATUS_PORT must be a port number, got {config.STATUS_PORT}")
+
+    for name, choices in (
+        ("INFERENCE_BACKEND", BACKENDS), ("MATCHING_METHOD", MATCHING_METHODS), ("LOG_LEVEL", LOG_LEVELS)
+    ):
+        check(getattr(config, name) in choices, f"{name} must be one of {choices}, got {getattr(config, name)!r}")
+    if config.MATCHING_METHOD == "hungarian":
+        from src.ecocart import matching
+        check(
+            matching.linear_sum_assignment is not None,
+            "MATCHING_METHOD 'hungarian' needs scipy, install it (pip install scipy) or use 'greedy'",
+        )
+
+    if config.ROI is not None:
+        check(
+            len(config.ROI) == 4 and config.ROI[0] < config.ROI[2] and config.ROI[1] < config.ROI[3],
+            f"ROI must be [x1, y1, x2, y2] with x1 < x2 and y1 < y2, got {config.ROI}",
+        )
+    if config.ROI_MASK is not None:
+        check(
+            len(config.ROI_MASK) >= 3 and all(len(point) == 2 for point in config.ROI_MASK),
+            f"ROI_MASK must be a polygon of at least 3 [x, y] points, got {config.ROI_MASK}",
+        )
+
+    check(os.path.isfile(config.LABEL_MAP_PATH), f"LABEL_MAP_PATH {config.LABEL_MAP_PATH} does not exist")
+    if config.INFERENCE_BACKEND == "onnx" and not config.REPLAY_DETECTIONS:
+        check(os.path.isfile(config.ONNX_MODEL_PATH), f"ONNX_MODEL_PATH {config.ONNX_MODEL_PATH} does not exist")
+    if config.REPLAY_DETECTIONS:
+        check(os.path.isdir(config.REPLAY_DETECTIONS), f"REPLAY_DETECTIONS {config.REPLAY_DETECTIONS} does not exist")
+
+    if problems:
+        raise ConfigError(problems)
+
+
+def class_confidence_table(config: Config, names: Mapping[int, str]) -> Tuple[Optional[np.ndarray], List[str]]:
+    """CONFIDENCE_THRESHOLD per class id with CLASS_CONFIDENCE applied, and the labels the model does not have
+
+    Returns (None, []) without CLASS_CONFIDENCE, a single threshold needs no table.
+    """
+    if not config.CLASS_CONFIDENCE:
+        return None, []
+
+    label_to_class = {label: cls for cls, label in names.items()}
+    table = np.full(max(names) + 1, config.CONFIDENCE_THRESHOLD, dtype=np.float32)
+    unknown = []
+    for label, threshold in config.CLASS_CONFIDENCE.items():
+        if label in label_to_class:
+            table[label_to_class[label]] = threshold
+        else:
+            unknown.append(label)
+    return table, unknown
@@ -1,75 +1,312 @@
 import sqlite3
-import json
+import queue
+import threading
+from concurrent.futures import Future
+from src.ecocart.catalog import DEFAULT_SKU_MAP_PATH, get_catalog
 
 DATABASE_FILE = "ecocart_billing.db"
-SKU_MAP_PATH = "/home/himanshu/projects/walmart/config/sku_map.json"
+SKU_MAP_PATH = DEFAULT_SKU_MAP_PATH
+
+GROUP_COMMIT_MAX_BATCH = 512  # max insert requests folded into one transaction
+BUSY_TIMEOUT_MS = 5000
+
+DEFAULT_CART_ID = "default"  # cart assigned to rows billed before per-cart billing
+SCHEMA_VERSION = 1
+
+# Statements are kept as constants so each connection's statement cache reuses
+# the compiled (prepared) form instead of re-parsing the SQL on every call.
+INSERT_ITEM_SQL = "INSERT INTO billing (cart_id, item_name, price) VALUES (?, ?, ?)"
+TOTAL_SQL = "SELECT COALESCE(SUM(total), 0.0) FROM cart_totals"
+CART_TOTAL_SQL = "SELECT total FROM cart_totals WHERE cart_id = ?"
+ALL_ITEMS_SQL = "SELECT id, item_name, price, timestamp FROM billing ORDER BY timestamp DESC, id DESC"
+CART_ITEMS_SQL = """
+    SELECT id, item_name, price, timestamp FROM billing
+    WHERE cart_id = ?
+    ORDER BY timestamp DESC, id DESC
+"""
+CART_ITEMS_PAGE_SQL = """
+    SELECT id, item_name, price, timestamp FROM billing
+    WHERE cart_id = ?
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
+CART_ITEMS_BEFORE_SQL = """
+    SELECT id, item_name, price, timestamp FROM billing
+    WHERE cart_id = ?
+      AND (timestamp, id) < (?, ?)
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+# Bill lines joined with their precomputed enrichment ('' until it is ready)
+BILL_LINES_SQL = """
+    SELECT b.id, b.item_name, b.price, b.timestamp, COALESCE(e.info, '') FROM billing b
+    LEFT JOIN sku_enrichment e ON e.item_name = b.item_name
+"""
+ALL_LINES_SQL = BILL_LINES_SQL + "ORDER BY b.timestamp DESC, b.id DESC"
+CART_LINES_SQL = BILL_LINES_SQL + """
+    WHERE b.cart_id = ?
+    ORDER BY b.timestamp DESC, b.id DESC
+"""
+CART_LINES_PAGE_SQL = CART_LINES_SQL + "LIMIT ?"
+CART_LINES_BEFORE_SQL = BILL_LINES_SQL + """
+    WHERE b.cart_id = ?
+      AND (b.timestamp, b.id) < (?, ?)
+    ORDER BY b.timestamp DESC, b.id DESC
+    LIMIT ?
+"""
+SAVE_ENRICHMENT_SQL = """
+    INSERT OR REPLACE INTO sku_enrichment (item_name, sku, info, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+"""
+ENRICHED_ITEMS_SQL = "SELECT item_name FROM sku_enrichment"
+UNENRICHED_ITEMS_SQL = """
+    SELECT DISTINCT item_name FROM billing
+    WHERE item_name NOT IN (SELECT item_name FROM sku_enrichment)
+"""
+DELETE_ITEM_SQL = "DELETE FROM billing WHERE id = ?"
+CLEAR_SQL = "DELETE FROM billing"
+CLEAR_CART_SQL = "DELETE FROM billing WHERE cart_id = ?"
+
+SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS billing (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        item_name TEXT NOT NULL,
+        price REAL NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        cart_id TEXT NOT NULL DEFAULT '{DEFAULT_CART_ID}'
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_billing_cart_timestamp
+        ON billing (cart_id, timestamp, id);
+
+    -- Running totals per cart, maintained by the triggers below
+    CREATE TABLE IF NOT EXISTS cart_totals (
+        cart_id TEXT PRIMARY KEY,
+        total REAL NOT NULL DEFAULT 0,
+        item_count INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TRIGGER IF NOT EXISTS billing_total_insert AFTER INSERT ON billing
+    BEGIN
+        INSERT INTO cart_totals (cart_id, total, item_count) VALUES (NEW.cart_id, NEW.price, 1)
+        ON CONFLICT (cart_id) DO UPDATE SET total = total + NEW.price, item_count = item_count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS billing_total_delete AFTER DELETE ON billing
+    BEGIN
+        UPDATE cart_totals
+        SET total = CASE WHEN item_count <= 1 THEN 0 ELSE total - OLD.price END,
+            item_count = item_count - 1
+        WHERE cart_id = OLD.cart_id;
+    END;
+
+    -- Carbon footprint and alternatives per catalog item, filled in once in the background
+    CREATE TABLE IF NOT EXISTS sku_enrichment (
+        item_name TEXT PRIMARY KEY,
+        sku TEXT,
+        info TEXT NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+_generation = 0  # bumped by close_connections so every thread reconnects
 
 def get_sku_map():
-    with open(SKU_MAP_PATH, 'r') as f:
-        return json.load(f)
+    return get_catalog(SKU_MAP_PATH).as_dict()
 
-def initialize_db():
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS billing (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_name TEXT NOT NULL,
-            price REAL NOT NULL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
+def get_connection():
+    """Per-thread connection to DATABASE_FILE, reopened if the path changes"""
+    conn = getattr(_local, "conn", None)
+    key = (DATABASE_FILE, _generation)
+    if conn is not None and _local.key == key:
+        return conn
+    if conn is not None:
+        conn.close()
+
+    conn = sqlite3.connect(DATABASE_FILE, check_same_thread=False, cached_statements=256)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    _local.conn = conn
+    _local.key = key
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+def close_connections():
+    """Close every pooled connection, e.g. on shutdown or between tests"""
+    global _generation
+    with _connections_lock:
+        _generation += 1
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+
+class GroupCommitWriter:
+    """Single writer thread folding concurrent inserts into one transaction"""
+
+    def __init__(self, max_batch: int = GROUP_COMMIT_MAX_BATCH):
+        self.max_batch = max_batch
+        self.transactions = 0
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, rows) -> Future:
+        """Queue rows for insertion, the future resolves once they are committed"""
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="billing-writer", daemon=True)
+                self._thread.start()
+        self._requests.put((rows, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._requests.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                conn = get_connection()
+                with conn:
+                    for rows, _ in batch:
+                        conn.executemany(INSERT_ITEM_SQL, rows)
+                self.transactions += 1
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for rows, future in batch:
+                future.set_result(len(rows))
+
+_writer = GroupCommitWriter()
+
+def _migrate(conn):
+    """Bring a pre-versioned billing table up to the per-cart schema in one transaction"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(billing)")}
+    add_cart_column = ""
+    if columns and "cart_id" not in columns:
+        add_cart_column = f"ALTER TABLE billing ADD COLUMN cart_id TEXT NOT NULL DEFAULT '{DEFAULT_CART_ID}';"
+
+    conn.executescript(f"""
+        BEGIN;
+        {add_cart_column}
+        {SCHEMA_SQL}
+        DELETE FROM cart_totals;
+        INSERT INTO cart_totals (cart_id, total, item_count)
+            SELECT cart_id, SUM(price), COUNT(*) FROM billing GROUP BY cart_id;
+        PRAGMA user_version = {SCHEMA_VERSION};
+        COMMIT;
     """)
-    conn.commit()
-    conn.close()
 
-def add_item_to_bill(item_name):
-    sku_map = get_sku_map()
-    item_info = sku_map.get(item_name)
+def initialize_db():
+    conn = get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < SCHEMA_VERSION:
+        _migrate(conn)
+    else:
+        conn.executescript(SCHEMA_SQL)
+
+def add_item_to_bill(item_name, cart_id=DEFAULT_CART_ID):
+    item_info = get_catalog(SKU_MAP_PATH).get(item_name)
     if not item_info:
         print(f"Warning: Item '{item_name}' not found in SKU map.")
         return False
 
-    price = item_info.get("price")
+    price = item_info.price
     if price is None:
         print(f"Warning: Price not defined for item '{item_name}'.")
         return False
 
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO billing (item_name, price) VALUES (?, ?)", (item_name, price))
-    conn.commit()
-    conn.close()
+    _writer.submit([(cart_id, item_name, price)]).result()
     return True
 
-def get_total_bill():
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT SUM(price) FROM billing")
-    total = cursor.fetchone()[0]
-    conn.close()
-    return total if total is not None else 0.0
-
-def get_all_billed_items():
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, item_name, price, timestamp FROM billing ORDER BY timestamp DESC")
-    items = cursor.fetchall()
-    conn.close()
-    return items
+def add_items_to_bill(item_names, cart_id=DEFAULT_CART_ID):
+    """Bill several items in a single transaction, returns the number billed"""
+    catalog = get_catalog(SKU_MAP_PATH)
+    rows = []
+    for item_name in item_names:
+        item_info = catalog.get(item_name)
+        if not item_info or item_info.price is None:
+            print(f"Warning: Item '{item_name}' not found in SKU map or has no price.")
+            continue
+        rows.append((cart_id, item_name, item_info.price))
+
+    if not rows:
+        return 0
+
+    return _writer.submit(rows).result()
+
+def get_total_bill(cart_id=None):
+    """Running total for one cart, or across all carts"""
+    conn = get_connection()
+    if cart_id is None:
+        return conn.execute(TOTAL_SQL).fetchone()[0]
+    row = conn.execute(CART_TOTAL_SQL, (cart_id,)).fetchone()
+    return row[0] if row else 0.0
+
+def get_all_billed_items(cart_id=None):
+    conn = get_connection()
+    if cart_id is None:
+        return conn.execute(ALL_ITEMS_SQL).fetchall()
+    return conn.execute(CART_ITEMS_SQL, (cart_id,)).fetchall()
+
+def get_billed_items(cart_id, limit=50, before=None):
+    """Keyset page of a cart's items, newest first, after the (timestamp, id) cursor before
+
+    The cursor carries the last row's values rather than its id, so a page
+    still follows on after that row is deleted.
+    """
+    conn = get_connection()
+    if before is None:
+        return conn.execute(CART_ITEMS_PAGE_SQL, (cart_id, limit)).fetchall()
+    return conn.execute(CART_ITEMS_BEFORE_SQL, (cart_id, *before, limit)).fetchall()
+
+def get_bill_lines(cart_id=None, limit=None, before=None):
+    """Billed items with their enrichment text, a keyset page when cart_id and limit are given"""
+    conn = get_connection()
+    if cart_id is None:
+        return conn.execute(ALL_LINES_SQL).fetchall()
+    if limit is None:
+        return conn.execute(CART_LINES_SQL, (cart_id,)).fetchall()
+    if before is None:
+        return conn.execute(CART_LINES_PAGE_SQL, (cart_id, limit)).fetchall()
+    return conn.execute(CART_LINES_BEFORE_SQL, (cart_id, *before, limit)).fetchall()
+
+def save_enrichment(item_name, sku, info):
+    conn = get_connection()
+    with conn:
+        conn.execute(SAVE_ENRICHMENT_SQL, (item_name, sku, info))
+
+def get_enriched_items():
+    return {row[0] for row in get_connection().execute(ENRICHED_ITEMS_SQL)}
+
+def get_unenriched_items():
+    """Billed item names that have no enrichment yet"""
+    return [row[0] for row in get_connection().execute(UNENRICHED_ITEMS_SQL)]
 
 def remove_item_from_bill(item_id: int):
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM billing WHERE id = ?", (item_id,))
-    conn.commit()
-    conn.close()
-
-def clear_bill():
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM billing")
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        conn.execute(DELETE_ITEM_SQL, (item_id,))
+
+def clear_bill(cart_id=None):
+    conn = get_connection()
+    with conn:
+        if cart_id is None:
+            conn.execute(CLEAR_SQL)
+        else:
+            conn.execute(CLEAR_CART_SQL, (cart_id,))
 
 if __name__ == "__main__":
     initialize_db()
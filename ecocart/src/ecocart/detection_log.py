@@ -0,0 +1,104 @@
+"""
+EcoCart Detection Log
+Columnar on-disk record of per-frame detections, replayed through memory maps
+"""
+import json
+import os
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+# Per-frame columns are indexed by frame, per-detection columns by detection
+FRAME_COLUMNS = {"frame_time": np.float64, "count": np.uint32}
+DETECTION_COLUMNS = {"xyxy": (np.float32, 4), "conf": (np.float32, 1), "cls": (np.int16, 1)}
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+Frame = Tuple[float, np.ndarray, np.ndarray, np.ndarray]
+
+
+class DetectionRecorder:
+    """Appends each frame's detections to one raw binary file per column
+
+    Columns are written as they arrive so memory stays flat over long runs,
+    and row counts are derived from file sizes on load, so a log cut short
+    by a crash is still readable up to its last complete frame.
+    """
+
+    def __init__(self, path: str, names: Dict[int, str]):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump({"version": FORMAT_VERSION, "names": {str(k): v for k, v in names.items()}}, f)
+        columns = list(FRAME_COLUMNS) + list(DETECTION_COLUMNS)
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name in columns}
+        self.frames = 0
+
+    def append(self, frame_time: float, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        # Detection columns first, the frame row is what makes them visible to readers
+        self._files["xyxy"].write(np.ascontiguousarray(xyxy, dtype=np.float32).tobytes())
+        self._files["conf"].write(np.ascontiguousarray(conf, dtype=np.float32).tobytes())
+        self._files["cls"].write(np.ascontiguousarray(cls, dtype=np.int16).tobytes())
+        self._files["count"].write(np.uint32(len(conf)).tobytes())
+        self._files["frame_time"].write(np.float64(frame_time).tobytes())
+        self.frames += 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+class DetectionLog:
+    """Read-only view of a recorded log, frames are zero-copy slices of memory-mapped columns"""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported detection log version {meta.get('version')} in {path}")
+        self.path = path
+        self.names: Dict[int, str] = {int(k): v for k, v in meta["names"].items()}
+
+        frame_time = self._column("frame_time", FRAME_COLUMNS["frame_time"])
+        count = self._column("count", FRAME_COLUMNS["count"])
+        frames = min(len(frame_time), len(count))
+        self.offsets = np.zeros(frames + 1, dtype=np.int64)
+        np.cumsum(count[:frames], out=self.offsets[1:])
+
+        xyxy = self._column("xyxy", DETECTION_COLUMNS["xyxy"][0], 4)
+        conf = self._column("conf", DETECTION_COLUMNS["conf"][0])
+        cls = self._column("cls", DETECTION_COLUMNS["cls"][0])
+        # Drop a trailing frame whose detections were not completely written
+        while frames and self.offsets[frames] > min(len(xyxy), len(conf), len(cls)):
+            frames -= 1
+        self.frame_time = frame_time[:frames]
+        self.offsets = self.offsets[:frames + 1]
+        self.xyxy, self.conf, self.cls = xyxy, conf, cls
+
+    def _column(self, name: str, dtype, width: int = 1) -> np.ndarray:
+        path = os.path.join(self.path, f"{name}.bin")
+        rows = os.path.getsize(path) // (np.dtype(dtype).itemsize * width)
+        if rows == 0:
+            return np.empty((0, width) if width > 1 else 0, dtype=dtype)
+        shape = (rows, width) if width > 1 else (rows,)
+        # Plain ndarray view of the mapping, slicing a np.memmap per frame is several times slower
+        return np.memmap(path, dtype=dtype, mode="r", shape=shape).view(np.ndarray)
+
+    def __len__(self) -> int:
+        return len(self.frame_time)
+
+    def __getitem__(self, index: int) -> Frame:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return float(self.frame_time[index]), self.xyxy[start:end], self.conf[start:end], self.cls[start:end]
+
+    def __iter__(self) -> Iterator[Frame]:
+        return (self[index] for index in range(len(self)))
+
+    @property
+    def detections(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def duration(self) -> float:
+        """Seconds of recorded time between the first and last frame"""
+        return float(self.frame_time[-1] - self.frame_time[0]) if len(self) > 1 else 0.0
@@ -0,0 +1,113 @@
+"""
+EcoCart Display
+Annotation rendering for the preview window, capped at its own frame rate
+"""
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from src.ecocart.catalog import CatalogItem, ClassSkuTable
+
+CONFIRMED_COLOR = (0, 255, 0)
+CANDIDATE_COLOR = (0, 165, 255)
+TEXT_COLOR = (255, 255, 255)
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+DEADLINE_TOLERANCE = 0.1  # fraction of the display interval a frame may arrive early and still be shown
+
+
+class AnnotationRenderer:
+    """Draws detections and the cart header onto frames
+
+    Works from the arrays process_detections already parsed, the class id ->
+    SKU table it filters with and the label counts it keeps for the cart,
+    so catalog membership is one vectorized mask rather than a lookup per
+    box. Label prefixes and header lines are formatted once and reused
+    until the catalog or item count changes. Drawing goes into the frame
+    itself when the caller no longer needs it, otherwise into a buffer
+    reused across frames. Rendering text with putText measured faster than
+    blitting pre-rendered text bitmaps, so strings are cached rather than
+    pixels.
+    """
+
+    def __init__(self, cart_id: str, confidence_threshold: float, max_fps: float = 0.0):
+        self.confidence_threshold = confidence_threshold
+        self.class_confidence: Optional[np.ndarray] = None  # threshold per class id, overrides the scalar
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.cart_line = f"Cart: {cart_id}"
+        self._items_line = ""
+        self._item_count: Optional[int] = None
+        self._prefixes: Dict[int, str] = {}
+        self._table_version: Optional[str] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._next_due = float("-inf")
+        self.shown = 0
+        self.skipped = 0
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Whether the display cap allows showing another frame now
+
+        Deadlines advance by a fixed interval rather than from the last
+        frame shown, so capture jitter around the boundary does not drop
+        the rate below the cap. A deadline more than an interval behind is
+        reset instead of letting frames burst through to catch up.
+        """
+        if self.min_interval:
+            now = time.perf_counter() if now is None else now
+            if now < self._next_due - self.min_interval * DEADLINE_TOLERANCE:
+                self.skipped += 1
+                return False
+            late = now - self._next_due >= self.min_interval
+            self._next_due = (now if late else self._next_due) + self.min_interval
+        self.shown += 1
+        return True
+
+    def _prefix(self, cls: int, catalog_item: CatalogItem, version: str) -> str:
+        """'label (sku)' for a class id, formatted once per catalog version"""
+        if version != self._table_version:
+            self._prefixes.clear()
+            self._table_version = version
+        prefix = self._prefixes.get(cls)
+        if prefix is None:
+            prefix = self._prefixes[cls] = f"{catalog_item.label} ({catalog_item.sku})"
+        return prefix
+
+    def render(
+        self,
+        frame: np.ndarray,
+        xyxy: np.ndarray,
+        confs: np.ndarray,
+        classes: np.ndarray,
+        class_table: ClassSkuTable,
+        cart_labels: Counter,
+        in_place: bool = False,
+    ) -> np.ndarray:
+        if in_place:
+            canvas = frame
+        else:
+            if self._buffer is None or self._buffer.shape != frame.shape:
+                self._buffer = np.empty_like(frame)
+            np.copyto(self._buffer, frame)
+            canvas = self._buffer
+
+        threshold = self.confidence_threshold if self.class_confidence is None else self.class_confidence[classes]
+        shown = np.flatnonzero((confs >= threshold) & class_table.mapped(classes))
+        corners = xyxy[shown].astype(np.int32).tolist()
+        for (x1, y1, x2, y2), conf, cls in zip(corners, confs[shown].tolist(), classes[shown].tolist()):
+            catalog_item = class_table.item(cls)
+            color = CONFIRMED_COLOR if cart_labels[catalog_item.label] else CANDIDATE_COLOR
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(canvas, f"{self._prefix(cls, catalog_item, class_table.version)} {conf:.2f}", (x1, y1 - 10), FONT, 0.5, TEXT_COLOR, 2)
+
+        item_count = sum(cart_labels.values())
+        if item_count != self._item_count:
+            self._item_count = item_count
+            self._items_line = f"Items: {item_count}"
+        cv2.putText(canvas, self.cart_line, (10, 30), FONT, 0.6, TEXT_COLOR, 2)
+        cv2.putText(canvas, self._items_line, (10, 55), FONT, 0.6, TEXT_COLOR, 2)
+        return canvas
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"shown": self.shown, "skipped": self.skipped}
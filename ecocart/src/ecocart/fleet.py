@@ -0,0 +1,208 @@
+"""
+EcoCart Fleet Runner
+Batched inference for many carts sharing a single model instance
+"""
+import logging
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+
+from src.ecocart.config import Config
+from src.ecocart.inference import create_backend
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.utils.stats import StageStats
+
+VideoSource = Union[int, str]
+
+
+class CartStream:
+    """Capture thread for one cart, keeping only its latest frame"""
+
+    def __init__(self, tracker: GroceryCartTracker, source: VideoSource, ready: threading.Condition):
+        self.tracker = tracker
+        self.source = source
+        self.ready = ready
+        self.latest: Optional[Tuple] = None
+        self.dropped = 0
+        self.processed = 0
+        self.alive = False
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cart_id(self) -> str:
+        return self.tracker.config.CART_ID
+
+    def start(self) -> bool:
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            self.logger.error(f"Failed to open video source for cart {self.cart_id}")
+            return False
+        self.tracker.roi.prepare(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+        self.alive = True
+        self._thread = threading.Thread(
+            target=self._capture_loop, args=(cap,), name=f"capture-{self.cart_id}", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def offer(self, frame, frame_time: float):
+        """Replace the pending frame with a newer one"""
+        with self.ready:
+            if self.latest is not None:
+                self.dropped += 1
+            self.latest = (frame, frame_time)
+            self.ready.notify()
+
+    def take(self) -> Optional[Tuple]:
+        entry, self.latest = self.latest, None
+        return entry
+
+    def _capture_loop(self, cap):
+        try:
+            while not self._stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    self.logger.error(f"Frame capture failed for cart {self.cart_id}")
+                    break
+
+                self.tracker.frame_count += 1
+                if not self.tracker.should_infer(frame):
+                    continue
+
+                self.offer(frame, time.time())
+        finally:
+            cap.release()
+            with self.ready:
+                self.alive = False
+                self.ready.notify()
+
+
+class MultiCartRunner:
+    """Collects frames from many carts into batched calls on one shared model"""
+
+    def __init__(
+        self,
+        carts: Sequence[Tuple[str, VideoSource]],
+        config: Config,
+        model: Optional[Any] = None,
+        cart_overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.model = model if model is not None else create_backend(config)
+        self.logger.info(f"Loaded shared {config.INFERENCE_BACKEND} model")
+
+        self.ready = threading.Condition()
+        self.streams: List[CartStream] = []
+        for cart_id, source in carts:
+            overrides = (cart_overrides or {}).get(cart_id, {})
+            cart_config = replace(config, CART_ID=cart_id, VIDEO_SOURCE=source, **overrides)
+            tracker = GroceryCartTracker(cart_config, model=self.model)
+            self.streams.append(CartStream(tracker, source, self.ready))
+
+        self.next_stream = 0  # where the next batch starts filling, rotates so no cart is starved
+        self.batch_latency = StageStats()
+        self.frames_processed = 0
+        self.batches = 0
+
+    def collect_batch(self) -> List[Tuple[CartStream, object, float]]:
+        """Wait for a full batch or the max-wait deadline, whichever comes first"""
+        max_batch = max(1, self.config.MAX_BATCH_SIZE)
+        deadline: Optional[float] = None
+
+        with self.ready:
+            order = self.streams[self.next_stream:] + self.streams[:self.next_stream]
+            while True:
+                ready = [stream for stream in order if stream.latest is not None]
+                alive = sum(1 for stream in self.streams if stream.alive)
+                now = time.perf_counter()
+
+                if ready and deadline is None:
+                    deadline = now + self.config.BATCH_MAX_WAIT_MS / 1000
+                if len(ready) >= min(max_batch, max(alive, 1)) or (ready and now >= deadline):
+                    break
+                if not ready and alive == 0:
+                    return []
+
+                self.ready.wait(timeout=(deadline - now) if deadline else 0.5)
+
+            batch = []
+            for stream in ready[:max_batch]:
+                frame, frame_time = stream.take()
+                batch.append((stream, frame, frame_time))
+            self.next_stream = (self.streams.index(batch[-1][0]) + 1) % len(self.streams)
+            return batch
+
+    def process_batch(self, batch: List[Tuple[CartStream, object, float]]):
+        """Run one batched forward pass and fan results out to each cart's tracker"""
+        start = time.perf_counter()
+        frames = [stream.tracker.roi.apply(frame) for stream, frame, _ in batch]
+        results = self.model(
+            frames, imgsz=self.config.INFERENCE_SIZE, conf=self.config.TRACK_LOW_CONFIDENCE, verbose=False
+        )
+        self.batch_latency.record(time.perf_counter() - start)
+
+        for (stream, _, frame_time), result in zip(batch, results):
+            stream.tracker.process_detections(result, frame_time)
+            stream.processed += 1
+
+        self.frames_processed += len(batch)
+        self.batches += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "carts": len(self.streams),
+            "frames_processed": self.frames_processed,
+            "avg_batch_size": round(self.frames_processed / self.batches, 2) if self.batches else 0.0,
+            "batch_latency": self.batch_latency.snapshot(),
+            "dropped_frames": {stream.cart_id: stream.dropped for stream in self.streams},
+            "inferences_saved": {
+                stream.cart_id: stream.tracker.frame_scheduler.get_stats()["saved_vs_fixed"]
+                for stream in self.streams
+            },
+        }
+
+    def run(self):
+        """Main batched inference loop for all carts"""
+        started = [stream for stream in self.streams if stream.start()]
+        if not started:
+            self.logger.error("No video sources could be opened")
+            return
+
+        self.logger.info(f"Starting batched inference for {len(started)} carts")
+        start = last_report = time.perf_counter()
+
+        try:
+            while True:
+                batch = self.collect_batch()
+                if not batch:
+                    break
+                self.process_batch(batch)
+
+                now = time.perf_counter()
+                if now - last_report >= self.config.STATS_LOG_INTERVAL:
+                    fps = self.frames_processed / (now - start)
+                    self.logger.info(f"Fleet stats: {fps:.1f} frames/s {self.get_stats()}")
+                    last_report = now
+
+        except KeyboardInterrupt:
+            self.logger.info("Stopping inference...")
+        finally:
+            for stream in self.streams:
+                stream.stop()
+                stream.tracker.stop_recording()
+            for stream in self.streams:
+                stream.tracker.api_client.flush(timeout=self.config.API_TIMEOUT)
+            self.logger.info(f"Fleet stats: {self.get_stats()}")
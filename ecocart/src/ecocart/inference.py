@@ -0,0 +1,229 @@
+"""
+EcoCart Inference Backends
+PyTorch (ultralytics) or exported ONNX Runtime detection behind one call interface
+"""
+import ast
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.ecocart.config import BACKENDS, Config
+
+try:
+    import onnxruntime as ort
+except ImportError:  # onnxruntime is optional, only the ONNX backend needs it
+    ort = None
+
+PAD_VALUE = 114  # letterbox border grey, as used by ultralytics
+STRIDE = 32  # largest YOLOv8 feature stride, dynamic input sides are padded to a multiple of it
+
+
+class Boxes:
+    """Detections of one image with the fields process_detections reads from ultralytics Boxes"""
+
+    __slots__ = ("xyxy", "conf", "cls")
+
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+    def __getitem__(self, index) -> "Boxes":
+        index = slice(index, index + 1) if isinstance(index, int) else index
+        return Boxes(self.xyxy[index], self.conf[index], self.cls[index])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class Detections:
+    """Result of one image, mirroring the ultralytics Results attributes the tracker uses"""
+
+    __slots__ = ("boxes", "names", "orig_shape")
+
+    def __init__(self, boxes: Boxes, names: Dict[int, str], orig_shape: Tuple[int, int]):
+        self.boxes = boxes
+        self.names = names
+        self.orig_shape = orig_shape
+
+
+def letterbox(image: np.ndarray, shape: Tuple[int, int]) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """Resize keeping aspect ratio and pad to shape (h, w), returns (image, scale, (pad_x, pad_y))"""
+    height, width = image.shape[:2]
+    scale = min(shape[0] / height, shape[1] / width)
+    new_width, new_height = round(width * scale), round(height * scale)
+    pad_x, pad_y = (shape[1] - new_width) / 2, (shape[0] - new_height) / 2
+
+    if (new_width, new_height) != (width, height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    top, bottom = round(pad_y - 0.1), round(pad_y + 0.1)
+    left, right = round(pad_x - 0.1), round(pad_x + 0.1)
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(PAD_VALUE,) * 3)
+    return image, scale, (left, top)
+
+
+def decode_predictions(
+    output: np.ndarray,
+    scale: float,
+    pad: Tuple[float, float],
+    orig_shape: Tuple[int, int],
+    conf_threshold: float = 0.25,
+    iou_threshold: float = 0.7,
+    max_det: int = 300,
+) -> Boxes:
+    """Raw YOLOv8 head output (4 + classes, anchors) to class-aware NMS'd boxes in image pixels"""
+    preds = output.T  # (anchors, 4 + classes)
+    scores = preds[:, 4:]
+    cls = scores.argmax(axis=1)
+    conf = scores[np.arange(len(scores)), cls]
+    keep = conf >= conf_threshold
+    if not keep.any():
+        return Boxes(np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32))
+
+    cxcywh, conf, cls = preds[keep, :4], conf[keep], cls[keep]
+    xywh = np.column_stack([cxcywh[:, :2] - cxcywh[:, 2:] / 2, cxcywh[:, 2:]])
+    order = cv2.dnn.NMSBoxesBatched(xywh.tolist(), conf.tolist(), cls.tolist(), conf_threshold, iou_threshold)
+    order = np.asarray(order, dtype=np.int64).reshape(-1)
+    order = order[np.argsort(-conf[order], kind="stable")][:max_det]
+
+    xyxy = np.column_stack([xywh[order, :2], xywh[order, :2] + xywh[order, 2:]])
+    xyxy -= (pad[0], pad[1], pad[0], pad[1])
+    xyxy /= scale
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, orig_shape[1])
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, orig_shape[0])
+    return Boxes(xyxy.astype(np.float32), conf[order].astype(np.float32), cls[order].astype(np.float32))
+
+
+class OnnxBackend:
+    """YOLOv8 exported to ONNX, run on CPU with ONNX Runtime and no torch import
+
+    Called like an ultralytics YOLO model: model(image_or_images, imgsz=...)
+    returns one Detections per image. Letterboxing and NMS follow the
+    ultralytics defaults so results line up with the PyTorch backend. A
+    model exported with a fixed input shape always runs at that shape and
+    ignores imgsz, a dynamic-shape export gets the minimal rectangle that
+    fits imgsz like PyTorch does. Class names come from the export's
+    metadata unless names is given.
+    """
+
+    def __init__(
+        self, model_path: str, threads: int = 0, conf: float = 0.25, iou: float = 0.7,
+        names: Optional[Dict[int, str]] = None,
+    ):
+        if ort is None:
+            raise ImportError("onnxruntime is required for the onnx inference backend")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_shape = self.session.get_inputs()[0].shape  # [batch, 3, h, w], dims may be symbolic
+        self.conf = conf
+        self.iou = iou
+
+        if names is None:
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            if "names" not in metadata:
+                raise ValueError(
+                    f"{model_path} has no class names in its metadata, re-export it with ultralytics "
+                    "or pass names explicitly"
+                )
+            names = ast.literal_eval(metadata["names"])
+        self.names: Dict[int, str] = dict(names)
+
+    def _input_size(self, imgsz: int, image_shape: Tuple[int, ...]) -> Tuple[int, int]:
+        height, width = self.input_shape[2:]
+        if isinstance(height, int) and isinstance(width, int):
+            return height, width
+        scale = imgsz / max(image_shape[:2])
+        return tuple(-(-round(side * scale) // STRIDE) * STRIDE for side in image_shape[:2])
+
+    def run_graph(self, blob: np.ndarray) -> np.ndarray:
+        """Raw head output (batch, 4 + classes, anchors) for a preprocessed NCHW blob"""
+        return self.session.run(None, {self.input_name: blob})[0]
+
+    def __call__(
+        self, source: Union[np.ndarray, Sequence[np.ndarray]], imgsz: int = 640, verbose: bool = False, **kwargs: Any
+    ) -> List[Detections]:
+        images = [source] if isinstance(source, np.ndarray) else list(source)
+        conf = kwargs.get("conf", self.conf)
+
+        results = []
+        for image in images:
+            padded, scale, pad = letterbox(image, self._input_size(imgsz, image.shape))
+            blob = cv2.dnn.blobFromImage(padded, 1 / 255.0, swapRB=True)
+            output = self.run_graph(blob)[0]
+            boxes = decode_predictions(output, scale, pad, image.shape[:2], conf, self.iou)
+            results.append(Detections(boxes, self.names, image.shape[:2]))
+        return results
+
+
+def export_onnx(model_path: str, imgsz: int = 640, int8: bool = False) -> str:
+    """Export a .pt model to ONNX next to it, optionally INT8-quantized, returns the .onnx path"""
+    from ultralytics import YOLO
+
+    onnx_path = YOLO(model_path).export(format="onnx", imgsz=imgsz, simplify=True)
+    if not int8:
+        return onnx_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = onnx_path.replace(".onnx", "_int8.onnx")
+    quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+    return int8_path
+
+
+def export_shared_weights(model_path: str, path: str) -> str:
+    """Save a .pt model as it looks once ultralytics has prepared it for inference, returns path
+
+    ultralytics fuses Conv+BN, converts to float and may switch to
+    channels-last the first time it predicts, each of which copies every
+    weight. Saving the model after that step lets workers memory-map the
+    file and run on the mapped tensors directly, so all processes share one
+    copy of the weights through the page cache.
+    """
+    import torch
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    model.predict(np.zeros((STRIDE, STRIDE, 3), dtype=np.uint8), imgsz=STRIDE, verbose=False)
+    model.model = model.predictor.model.backend.model
+    model.predictor = None
+    model.ckpt = {}  # the original checkpoint would be a second copy of the weights
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    torch.save(model, path)
+    return path
+
+
+def load_shared_weights(path: str):
+    """YOLO model whose weights are read-only mappings of a file from export_shared_weights"""
+    import torch
+
+    model = torch.load(path, mmap=True, weights_only=False)
+    # The predictor is built on a deep copy of the model, point it back at the mapped one
+    model.predict(np.zeros((STRIDE, STRIDE, 3), dtype=np.uint8), imgsz=STRIDE, verbose=False)
+    model.predictor.model.backend.model = model.model
+    return model
+
+
+def create_backend(config: Config):
+    """Detection model for config.INFERENCE_BACKEND"""
+    if config.INFERENCE_BACKEND == "onnx":
+        return OnnxBackend(config.ONNX_MODEL_PATH, threads=config.INFERENCE_THREADS, conf=config.TRACK_LOW_CONFIDENCE)
+    if config.INFERENCE_BACKEND == "ultralytics":
+        if config.SHARED_WEIGHTS_PATH is not None:
+            return load_shared_weights(config.SHARED_WEIGHTS_PATH)
+
+        from ultralytics import YOLO
+
+        return YOLO(config.MODEL_PATH)
+    raise ValueError(f"Unknown inference backend {config.INFERENCE_BACKEND!r}, expected one of {BACKENDS}")
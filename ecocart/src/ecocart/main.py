@@ -1,18 +1,26 @@
 import cv2
+import os
 import time
-import json
 import logging
-from collections import defaultdict, deque
+from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
-from ultralytics import YOLO
+from typing import Any, Dict, Optional, Tuple
 import numpy as np
 
-from src.ecocart.config import Config
-from src.ecocart.utils.api_client import APIClient
+from src.ecocart.catalog import ClassSkuTable, get_catalog
+from src.ecocart.config import Config, class_confidence_table
+from src.ecocart.detection_log import DetectionLog, DetectionRecorder
+from src.ecocart.display import AnnotationRenderer
+from src.ecocart.inference import Boxes, Detections, create_backend
+from src.ecocart.matching import extract_detections
+from src.ecocart.pipeline import EventDispatcher, TrackerPipeline
+from src.ecocart.roi import RegionOfInterest
+from src.ecocart.scheduler import FrameScheduler
+from src.ecocart.tracking import MultiObjectTracker
+from src.ecocart.utils.api_client import create_api_client
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedItem:
     label: str
     sku: str
@@ -26,8 +34,15 @@ class DetectedItem:
 
 
 class GroceryCartTracker:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, model: Optional[Any] = None):
         self.config = config
+        self.model = model  # shared model instance, created for INFERENCE_BACKEND if None
+        self.event_dispatcher: Optional[EventDispatcher] = None
+        self.roi = RegionOfInterest.from_config(config)
+        self.detection_log: Optional[DetectionLog] = None
+        self.detection_recorder: Optional[DetectionRecorder] = None
+        self.class_table: Optional[ClassSkuTable] = None  # model class id -> catalog item, rebuilt on reload
+        self.annotator = AnnotationRenderer(config.CART_ID, config.CONFIDENCE_THRESHOLD, config.DISPLAY_MAX_FPS)
         self.setup_logging()
         self.load_dependencies()
         self.reset_state()
@@ -38,6 +53,7 @@ class GroceryCartTracker:
         handlers = [logging.StreamHandler()]
 
         if self.config.LOG_TO_FILE:
+            os.makedirs("logs", exist_ok=True)
             handlers.append(logging.FileHandler(f"logs/cart_{self.config.CART_ID}.log"))
 
         logging.basicConfig(
@@ -50,17 +66,34 @@ class GroceryCartTracker:
     def load_dependencies(self):
         """Load model and SKU mappings"""
         try:
-            # Load SKU mapping
-            with open(self.config.LABEL_MAP_PATH, "r") as f:
-                self.label_to_sku = json.load(f)
-            self.logger.info(f"Loaded {len(self.label_to_sku)} SKU mappings")
-
-            # Load YOLO model
-            self.model = YOLO(self.config.MODEL_PATH)
-            self.logger.info(f"Loaded model: {self.config.MODEL_PATH}")
+            # Load SKU mapping (shared, hot-reloaded catalog)
+            self.catalog = get_catalog(self.config.LABEL_MAP_PATH)
+            self.logger.info(f"Loaded {len(self.catalog)} SKU mappings")
+
+            # Load detection model, a replayed log stands in for it with the recorded class names
+            if self.config.REPLAY_DETECTIONS:
+                self.detection_log = DetectionLog(self.config.REPLAY_DETECTIONS)
+                if self.model is None:
+                    self.model = self.detection_log
+                self.logger.info(f"Loaded {len(self.detection_log)} recorded frames: {self.config.REPLAY_DETECTIONS}")
+            elif self.model is None:
+                self.model = create_backend(self.config)
+                self.logger.info(f"Loaded {self.config.INFERENCE_BACKEND} model")
+
+            if self.config.RECORD_DETECTIONS:
+                path = self.config.RECORD_DETECTIONS.format(cart_id=self.config.CART_ID)
+                self.detection_recorder = DetectionRecorder(path, self.model.names)
+                self.logger.info(f"Recording detections to {path}")
+
+            self.update_class_table()
+            if self.class_table.unmapped:
+                self.logger.warning(
+                    f"{len(self.class_table.unmapped)} of {len(self.model.names)} model classes have no SKU "
+                    f"and are ignored: {list(self.class_table.unmapped)}"
+                )
 
             # Initialize API client
-            self.api_client = APIClient(self.config)
+            self.api_client = create_api_client(self.config)
 
             # Test backend connection
             if not self.api_client.ping_backend():
@@ -77,12 +110,30 @@ class GroceryCartTracker:
 
     def reset_state(self):
         """Reset tracking state"""
-        self.next_track_id = 1
-        self.track_id_map = {}
-        self.cart_inventory: Dict[str, DetectedItem] = {}
-        self.detection_history: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=self.config.STABILIZATION_FRAMES)
+        # Per-class thresholds are looked up by class id on the hot path, built once here
+        class_confidence, unknown = None, []
+        if self.config.CLASS_CONFIDENCE:
+            class_confidence, unknown = class_confidence_table(self.config, self.model.names)
+        if unknown:
+            self.logger.warning(f"CLASS_CONFIDENCE labels the model does not detect: {unknown}")
+        self.annotator.class_confidence = class_confidence
+        self.object_tracker = MultiObjectTracker(
+            iou_threshold=self.config.IOU_THRESHOLD,
+            high_confidence=self.config.CONFIDENCE_THRESHOLD,
+            low_confidence=self.config.TRACK_LOW_CONFIDENCE,
+            confirm_hits=self.config.STABILIZATION_FRAMES,
+            max_age=self.config.REMOVAL_TIMEOUT,
+            method=self.config.MATCHING_METHOD,
+            tentative_misses=self.config.TRACK_TENTATIVE_MISSES,
+            class_confidence=class_confidence,
         )
+        self.cart_inventory: Dict[int, DetectedItem] = {}  # keyed by track ID
+        self.cart_labels: Counter = Counter()  # items in the cart per label
+        self.cart_events: Counter = Counter()  # adds and removes decided so far
+        self.frame_detections: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        )  # last frame's catalog detections in frame coordinates, reused for drawing
+        self.frame_scheduler = FrameScheduler.from_config(self.config)
         self.frame_count = 0
         self.coins = 0
 
@@ -121,6 +172,9 @@ class GroceryCartTracker:
 
     def add_item_to_cart(self, item: DetectedItem) -> bool:
         """Add item to cart via API"""
+        if self.event_dispatcher is not None:
+            return self.event_dispatcher.submit("add", item)
+
         success = self.api_client.add_item(
             self.config.CART_ID, item.sku, item.label, item.confidence
         )
@@ -136,6 +190,9 @@ class GroceryCartTracker:
 
     def remove_item_from_cart(self, item: DetectedItem) -> bool:
         """Remove item from cart via API"""
+        if self.event_dispatcher is not None:
+            return self.event_dispatcher.submit("remove", item)
+
         success = self.api_client.remove_item(self.config.CART_ID, item.sku, item.label)
 
         if success:
@@ -145,164 +202,129 @@ class GroceryCartTracker:
 
         return success
 
-    def process_detections(self, results, frame_time: float):
-        """Process YOLO detections and update cart state"""
-        current_detections = {}
-
-        # Parse detections
-        for box in results.boxes:
-            conf = float(box.conf[0])
-            if conf < self.config.CONFIDENCE_THRESHOLD:
-                continue
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """Frame scheduler decision, motion is only scored inside the ROI"""
+        return self.frame_scheduler.should_infer(self.roi.crop(frame))
 
-            cls = int(box.cls[0])
-            label = self.model.names[cls]
+    def infer(self, frame: np.ndarray):
+        """Run the model on the ROI at INFERENCE_SIZE, boxes stay in ROI coordinates
 
-            if label not in self.label_to_sku:
-                continue
+        The model keeps boxes down to TRACK_LOW_CONFIDENCE, weak ones feed the
+        tracker's second association stage and the detection log.
+        """
+        return self.model(
+            self.roi.apply(frame), imgsz=self.config.INFERENCE_SIZE, conf=self.config.TRACK_LOW_CONFIDENCE, verbose=False
+        )[0]
 
-            bbox = tuple(map(int, box.xyxy[0]))
-            sku = self.label_to_sku[label]["sku"]
+    def update_class_table(self) -> ClassSkuTable:
+        """Class id -> SKU table for the current catalog version, rebuilt only after a reload"""
+        if self.class_table is None or self.class_table.version != self.catalog.version:
+            self.class_table = self.catalog.class_table(self.model.names)
+        return self.class_table
 
-            # Check if this detection matches an existing item
-            matched_key = None
-            for key, existing_item in self.cart_inventory.items():
-                if existing_item.label == label and self.is_same_detection(
-                    bbox, existing_item
-                ):
-                    matched_key = key
-                    break
-
-            if matched_key:
-                # Update existing item
-                item = self.cart_inventory[matched_key]
-                item.bbox = bbox
-                item.confidence = max(item.confidence, conf)
+    def process_detections(self, results, frame_time: float):
+        """Process YOLO detections and update cart state"""
+        self.catalog.refresh()
+        class_table = self.update_class_table()
+
+        # Parse detections, weak ones are kept for the tracker's second association stage
+        xyxy, confs, classes = extract_detections(results)
+        xyxy = self.roi.to_frame(xyxy)
+        if self.detection_recorder is not None:
+            self.detection_recorder.append(frame_time, xyxy, confs, classes)
+        keep = (confs >= self.config.TRACK_LOW_CONFIDENCE) & class_table.mapped(classes)
+
+        self.frame_detections = (xyxy[keep], confs[keep], classes[keep])
+        confirmed, _ = self.object_tracker.update(*self.frame_detections, frame_time)
+
+        # Keep cart items in step with their tracks
+        tracks = self.object_tracker.tracks
+        for track_id, item in self.cart_inventory.items():
+            track = tracks.get(track_id)
+            if track is not None and track.last_seen == frame_time:
+                item.bbox = tuple(track.box.astype(int).tolist())
+                item.confidence = track.confidence
                 item.last_seen = frame_time
-                item.detection_count += 1
-                current_detections[matched_key] = item
-            else:
-                # New detection
-                item_key = f"{label}_{len(current_detections)}"
-                item = DetectedItem(
-                    label=label,
-                    sku=sku,
-                    confidence=conf,
-                    bbox=bbox,
-                    last_seen=frame_time,
-                    detection_count=1,
-                )
-                current_detections[item_key] = item
-
-        # Update detection history and confirm items
-        for key, item in current_detections.items():
-            self.detection_history[key].append(frame_time)
-
-            # Confirm item if we've seen it enough times
-            if (
-                not item.confirmed
-                and len(self.detection_history[key]) >= self.config.STABILIZATION_FRAMES
-            ):
-                item.confirmed = True
-                self.cart_inventory[key] = item
-                self.add_item_to_cart(item)
-
-        # Handle removals
-        to_remove = []
-        for key, item in list(self.cart_inventory.items()):
-            if key not in current_detections:
-                if frame_time - item.last_seen > self.config.REMOVAL_TIMEOUT:
-                    to_remove.append(key)
-            else:
-                # Update existing item
-                self.cart_inventory[key] = current_detections[key]
-
-        for key in to_remove:
-            item = self.cart_inventory[key]
-            if self.remove_item_from_cart(item):
-                del self.cart_inventory[key]
-                if key in self.detection_history:
-                    del self.detection_history[key]
-
-    def draw_annotations(self, frame: np.ndarray, results) -> np.ndarray:
-        """Draw bounding boxes and labels on frame"""
-        annotated_frame = frame.copy()
-
-        # Draw all detections
-        for box in results.boxes:
-            conf = float(box.conf[0])
-            if conf < self.config.CONFIDENCE_THRESHOLD:
-                continue
+                item.detection_count = track.hits
 
-            cls = int(box.cls[0])
-            label = self.model.names[cls]
-
-            if label not in self.label_to_sku:
+        # Confirmed tracks are added to the cart once
+        for track in confirmed:
+            catalog_item = class_table.item(track.cls)
+            if catalog_item is None:
                 continue
-
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            sku = self.label_to_sku[label]["sku"]
-
-            # Color based on confirmation status
-            color = (
-                (0, 255, 0)
-                if any(
-                    item.confirmed and item.label == label
-                    for item in self.cart_inventory.values()
-                )
-                else (0, 165, 255)
+            label = catalog_item.label
+            item = DetectedItem(
+                label=label,
+                sku=catalog_item.sku,
+                confidence=track.confidence,
+                bbox=tuple(track.box.astype(int).tolist()),
+                last_seen=track.last_seen,
+                detection_count=track.hits,
+                confirmed=True,
+                track_id=track.track_id,
             )
-
-            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, 2)
-
-            # Label with confidence and SKU
-            label_text = f"{label} ({sku}) {conf:.2f}"
-            cv2.putText(
-                annotated_frame,
-                label_text,
-                (x1, y1 - 10),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (255, 255, 255),
-                2,
-            )
-
-        # Draw cart inventory summary
-        y_offset = 30
-        cv2.putText(
-            annotated_frame,
-            f"Cart: {self.config.CART_ID}",
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            (255, 255, 255),
-            2,
-        )
-
-        y_offset += 25
-        cv2.putText(
-            annotated_frame,
-            f"Items: {len(self.cart_inventory)}",
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            (255, 255, 255),
-            2,
+            self.cart_inventory[track.track_id] = item
+            self.cart_labels[label] += 1
+            self.add_item_to_cart(item)
+            self.cart_events["add"] += 1
+
+        # Items whose track expired are removed, failed removals are retried next frame (by the dispatcher once queued)
+        for track_id in [track_id for track_id in self.cart_inventory if track_id not in tracks]:
+            if self.remove_item_from_cart(self.cart_inventory[track_id]):
+                label = self.cart_inventory.pop(track_id).label
+                self.cart_events["remove"] += 1
+                self.cart_labels[label] -= 1
+                if not self.cart_labels[label]:
+                    del self.cart_labels[label]
+
+    def replay(self, log: Optional[DetectionLog] = None) -> int:
+        """Run recorded detections through process_detections at full speed, returns frames replayed"""
+        log = log or self.detection_log
+        roi, self.roi = self.roi, RegionOfInterest()  # recorded boxes are already in frame coordinates
+        try:
+            for frame_time, xyxy, confs, classes in log:
+                self.process_detections(Detections(Boxes(xyxy, confs, classes), log.names, (0, 0)), frame_time)
+        finally:
+            self.roi = roi
+        self.api_client.flush(timeout=self.config.API_TIMEOUT)
+        return len(log)
+
+    def stop_recording(self):
+        if self.detection_recorder is not None:
+            self.detection_recorder.close()
+            self.detection_recorder = None
+
+    def should_display(self) -> bool:
+        """Whether to show a preview frame now, capped at DISPLAY_MAX_FPS independently of inference"""
+        return self.config.DISPLAY_WINDOW and self.annotator.due()
+
+    def draw_annotations(self, frame: np.ndarray, in_place: bool = False) -> np.ndarray:
+        """Draw the last processed detections and the cart summary on frame"""
+        return self.annotator.render(
+            frame, *self.frame_detections, self.update_class_table(), self.cart_labels, in_place=in_place
         )
 
-        return annotated_frame
-
     def run(self, video_source: Optional[int] = None):
         print("Started tracker")
         """Main inference loop"""
         if video_source is None:
             video_source = self.config.VIDEO_SOURCE
 
+        if self.detection_log is not None:
+            frames = self.replay()
+            self.logger.info(f"Replayed {frames} recorded frames, {len(self.cart_inventory)} items in cart")
+            return
+
+        if self.config.PIPELINE_MODE:
+            TrackerPipeline(self).run(video_source)
+            return
+
         cap = cv2.VideoCapture(video_source)
 
         if not cap.isOpened():
             self.logger.error("Failed to open video source")
             return
+        self.roi.prepare(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
 
         self.logger.info(f"Starting inference for cart {self.config.CART_ID}")
 
@@ -316,21 +338,18 @@ class GroceryCartTracker:
                 self.frame_count += 1
 
                 # Skip frames for performance
-                if self.frame_count % self.config.FRAME_SKIP != 0:
-                    continue
-
-                frame_time = time.time()
+                if self.should_infer(frame):
+                    frame_time = time.time()
 
-                # Run inference
-                results = self.model(frame)[0]
+                    # Run inference
+                    results = self.infer(frame)
 
-                # Process detections
-                self.process_detections(results, frame_time)
+                    # Process detections
+                    self.process_detections(results, frame_time)
 
-                # Draw annotations and display
-                if self.config.DISPLAY_WINDOW:
-                    annotated_frame = self.draw_annotations(frame, results)
-                    cv2.imshow(f"EcoCart - {self.config.CART_ID}", annotated_frame)
+                # Draw the latest detections and display, the frame is not needed afterwards
+                if self.should_display():
+                    cv2.imshow(f"EcoCart - {self.config.CART_ID}", self.draw_annotations(frame, in_place=True))
 
                     if cv2.waitKey(1) == ord("q"):
                         break
@@ -340,6 +359,9 @@ class GroceryCartTracker:
         finally:
             cap.release()
             cv2.destroyAllWindows()
+            self.api_client.flush(timeout=self.config.API_TIMEOUT)
+            self.stop_recording()
+            self.logger.info(f"Frame scheduler stats: {self.frame_scheduler.get_stats()}")
 
     def get_cart_summary(self) -> dict:
         return {
@@ -0,0 +1,91 @@
+"""
+EcoCart Detection Matching
+Vectorized IoU and assignment between detections and tracked items
+"""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional, only the hungarian method needs it
+    linear_sum_assignment = None
+
+
+def to_numpy(values) -> np.ndarray:
+    """Convert a tensor or array-like to a NumPy array"""
+    if hasattr(values, "cpu"):
+        values = values.cpu().numpy()
+    return np.asarray(values)
+
+
+def extract_detections(results) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pull boxes (N, 4), confidences (N,) and class ids (N,) out of a result once"""
+    boxes = results.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    xyxy = to_numpy(boxes.xyxy).reshape(-1, 4)
+    conf = to_numpy(boxes.conf).reshape(-1)
+    cls = to_numpy(boxes.cls).reshape(-1).astype(np.int64)
+    return xyxy, conf, cls
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU between every box in boxes_a (N, 4) and boxes_b (M, 4) as an (N, M) matrix"""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+
+    xi1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yi1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xi2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yi2 = np.minimum(a[:, None, 3], b[None, :, 3])
+
+    intersection = np.clip(xi2 - xi1, 0, None) * np.clip(yi2 - yi1, 0, None)
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+
+    iou = np.zeros_like(intersection)
+    np.divide(intersection, union, out=iou, where=(union > 0) & (intersection > 0))
+    return iou
+
+
+def greedy_assign(iou: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """One-to-one assignment taking the highest IoU pairs above threshold first"""
+    rows, cols = np.nonzero(iou > threshold)
+    if rows.size == 0:
+        return rows, cols
+
+    order = np.argsort(-iou[rows, cols], kind="stable")
+    used_rows = np.zeros(iou.shape[0], dtype=bool)
+    used_cols = np.zeros(iou.shape[1], dtype=bool)
+    keep = []
+    for idx in order:
+        r, c = rows[idx], cols[idx]
+        if used_rows[r] or used_cols[c]:
+            continue
+        used_rows[r] = used_cols[c] = True
+        keep.append(idx)
+
+    keep = np.asarray(keep, dtype=np.int64)
+    return rows[keep], cols[keep]
+
+
+def hungarian_assign(iou: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Optimal assignment maximizing total IoU, requires scipy"""
+    if linear_sum_assignment is None:
+        raise ImportError("scipy is required for hungarian matching, install it or use MATCHING_METHOD greedy")
+    if iou.size == 0:
+        return greedy_assign(iou, threshold)
+
+    rows, cols = linear_sum_assignment(iou, maximize=True)
+    valid = iou[rows, cols] > threshold
+    return rows[valid], cols[valid]
+
+
+ASSIGNERS = {
+    "greedy": greedy_assign,
+    "hungarian": hungarian_assign,
+}
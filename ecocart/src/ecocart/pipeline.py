@@ -0,0 +1,290 @@
+"""
+EcoCart Tracker Pipeline
+Staged capture / inference / dispatch execution for GroceryCartTracker
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import cv2
+
+from src.ecocart.utils.api_client import APIClient
+from src.ecocart.utils.stats import StageStats
+
+if TYPE_CHECKING:
+    from src.ecocart.main import DetectedItem, GroceryCartTracker
+
+
+class FrameQueue:
+    """Bounded, thread-safe queue that drops the oldest entry when full"""
+
+    def __init__(self, maxsize: int):
+        self._items = deque(maxlen=max(1, maxsize))
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> bool:
+        """Enqueue item, returns False if an older item had to be dropped"""
+        with self._cond:
+            dropped = len(self._items) == self._items.maxlen
+            if dropped:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+            return not dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Dequeue the oldest item, None on timeout or once closed and drained"""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed and not self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class EventDispatcher:
+    """Background worker delivering cart add/remove events to the backend
+
+    The tracker drops an item from its inventory once the remove is queued,
+    so failed removes are retried here every retry_delay seconds until they
+    are delivered or the dispatcher stops.
+    """
+
+    def __init__(self, api_client: APIClient, cart_id: str, maxsize: int = 256, retry_delay: float = 1.0):
+        self.api_client = api_client
+        self.cart_id = cart_id
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(__name__)
+        self.events: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.retries: deque = deque()  # (due, event) for removes to deliver again, in due order
+        self.latency = StageStats()
+        self.failed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._worker, name=f"dispatch-{self.cart_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Deliver queued events and stop the worker"""
+        if self._thread is None:
+            return
+        self.events.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        if self.retries:
+            self.logger.error(f"Stopped with {len(self.retries)} undelivered removes")
+
+    def submit(self, action: str, item: "DetectedItem") -> bool:
+        """Queue an event without blocking the caller"""
+        event = (action, item.sku, item.label, item.confidence, time.perf_counter())
+        try:
+            self.events.put_nowait(event)
+            return True
+        except queue.Full:
+            self.logger.error(f"Event queue full, dropping {action} for {item.label}")
+            return False
+
+    def _next_event(self):
+        """Next event to deliver, a due retry first, None once stopped"""
+        while True:
+            now = time.monotonic()
+            if self.retries and self.retries[0][0] <= now:
+                return self.retries.popleft()[1]
+            try:
+                return self.events.get(timeout=self.retries[0][0] - now if self.retries else None)
+            except queue.Empty:
+                continue
+
+    def _worker(self):
+        while True:
+            event = self._next_event()
+            if event is None:
+                break
+            action, sku, label, confidence, submitted_at = event
+
+            if action == "add":
+                success = self.api_client.add_item(self.cart_id, sku, label, confidence)
+            else:
+                success = self.api_client.remove_item(self.cart_id, sku, label)
+            self.latency.record(time.perf_counter() - submitted_at)
+
+            if success:
+                sign = "+" if action == "add" else "-"
+                self.logger.info(f"[{sign}] Delivered {action}: {label} ({sku})")
+            else:
+                self.failed += 1
+                self.logger.error(f"Failed to deliver {action} for item: {label}")
+                if action == "remove":
+                    self.retries.append((time.monotonic() + self.retry_delay, event))
+
+
+class TrackerPipeline:
+    """Runs capture, inference and event dispatch as decoupled stages"""
+
+    def __init__(self, tracker: "GroceryCartTracker"):
+        self.tracker = tracker
+        self.config = tracker.config
+        self.logger = logging.getLogger(__name__)
+
+        self.frames = FrameQueue(self.config.FRAME_QUEUE_SIZE)
+        self.dispatcher = EventDispatcher(
+            tracker.api_client, self.config.CART_ID, self.config.EVENT_QUEUE_SIZE, self.config.RETRY_DELAY
+        )
+        self.stages = {
+            "capture": StageStats(),
+            "queue_wait": StageStats(),
+            "inference": StageStats(),
+            "processing": StageStats(),
+        }
+        self._stop = threading.Event()
+        self.preview: Optional[Any] = None  # latest frame due for display, handed to the main thread
+        self._preview_ready = threading.Event()
+
+    def _capture_loop(self, cap):
+        """Read frames and feed the frame queue, dropping stale frames
+
+        Frames due for the preview are handed to the main thread, so the
+        display rate follows the camera and DISPLAY_MAX_FPS rather than
+        inference, while all HighGUI calls stay on the main thread.
+        """
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    self.logger.error("Frame capture failed")
+                    break
+                self.stages["capture"].record(time.perf_counter() - start)
+
+                self.tracker.frame_count += 1
+                if self.tracker.should_infer(frame):
+                    self.frames.put((frame, time.time(), time.perf_counter()))
+
+                if self.tracker.should_display():
+                    self.preview = frame
+                    self._preview_ready.set()
+        finally:
+            self.frames.close()
+
+    def _inference_loop(self):
+        """Run the model on queued frames until capture stops"""
+        last_report = time.perf_counter()
+        try:
+            while not self.frames.closed and not self._stop.is_set():
+                entry = self.frames.get(timeout=0.5)
+                if entry is None:
+                    continue
+                frame, frame_time, enqueued_at = entry
+
+                start = time.perf_counter()
+                self.stages["queue_wait"].record(start - enqueued_at)
+
+                results = self.tracker.infer(frame)
+                inferred = time.perf_counter()
+                self.stages["inference"].record(inferred - start)
+
+                self.tracker.process_detections(results, frame_time)
+                self.stages["processing"].record(time.perf_counter() - inferred)
+
+                if inferred - last_report >= self.config.STATS_LOG_INTERVAL:
+                    self.logger.info(f"Pipeline stats: {self.get_stats()}")
+                    last_report = inferred
+        except Exception:
+            self.logger.exception("Inference stage failed")
+        finally:
+            self._stop.set()
+
+    def _display_loop(self, inference_thread: threading.Thread):
+        """Show handed-over frames with the latest detections until inference ends or 'q' is pressed"""
+        while inference_thread.is_alive():
+            if not self._preview_ready.wait(timeout=0.5):
+                continue
+            self._preview_ready.clear()
+            # The frame may also be queued for inference, so draw into the renderer's buffer
+            cv2.imshow(f"EcoCart - {self.config.CART_ID}", self.tracker.draw_annotations(self.preview))
+            if cv2.waitKey(1) == ord("q"):
+                self._stop.set()
+                break
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage queue depths and latencies"""
+        stages = {name: stats.snapshot() for name, stats in self.stages.items()}
+        stages["dispatch"] = self.dispatcher.latency.snapshot()
+        return {
+            "frame_queue": {"depth": len(self.frames), "dropped": self.frames.dropped},
+            "event_queue": {
+                "depth": self.dispatcher.events.qsize(),
+                "failed": self.dispatcher.failed,
+            },
+            "stages": stages,
+            "scheduler": self.tracker.frame_scheduler.get_stats(),
+        }
+
+    def run(self, video_source=None):
+        """Staged inference loop, the calling thread shows the preview"""
+        if video_source is None:
+            video_source = self.config.VIDEO_SOURCE
+
+        cap = cv2.VideoCapture(video_source)
+
+        if not cap.isOpened():
+            self.logger.error("Failed to open video source")
+            return
+        self.tracker.roi.prepare(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+        self.logger.info(f"Starting pipelined inference for cart {self.config.CART_ID}")
+
+        capture_thread = threading.Thread(
+            target=self._capture_loop,
+            args=(cap,),
+            name=f"capture-{self.config.CART_ID}",
+            daemon=True,
+        )
+        inference_thread = threading.Thread(
+            target=self._inference_loop,
+            name=f"inference-{self.config.CART_ID}",
+            daemon=True,
+        )
+        self.dispatcher.start()
+        self.tracker.event_dispatcher = self.dispatcher
+        capture_thread.start()
+        inference_thread.start()
+
+        try:
+            if self.config.DISPLAY_WINDOW:
+                self._display_loop(inference_thread)
+            while inference_thread.is_alive():
+                inference_thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.logger.info("Stopping inference...")
+        finally:
+            self._stop.set()
+            capture_thread.join(timeout=2)
+            inference_thread.join()
+            self.tracker.event_dispatcher = None
+            self.dispatcher.stop(timeout=self.config.API_TIMEOUT)
+            self.tracker.api_client.flush(timeout=self.config.API_TIMEOUT)
+            self.tracker.stop_recording()
+            cap.release()
+            cv2.destroyAllWindows()
+            self.logger.info(f"Pipeline stats: {self.get_stats()}")
@@ -0,0 +1,108 @@
+"""
+EcoCart Region of Interest
+Static per-cart crop and mask applied to frames before inference
+"""
+import logging
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.ecocart.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedRegion(NamedTuple):
+    """ROI geometry for one frame size"""
+    frame_size: Tuple[int, int]  # (width, height)
+    clipped: Tuple[int, int, int, int]  # box clipped to the frame
+    offset: np.ndarray  # (x1, y1, x1, y1) added to boxes found in the crop
+    mask: Optional[np.ndarray]  # polygon mask over the crop
+
+
+class RegionOfInterest:
+    """Crops frames to the cart basket and maps detections back to frame coordinates
+
+    box is (x1, y1, x2, y2) in frame pixels. polygon optionally masks the
+    crop further, pixels outside it are blacked out; without a box the
+    crop is the polygon's bounding rectangle. With neither, frames pass
+    through untouched.
+    """
+
+    def __init__(self, box: Optional[Sequence[int]] = None, polygon: Optional[Sequence[Sequence[int]]] = None):
+        self.polygon = np.asarray(polygon, dtype=np.int32).reshape(-1, 2) if polygon else None
+        if box is None and self.polygon is not None:
+            x, y, w, h = cv2.boundingRect(self.polygon)
+            box = (x, y, x + w, y + h)
+        self.box = tuple(int(v) for v in box) if box is not None else None
+        # Built by prepare() and swapped in with a single assignment, so the inference thread
+        # always reads one consistent geometry while the capture thread crops
+        self.prepared: Optional[PreparedRegion] = None
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RegionOfInterest":
+        return cls(config.ROI, config.ROI_MASK)
+
+    @property
+    def enabled(self) -> bool:
+        return self.box is not None
+
+    @property
+    def offset(self) -> np.ndarray:
+        prepared = self.prepared
+        return prepared.offset if prepared is not None else np.zeros(4, dtype=np.float32)
+
+    def _region(self, frame: np.ndarray) -> PreparedRegion:
+        height, width = frame.shape[:2]
+        prepared = self.prepared
+        if prepared is None or prepared.frame_size != (width, height):
+            self.prepare(width, height)
+            prepared = self.prepared
+        return prepared
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """View of the ROI clipped to the frame, no pixels are copied"""
+        if self.box is None:
+            return frame
+        x1, y1, x2, y2 = self._region(frame).clipped
+        return frame[y1:y2, x1:x2]
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """Model input for frame: the cropped ROI with the polygon mask applied"""
+        if self.box is None:
+            return frame
+        prepared = self._region(frame)
+        x1, y1, x2, y2 = prepared.clipped
+        cropped = frame[y1:y2, x1:x2]
+        if prepared.mask is None:
+            return cropped
+        return cv2.bitwise_and(cropped, cropped, mask=prepared.mask)
+
+    def prepare(self, width: int, height: int):
+        """Clip the box and build the polygon mask for frames of this size, before the first frame
+
+        A box that misses the frame entirely, e.g. set for another camera
+        resolution, falls back to the full frame with a warning.
+        """
+        if self.box is None or width <= 0 or height <= 0:
+            return
+        x1, y1, x2, y2 = self.box
+        x1, x2 = max(0, min(x1, width)), max(0, min(x2, width))
+        y1, y2 = max(0, min(y1, height)), max(0, min(y2, height))
+        if x2 <= x1 or y2 <= y1:
+            logger.warning(f"ROI {self.box} is empty in a {width}x{height} frame, using the full frame")
+            x1, y1, x2, y2 = 0, 0, width, height
+        mask = None
+        if self.polygon is not None:
+            mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(mask, [self.polygon - np.int32((x1, y1))], 255)
+        offset = np.array((x1, y1, x1, y1), dtype=np.float32)
+        self.prepared = PreparedRegion((width, height), (x1, y1, x2, y2), offset, mask)
+
+    def to_frame(self, xyxy: np.ndarray) -> np.ndarray:
+        """Boxes detected in the ROI, shifted back to frame coordinates"""
+        if self.box is None or len(xyxy) == 0:
+            return xyxy
+        return xyxy + self.offset
+
@@ -0,0 +1,344 @@
+"""
+EcoCart Supervisor
+Runs a store's carts as worker processes on one host, restarting crashed workers
+"""
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+from src.ecocart.config import Config
+from src.ecocart.fleet import MultiCartRunner, VideoSource
+
+CartOverrides = Dict[str, Dict[str, Any]]
+
+
+@dataclass
+class WorkerSpec:
+    """Carts handled by one worker process and the CPU cores it is pinned to"""
+
+    name: str
+    carts: List[Tuple[str, VideoSource]]
+    cores: List[int] = field(default_factory=list)
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_workers(
+    carts: Sequence[Dict[str, Any]], cores: Sequence[int], cores_per_worker: int = 1
+) -> List[WorkerSpec]:
+    """One worker per cart group (carts without a group run alone), cores handed out round-robin"""
+    groups: Dict[str, List[Tuple[str, VideoSource]]] = {}
+    for cart in carts:
+        groups.setdefault(str(cart.get("group") or cart["cart_id"]), []).append((cart["cart_id"], cart["source"]))
+
+    cores_per_worker = max(1, min(cores_per_worker, len(cores)))
+    workers = []
+    for idx, (name, group) in enumerate(groups.items()):
+        first = idx * cores_per_worker
+        workers.append(WorkerSpec(name, group, [cores[(first + k) % len(cores)] for k in range(cores_per_worker)]))
+    return workers
+
+
+def load_fleet(path: str, cores: Optional[Sequence[int]] = None) -> List[WorkerSpec]:
+    """Worker plan for the carts listed in a fleet file"""
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+
+    carts = data.get("carts") or []
+    seen = set()
+    for cart in carts:
+        if "cart_id" not in cart or "source" not in cart:
+            raise ValueError(f"Fleet cart entries need cart_id and source, got {cart}")
+        if cart["cart_id"] in seen:
+            raise ValueError(f"Cart {cart['cart_id']} is listed twice in {path}")
+        seen.add(cart["cart_id"])
+    return plan_workers(carts, list(cores) if cores else available_cores(), int(data.get("cores_per_worker", 1)))
+
+
+class MetricsReporter:
+    """Worker-side thread sending per-cart frame and event rates to the supervisor"""
+
+    def __init__(self, worker: str, runner, reports, interval: float):
+        self.worker = worker
+        self.runner = runner
+        self.reports = reports
+        self.interval = interval
+        self._previous: Dict[str, Tuple[float, int, int, int]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"metrics-{worker}", daemon=True)
+
+    def sample(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Counters per cart and their rates since the previous sample"""
+        now = time.monotonic() if now is None else now
+        carts = {}
+        for stream in self.runner.streams:
+            tracker = stream.tracker
+            events = tracker.cart_events["add"] + tracker.cart_events["remove"]
+            since, frames, inferred, previous_events = self._previous.get(stream.cart_id, (now, 0, 0, 0))
+            elapsed = now - since
+            carts[stream.cart_id] = {
+                "alive": stream.alive,
+                "frames": tracker.frame_count,
+                "inferred_frames": stream.processed,
+                "dropped_frames": stream.dropped,
+                "fps": round((tracker.frame_count - frames) / elapsed, 2) if elapsed > 0 else 0.0,
+                "inference_fps": round((stream.processed - inferred) / elapsed, 2) if elapsed > 0 else 0.0,
+                "events_per_min": round((events - previous_events) * 60 / elapsed, 2) if elapsed > 0 else 0.0,
+                "adds": tracker.cart_events["add"],
+                "removes": tracker.cart_events["remove"],
+                "items": len(tracker.cart_inventory),
+            }
+            self._previous[stream.cart_id] = (now, tracker.frame_count, stream.processed, events)
+        return {"worker": self.worker, "pid": os.getpid(), "time": time.time(), "carts": carts}
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.reports.put(self.sample())
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_worker(spec: WorkerSpec, config: Config, cart_overrides: CartOverrides, reports):
+    """Worker process entry point: pin to cores, run the carts' batched loop, report metrics"""
+    signal.signal(signal.SIGTERM, _interrupt)
+    if spec.cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, spec.cores)
+    threads = len(spec.cores) or 1
+    if config.INFERENCE_BACKEND == "onnx" and not config.INFERENCE_THREADS:
+        config = replace(config, INFERENCE_THREADS=threads)
+    elif config.INFERENCE_BACKEND == "ultralytics":
+        import torch
+
+        torch.set_num_threads(threads)
+
+    try:
+        runner = MultiCartRunner(spec.carts, config, cart_overrides=cart_overrides)
+    except KeyboardInterrupt:
+        return  # stopped while still loading
+    reporter = MetricsReporter(spec.name, runner, reports, config.STATUS_REPORT_INTERVAL)
+    reporter.start()
+    try:
+        runner.run()
+    finally:
+        reporter.stop()
+        reports.put(reporter.sample())
+
+
+class WorkerHandle:
+    """Supervisor-side state of one worker: process, restarts and crash backoff"""
+
+    def __init__(self, spec: WorkerSpec):
+        self.spec = spec
+        self.process = None
+        self.state = "starting"  # running, restarting or stopped
+        self.started = 0.0
+        self.restarts = 0
+        self.failures = 0  # consecutive crashes, sets the backoff
+        self.next_start = 0.0
+        self.exitcode: Optional[int] = None
+
+
+class FleetSupervisor:
+    """Starts one process per worker spec, restarts crashed ones and serves aggregated metrics
+
+    A worker that exits with code 0 (all of its video sources ended) stays
+    stopped. Any other exit is a crash and the worker is started again after
+    a delay that doubles with each consecutive crash, up to
+    WORKER_RESTART_MAX_DELAY. The supervisor returns once every worker has
+    stopped.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[WorkerSpec],
+        config: Config,
+        cart_overrides: Optional[CartOverrides] = None,
+        target: Callable = run_worker,
+        start_method: str = "spawn",
+    ):
+        self.config = config
+        self.cart_overrides = cart_overrides or {}
+        self.target = target
+        self.logger = logging.getLogger(__name__)
+        self.context = multiprocessing.get_context(start_method)
+        self.reports = self.context.Queue()
+        self.workers = [WorkerHandle(spec) for spec in workers]
+        self.cart_metrics: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stopping = False
+
+    def start_worker(self, handle: WorkerHandle):
+        overrides = {cart_id: self.cart_overrides.get(cart_id, {}) for cart_id, _ in handle.spec.carts}
+        handle.process = self.context.Process(
+            target=self.target,
+            args=(handle.spec, self.config, overrides, self.reports),
+            name=f"worker-{handle.spec.name}",
+            daemon=True,
+        )
+        handle.process.start()
+        handle.state = "running"
+        handle.started = time.monotonic()
+        self.logger.info(
+            f"Started worker {handle.spec.name} (pid {handle.process.pid}) on cores {handle.spec.cores} "
+            f"for carts {[cart_id for cart_id, _ in handle.spec.carts]}"
+        )
+
+    def poll(self, now: Optional[float] = None):
+        """Collect worker reports, notice exits and restart workers whose backoff has passed"""
+        now = time.monotonic() if now is None else now
+        self.drain_reports()
+
+        for handle in self.workers:
+            if handle.state == "running" and not handle.process.is_alive():
+                handle.process.join()
+                handle.exitcode = handle.process.exitcode
+                if handle.exitcode == 0 or self._stopping:
+                    handle.state = "stopped"
+                    self.logger.info(f"Worker {handle.spec.name} stopped")
+                    continue
+
+                healthy = now - handle.started >= self.config.WORKER_RESTART_MAX_DELAY
+                handle.failures = 1 if healthy else handle.failures + 1
+                delay = min(
+                    self.config.WORKER_RESTART_MAX_DELAY,
+                    self.config.WORKER_RESTART_DELAY * 2 ** (handle.failures - 1),
+                )
+                handle.state = "restarting"
+                handle.next_start = now + delay
+                self.logger.error(
+                    f"Worker {handle.spec.name} exited with code {handle.exitcode}, restarting in {delay:.1f} s"
+                )
+
+            if handle.state == "restarting" and now >= handle.next_start and not self._stopping:
+                handle.restarts += 1
+                self.start_worker(handle)
+
+    def drain_reports(self):
+        while True:
+            try:
+                report = self.reports.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                for cart_id, metrics in report["carts"].items():
+                    self.cart_metrics[cart_id] = {**metrics, "worker": report["worker"], "updated": report["time"]}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            carts = {cart_id: dict(metrics) for cart_id, metrics in self.cart_metrics.items()}
+        workers = {
+            handle.spec.name: {
+                "state": handle.state,
+                "pid": handle.process.pid if handle.process is not None else None,
+                "cores": handle.spec.cores,
+                "carts": [cart_id for cart_id, _ in handle.spec.carts],
+                "restarts": handle.restarts,
+                "exitcode": handle.exitcode,
+            }
+            for handle in self.workers
+        }
+        return {
+            "time": time.time(),
+            "workers": workers,
+            "carts": carts,
+            "totals": {
+                "workers_running": sum(1 for handle in self.workers if handle.state == "running"),
+                "fps": round(sum(metrics["fps"] for metrics in carts.values()), 2),
+                "inference_fps": round(sum(metrics["inference_fps"] for metrics in carts.values()), 2),
+                "events_per_min": round(sum(metrics["events_per_min"] for metrics in carts.values()), 2),
+            },
+        }
+
+    def serve_status(self, port: int) -> int:
+        """Serve GET /status (JSON) and /health on localhost from a background thread, returns the port"""
+        supervisor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status = supervisor.status()
+                if self.path == "/status":
+                    self._reply(200, status)
+                elif self.path == "/health":
+                    healthy = all(worker["state"] == "running" for worker in status["workers"].values())
+                    self._reply(200 if healthy else 503, {"healthy": healthy})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def _reply(self, code, body):
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="status-server", daemon=True).start()
+        return self._server.server_address[1]
+
+    def shutdown(self, timeout: float = 10.0):
+        """Ask workers to stop, killing any that do not exit within timeout"""
+        self._stopping = True
+        running = [handle for handle in self.workers if handle.process is not None and handle.process.is_alive()]
+        for handle in running:
+            handle.process.terminate()
+        deadline = time.monotonic() + timeout
+        for handle in running:
+            handle.process.join(max(0.0, deadline - time.monotonic()))
+            if handle.process.is_alive():
+                self.logger.error(f"Worker {handle.spec.name} did not stop, killing it")
+                handle.process.kill()
+                handle.process.join()
+        self.poll()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def run(self):
+        """Start all workers and supervise them until they stop or the supervisor is interrupted"""
+        port = self.serve_status(self.config.STATUS_PORT)
+        self.logger.info(f"Status endpoint on http://127.0.0.1:{port}/status")
+        for handle in self.workers:
+            self.start_worker(handle)
+
+        signal.signal(signal.SIGTERM, _interrupt)
+        last_report = time.monotonic()
+        try:
+            while any(handle.state != "stopped" for handle in self.workers):
+                time.sleep(0.5)
+                self.poll()
+                if time.monotonic() - last_report >= self.config.STATS_LOG_INTERVAL:
+                    self.logger.info(f"Supervisor status: {self.status()['totals']}")
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            self.logger.info("Stopping workers...")
+        finally:
+            self.shutdown()
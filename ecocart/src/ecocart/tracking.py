@@ -0,0 +1,154 @@
+"""
+EcoCart Object Tracking
+SORT/ByteTrack-style multi-object tracker with a constant-velocity motion model
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.ecocart.matching import ASSIGNERS, iou_matrix
+
+
+@dataclass(slots=True)
+class Track:
+    track_id: int
+    cls: int
+    box: np.ndarray  # (4,) xyxy as of last_seen, owned by the track and updated in place
+    confidence: float
+    last_seen: float
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(4))  # xyxy pixels per second
+    hits: int = 1
+    misses: int = 0  # consecutive updates without a matching detection
+    confirmed: bool = False
+
+    def predict(self, frame_time: float) -> np.ndarray:
+        """Box extrapolated to frame_time at constant velocity"""
+        return self.box + self.velocity * (frame_time - self.last_seen)
+
+
+class MultiObjectTracker:
+    """Assigns persistent track IDs to detections across frames
+
+    Association runs in two stages as in ByteTrack: confident detections
+    are matched to predicted track boxes first, then the remaining tracks
+    get a second chance with low-confidence detections, which keeps an item
+    tracked through blur or partial occlusion. Only confident detections
+    start new tracks, and boxes are only matched within the same class.
+    Tentative tracks that miss more than tentative_misses updates in a row
+    are dropped straight away, so one-off false positives neither pile up
+    until max_age nor chain into spurious confirmations.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.5,
+        high_confidence: float = 0.4,
+        low_confidence: float = 0.1,
+        confirm_hits: int = 5,
+        max_age: float = 3.0,
+        method: str = "greedy",
+        velocity_smoothing: float = 0.5,
+        tentative_misses: int = 1,
+        class_confidence: Optional[np.ndarray] = None,
+    ):
+        self.iou_threshold = iou_threshold
+        self.high_confidence = high_confidence
+        self.low_confidence = low_confidence
+        self.confirm_hits = confirm_hits
+        self.max_age = max_age
+        self.assign = ASSIGNERS[method]
+        self.velocity_smoothing = velocity_smoothing
+        self.tentative_misses = tentative_misses
+        self.class_confidence = class_confidence  # high_confidence per class id, overrides the scalar
+
+        self.tracks: Dict[int, Track] = {}
+        self.next_track_id = 1
+
+    def _associate(self, track_ids: List[int], predicted: np.ndarray, track_cls: np.ndarray,
+                   boxes: np.ndarray, classes: np.ndarray) -> List[Tuple[int, int]]:
+        """(detection index, track position) pairs, IoU-matched within each class"""
+        if not track_ids or len(boxes) == 0:
+            return []
+        iou = iou_matrix(boxes, predicted)
+        iou[classes[:, None] != track_cls[None, :]] = 0.0
+        rows, cols = self.assign(iou, self.iou_threshold)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def _update_track(self, track: Track, box: np.ndarray, confidence: float, frame_time: float):
+        dt = frame_time - track.last_seen
+        if dt > 0:
+            alpha = self.velocity_smoothing
+            track.velocity *= 1 - alpha
+            track.velocity += (box - track.box) * (alpha / dt)
+        track.box[:] = box
+        track.confidence = max(track.confidence, confidence)
+        track.last_seen = frame_time
+        track.hits += 1
+        track.misses = 0
+
+    def update(self, boxes: np.ndarray, confidences: np.ndarray, classes: np.ndarray,
+               frame_time: float) -> Tuple[List[Track], List[Track]]:
+        """Advance one frame, returns (newly confirmed tracks, expired tracks)"""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        confidences = np.asarray(confidences, dtype=np.float64).reshape(-1)
+        classes = np.asarray(classes, dtype=np.int64).reshape(-1)
+
+        track_ids = list(self.tracks)
+        if track_ids:
+            predicted = np.stack([self.tracks[tid].predict(frame_time) for tid in track_ids])
+            track_cls = np.fromiter((self.tracks[tid].cls for tid in track_ids), dtype=np.int64,
+                                    count=len(track_ids))
+        else:
+            predicted = np.empty((0, 4))
+            track_cls = np.empty(0, dtype=np.int64)
+
+        high_confidence = self.high_confidence if self.class_confidence is None else self.class_confidence[classes]
+        high = np.flatnonzero(confidences >= high_confidence)
+        low = np.flatnonzero((confidences >= self.low_confidence) & (confidences < high_confidence))
+
+        # Stage 1: confident detections against every track
+        matched_tracks = np.zeros(len(track_ids), dtype=bool)
+        matched_high = np.zeros(len(high), dtype=bool)
+        for row, col in self._associate(track_ids, predicted, track_cls, boxes[high], classes[high]):
+            det = high[row]
+            self._update_track(self.tracks[track_ids[col]], boxes[det], float(confidences[det]), frame_time)
+            matched_tracks[col] = True
+            matched_high[row] = True
+
+        # Stage 2: low-confidence detections keep the leftover tracks alive
+        remaining = np.flatnonzero(~matched_tracks)
+        if len(remaining) and len(low):
+            pairs = self._associate(
+                [track_ids[col] for col in remaining], predicted[remaining], track_cls[remaining],
+                boxes[low], classes[low]
+            )
+            for row, col in pairs:
+                det = low[row]
+                self._update_track(self.tracks[track_ids[remaining[col]]], boxes[det],
+                                   float(confidences[det]), frame_time)
+
+        # Unmatched confident detections start tentative tracks
+        for det in high[~matched_high].tolist():
+            track = Track(self.next_track_id, int(classes[det]), boxes[det].copy(), float(confidences[det]), frame_time)
+            self.tracks[track.track_id] = track
+            self.next_track_id += 1
+
+        confirmed = []
+        expired = []
+        for track_id, track in list(self.tracks.items()):
+            if track.last_seen != frame_time:
+                track.misses += 1
+            if frame_time - track.last_seen > self.max_age:
+                expired.append(self.tracks.pop(track_id))
+            elif not track.confirmed and track.misses > self.tentative_misses:
+                del self.tracks[track_id]  # never confirmed, nothing was added to the cart
+            elif not track.confirmed and track.hits >= self.confirm_hits:
+                track.confirmed = True
+                confirmed.append(track)
+
+        return confirmed, expired
+
+    def reset(self):
+        self.tracks.clear()
+        self.next_track_id = 1
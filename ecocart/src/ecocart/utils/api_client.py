@@ -1,8 +1,13 @@
 import requests
 import time
+import random
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
 from src.ecocart.config import Config
+from src.ecocart.utils.stats import StageStats
 
 class APIClient:
     def __init__(self, config: Config):
@@ -78,6 +83,10 @@ class APIClient:
             self.logger.error(f"Failed to get cart summary: {e}")
         return None
         
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Requests are sent inline, nothing is ever queued"""
+        return True
+
     def ping_backend(self) -> bool:
         """Check if backend is alive"""
         try:
@@ -88,6 +97,228 @@ class APIClient:
             return response.status_code == 200
         except:
             return False
+EVENT_TYPES = {"add_item": "add", "remove_item": "remove"}
+
+
+@dataclass
+class OutboxEvent:
+    endpoint: str
+    data: Dict[str, Any]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class BackgroundAPIClient(APIClient):
+    """APIClient that queues cart events in an outbox and delivers them from a worker thread"""
+
+    def __init__(self, config: Config):
+        super().__init__(config)
+        self._outbox: "OrderedDict[int, OutboxEvent]" = OrderedDict()
+        self._pending_adds: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._cond = threading.Condition()
+        self._next_id = 0
+        self._in_flight = 0
+        self._closing = False
+        self._worker: Optional[threading.Thread] = None
+
+        self.delivery_latency = StageStats()
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self):
+        """Start the delivery worker"""
+        if self._worker is None:
+            self._closing = False
+            self._worker = threading.Thread(target=self._deliver_loop, name="api-outbox", daemon=True)
+            self._worker.start()
+
+    def close(self, timeout: Optional[float] = None):
+        """Deliver what is queued and stop the worker"""
+        if self._worker is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+        self._worker = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the outbox is empty, returns False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._outbox and not self._in_flight, timeout)
+
+    def _enqueue(self, endpoint: str, data: Dict[str, Any]) -> Optional[int]:
+        with self._cond:
+            if len(self._outbox) >= self.config.OUTBOX_MAX_SIZE:
+                # The tracker has already forgotten items whose remove was queued, so only adds are
+                # dropped; with nothing but removes queued the outbox grows past its limit for them
+                oldest_add = next((event_id for event_id, event in self._outbox.items()
+                                   if event.endpoint == "add_item"), None)
+                if oldest_add is not None:
+                    event = self._outbox.pop(oldest_add)
+                    self._forget_add(oldest_add, event)
+                    self.dropped += 1
+                    self.logger.warning(f"Outbox full, dropped {event.endpoint} for {event.data['label']}")
+                elif endpoint == "add_item":
+                    self.dropped += 1
+                    self.logger.warning(f"Outbox full of removes, dropped {endpoint} for {data['label']}")
+                    return None
+
+            event_id = self._next_id
+            self._next_id += 1
+            self._outbox[event_id] = OutboxEvent(endpoint, data)
+            self._cond.notify()
+            return event_id
+
+    def _forget_add(self, event_id: int, event: OutboxEvent):
+        if event.endpoint != "add_item":
+            return
+        key = (event.data["cart_id"], event.data["sku"])
+        pending = self._pending_adds.get(key)
+        if pending and event_id in pending:
+            pending.remove(event_id)
+            if not pending:
+                del self._pending_adds[key]
+
+    def add_item(self, cart_id: str, sku: str, label: str, confidence: float) -> bool:
+        """Queue an add event, returns immediately"""
+        data = {
+            "cart_id": cart_id,
+            "sku": sku,
+            "label": label,
+            "confidence": confidence,
+            "timestamp": time.time()
+        }
+        event_id = self._enqueue("add_item", data)
+        with self._cond:
+            if event_id in self._outbox:
+                self._pending_adds[(cart_id, sku)].append(event_id)
+        return True
+
+    def remove_item(self, cart_id: str, sku: str, label: str) -> bool:
+        """Queue a remove event, cancelling a recent undelivered add for the same SKU"""
+        with self._cond:
+            pending = self._pending_adds.get((cart_id, sku))
+            if pending:
+                event_id = pending[-1]
+                age = time.perf_counter() - self._outbox[event_id].enqueued_at
+                if age <= self.config.COALESCE_WINDOW:
+                    self._forget_add(event_id, self._outbox.pop(event_id))
+                    self.coalesced += 2
+                    return True
+
+        data = {
+            "cart_id": cart_id,
+            "sku": sku,
+            "label": label,
+            "timestamp": time.time()
+        }
+        self._enqueue("remove_item", data)
+        return True
+
+    def _take_events(self) -> List[Tuple[int, OutboxEvent]]:
+        """Pop the next event, or a run of same-cart events when batching"""
+        if not self.config.API_BATCH_EVENTS:
+            return [self._outbox.popitem(last=False)]
+
+        # Give a burst a few milliseconds to accumulate before flushing
+        deadline = self._outbox[next(iter(self._outbox))].enqueued_at + self.config.BATCH_WINDOW_MS / 1000
+        while not self._closing and len(self._outbox) < self.config.MAX_EVENTS_PER_BATCH:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self._outbox:
+                break
+            self._cond.wait(remaining)
+
+        events = []
+        cart_id = None
+        while self._outbox and len(events) < self.config.MAX_EVENTS_PER_BATCH:
+            event_id = next(iter(self._outbox))
+            event = self._outbox[event_id]
+            if cart_id is not None and event.data["cart_id"] != cart_id:
+                break
+            cart_id = event.data["cart_id"]
+            events.append((event_id, self._outbox.pop(event_id)))
+        return events
+
+    def _deliver_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._outbox or self._closing)
+                if not self._outbox:
+                    break
+                taken = self._take_events()
+                for event_id, event in taken:
+                    self._forget_add(event_id, event)
+                self._in_flight += len(taken)
+
+            events = [event for _, event in taken]
+            success = self._deliver(events) if events else True
+
+            with self._cond:
+                self._in_flight -= len(events)
+                retry = []
+                for event_id, event in taken:
+                    if success:
+                        self.delivered += 1
+                        self.delivery_latency.record(time.perf_counter() - event.enqueued_at)
+                        continue
+                    self.failed += 1
+                    if event.endpoint == "remove_item" and not self._closing:
+                        # Removes are kept until delivered, ahead of newer events
+                        retry.append(event_id)
+                        self._outbox[event_id] = event
+                        self.logger.error(f"Failed to deliver {event.endpoint} for {event.data['label']}, will retry")
+                    else:
+                        self.logger.error(f"Giving up on {event.endpoint} for {event.data['label']}")
+                for event_id in reversed(retry):
+                    self._outbox.move_to_end(event_id, last=False)
+                self._cond.notify_all()
+                if retry:
+                    self._cond.wait_for(lambda: self._closing, self.config.RETRY_DELAY)
+
+    def _deliver(self, events: List[OutboxEvent]) -> bool:
+        """Send events with retries and jittered exponential backoff"""
+        if len(events) == 1 and not self.config.API_BATCH_EVENTS:
+            endpoint, data = events[0].endpoint, events[0].data
+        else:
+            endpoint = f"cart/{events[0].data['cart_id']}/events"
+            data = {"events": [
+                {"type": EVENT_TYPES[event.endpoint], **event.data} for event in events
+            ]}
+
+        for attempt in range(self.config.MAX_RETRY_ATTEMPTS):
+            if self._make_request("POST", endpoint, data, max_retries=1):
+                return True
+            if attempt < self.config.MAX_RETRY_ATTEMPTS - 1:
+                delay = self.config.RETRY_DELAY * (2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Outbox depth, delivery latency and drop counts"""
+        with self._cond:
+            depth = len(self._outbox)
+        return {
+            "outbox_depth": depth,
+            "in_flight": self._in_flight,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "delivery_latency": self.delivery_latency.snapshot(),
+        }
+
+
+def create_api_client(config: Config) -> APIClient:
+    """Create the API client selected by config"""
+    if config.API_ASYNC_DELIVERY or config.API_BATCH_EVENTS:
+        client = BackgroundAPIClient(config)
+        client.start()
+        return client
+    return APIClient(config)
+
+
 def send_test_request():
         from src.ecocart.config import Config
         client = APIClient(Config())
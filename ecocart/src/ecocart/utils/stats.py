@@ -0,0 +1,39 @@
+"""
+EcoCart Stats
+Lightweight latency tracking shared by the tracker and API client
+"""
+import threading
+from collections import deque
+from typing import Dict
+
+
+class StageStats:
+    """Rolling latency statistics for a single pipeline stage"""
+
+    def __init__(self, window: int = 500):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "avg_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def percentile(q: float) -> float:
+            return round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 2)
+
+        return {
+            "count": self.count,
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
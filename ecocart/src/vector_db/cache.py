@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from src.ecocart.utils.stats import StageStats
+
+
+class QueryCache:
+    """Two-tier response cache (in-process LRU + SQLite) with request coalescing"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256, ttl: float = 3600.0,
+                 disk_ttl: float = 7 * 24 * 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_ttl = disk_ttl
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        if path:
+            self._disk = sqlite3.connect(path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode = WAL")
+            self._disk.execute("""
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._disk.commit()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.hit_latency = StageStats()
+        self.miss_latency = StageStats()
+
+    @staticmethod
+    def make_key(query: str, version: str) -> str:
+        """Case and whitespace insensitive key scoped to a catalog version"""
+        return f"{version}:{' '.join(query.lower().split())}"
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_put(self, key: str, value: str):
+        self._memory[key] = (value, time.monotonic() + self.ttl)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if self._disk is None:
+            return None
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT value FROM query_cache WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.disk_ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_put(self, key: str, value: str):
+        if self._disk is None:
+            return
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO query_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._disk.commit()
+
+    def get_or_compute(self, query: str, version: str, compute: Callable[[], str]) -> str:
+        """Cached value for query, concurrent misses for the same key share one compute call"""
+        start = time.perf_counter()
+        key = self.make_key(query, version)
+
+        with self._lock:
+            value = self._memory_get(key)
+            if value is not None:
+                self.memory_hits += 1
+                self.hit_latency.record(time.perf_counter() - start)
+                return value
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = self._disk_get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.hit_latency.record(time.perf_counter() - start)
+            else:
+                value = compute()
+                self._disk_put(key, value)
+                self.misses += 1
+                self.miss_latency.record(time.perf_counter() - start)
+
+            with self._lock:
+                self._memory_put(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "hit_latency": self.hit_latency.snapshot(),
+            "miss_latency": self.miss_latency.snapshot(),
+        }
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import zlib
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+
+def build_document(item_name, item_details):
+    return json.dumps({"name": item_name, "details": item_details})
+
+
+def content_hash(document):
+    return hashlib.sha1(document.encode("utf-8")).hexdigest()
+
+
+def plan_sync(existing_hashes, wanted_hashes):
+    """IDs to (re)embed and IDs to delete so the index matches wanted_hashes"""
+    upserts = [item_id for item_id, digest in wanted_hashes.items() if existing_hashes.get(item_id) != digest]
+    deletes = [item_id for item_id in existing_hashes if item_id not in wanted_hashes]
+    return upserts, deletes
+
+
+def read_index_hashes(collection, batch_size=1000):
+    """Content hashes stored in the collection metadata, paged to bound query size"""
+    hashes = {}
+    for offset in range(0, collection.count(), batch_size):
+        page = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+        for item_id, metadata in zip(page["ids"], page["metadatas"]):
+            hashes[item_id] = (metadata or {}).get("content_hash")
+    return hashes
+
+
+def sync_collection(collection, sku_map_data, manifest_path=None, batch_size=1000):
+    """Embed only added or changed catalog items and drop removed ones
+
+    The manifest is a snapshot of the indexed hashes that saves reading them
+    back from the collection. It is removed while the index is being changed,
+    so an interrupted sync falls back to the collection metadata.
+    """
+    documents = {}
+    wanted_hashes = {}
+    for item_name, item_details in (sku_map_data or {}).items():
+        document = build_document(item_name, item_details)
+        documents[item_name] = document
+        wanted_hashes[item_name] = content_hash(document)
+
+    existing_hashes = None
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            existing_hashes = json.load(f)
+    if existing_hashes is None:
+        existing_hashes = read_index_hashes(collection, batch_size)
+
+    upserts, deletes = plan_sync(existing_hashes, wanted_hashes)
+
+    if manifest_path and (upserts or deletes) and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    for start in range(0, len(upserts), batch_size):
+        ids = upserts[start:start + batch_size]
+        collection.upsert(
+            ids=ids,
+            documents=[documents[item_id] for item_id in ids],
+            metadatas=[{"name": item_id, "content_hash": wanted_hashes[item_id]} for item_id in ids],
+        )
+    for start in range(0, len(deletes), batch_size):
+        collection.delete(ids=deletes[start:start + batch_size])
+
+    if manifest_path and (upserts or deletes or not os.path.exists(manifest_path)):
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(wanted_hashes, f)
+        os.replace(tmp_path, manifest_path)
+
+    return {"total": len(wanted_hashes), "embedded": len(upserts), "deleted": len(deletes)}
+
+
+class HashEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Deterministic bag-of-words hashing embedding, a local stand-in for tests and benchmarks"""
+
+    def __init__(self, dimensions=64):
+        self.dimensions = dimensions
+        self.calls = 0
+        self.embedded = 0
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls += 1
+        self.embedded += len(input)
+        embeddings = []
+        for text in input:
+            vector = np.zeros(self.dimensions, dtype=np.float32)
+            for token in text.lower().split():
+                vector[zlib.crc32(token.encode("utf-8")) % self.dimensions] += 1.0
+            norm = np.linalg.norm(vector)
+            embeddings.append(vector / norm if norm else vector)
+        return embeddings
+
+    @staticmethod
+    def name():
+        return "ecocart_hash"
+
+    def get_config(self):
+        return {"dimensions": self.dimensions}
+
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbeddingFunction(config.get("dimensions", 64))
@@ -8,7 +8,7 @@ from unittest.mock import Mock, patch
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from src.ecocart.utils.api_client import APIClient
+from src.ecocart.utils.api_client import APIClient, BackgroundAPIClient
 from src.ecocart.config import Config
 
 class TestAPIClient(unittest.TestCase):
@@ -50,5 +50,108 @@ class TestAPIClient(unittest.TestCase):
         result = self.api_client.ping_backend()
         self.assertTrue(result)
 
+class TestBackgroundAPIClient(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(
+            BACKEND_URL="http://localhost:8000",
+            MAX_RETRY_ATTEMPTS=2,
+            RETRY_DELAY=0.01,
+            OUTBOX_MAX_SIZE=3,
+            COALESCE_WINDOW=5.0
+        )
+        self.api_client = BackgroundAPIClient(self.config)
+
+    def tearDown(self):
+        self.api_client.close(timeout=1)
+
+    @patch('requests.Session.post')
+    def test_add_then_remove_is_coalesced(self, mock_post):
+        self.assertTrue(self.api_client.add_item("cart_001", "SKU00101", "apple", 0.8))
+        self.assertTrue(self.api_client.remove_item("cart_001", "SKU00101", "apple"))
+        self.api_client.start()
+
+        self.assertTrue(self.api_client.flush(timeout=1))
+        mock_post.assert_not_called()
+        self.assertEqual(self.api_client.get_stats()["coalesced"], 2)
+
+    @patch('requests.Session.post')
+    def test_events_delivered_in_order(self, mock_post):
+        mock_post.return_value = Mock(status_code=200)
+        self.api_client.add_item("cart_001", "SKU00101", "apple", 0.8)
+        self.api_client.remove_item("cart_001", "SKU00102", "orange")
+        self.api_client.start()
+
+        self.assertTrue(self.api_client.flush(timeout=1))
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        self.assertEqual(urls, ["http://localhost:8000/add_item", "http://localhost:8000/remove_item"])
+        stats = self.api_client.get_stats()
+        self.assertEqual(stats["delivered"], 2)
+        self.assertEqual(stats["outbox_depth"], 0)
+        self.assertEqual(stats["delivery_latency"]["count"], 2)
+
+    @patch('requests.Session.post')
+    def test_failed_delivery_retries_then_gives_up(self, mock_post):
+        mock_post.return_value = Mock(status_code=500, text="Internal Server Error")
+        self.api_client.add_item("cart_001", "SKU00101", "apple", 0.8)
+        self.api_client.start()
+
+        self.assertTrue(self.api_client.flush(timeout=1))
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(self.api_client.get_stats()["failed"], 1)
+
+    @patch('requests.Session.post')
+    def test_failed_remove_is_kept_until_server_recovers(self, mock_post):
+        failing = Mock(status_code=500, text="Internal Server Error")
+        mock_post.side_effect = [failing, failing, failing, Mock(status_code=200), Mock(status_code=200)]
+        self.api_client.remove_item("cart_001", "SKU00101", "apple")
+        self.api_client.add_item("cart_001", "SKU00102", "orange", 0.8)
+        self.api_client.start()
+
+        self.assertTrue(self.api_client.flush(timeout=2))
+        urls = [call.args[0].rsplit("/", 1)[1] for call in mock_post.call_args_list]
+        self.assertEqual(urls, ["remove_item", "remove_item", "remove_item", "remove_item", "add_item"])
+        stats = self.api_client.get_stats()
+        self.assertEqual((stats["delivered"], stats["failed"]), (2, 1))
+
+    def test_full_outbox_never_drops_removes(self):
+        self.api_client.remove_item("cart_001", "SKU00101", "item")
+        self.api_client.add_item("cart_001", "SKU00102", "item", 0.8)
+        self.api_client.remove_item("cart_001", "SKU00103", "item")
+        self.api_client.remove_item("cart_001", "SKU00104", "item")
+        self.api_client.add_item("cart_001", "SKU00105", "item", 0.8)
+
+        endpoints = [event.endpoint for event in self.api_client._outbox.values()]
+        self.assertEqual(endpoints, ["remove_item", "remove_item", "remove_item"])
+        self.assertEqual(self.api_client.get_stats()["dropped"], 2)
+
+    def test_full_outbox_drops_oldest(self):
+        for sku in ("SKU00101", "SKU00102", "SKU00103", "SKU00104"):
+            self.api_client.add_item("cart_001", sku, "item", 0.8)
+
+        stats = self.api_client.get_stats()
+        self.assertEqual(stats["outbox_depth"], 3)
+        self.assertEqual(stats["dropped"], 1)
+        # The dropped add can no longer be coalesced
+        self.api_client.remove_item("cart_001", "SKU00101", "item")
+        self.assertEqual(self.api_client.get_stats()["coalesced"], 0)
+
+    @patch('requests.Session.post')
+    def test_burst_is_sent_as_one_batch(self, mock_post):
+        mock_post.return_value = Mock(status_code=200)
+        self.config.API_BATCH_EVENTS = True
+        self.config.OUTBOX_MAX_SIZE = 100
+        for sku in ("SKU00101", "SKU00102", "SKU00103"):
+            self.api_client.add_item("cart_001", sku, "item", 0.8)
+        self.api_client.remove_item("cart_001", "SKU00104", "item")
+        self.api_client.start()
+
+        self.assertTrue(self.api_client.flush(timeout=1))
+        mock_post.assert_called_once()
+        self.assertEqual(mock_post.call_args.args[0], "http://localhost:8000/cart/cart_001/events")
+        events = mock_post.call_args.kwargs["json"]["events"]
+        self.assertEqual([event["type"] for event in events], ["add", "add", "add", "remove"])
+        self.assertEqual(self.api_client.get_stats()["delivered"], 4)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
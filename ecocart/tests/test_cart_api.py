@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart import database
+from src.ecocart.api.routers import cart_router
+from src.ecocart.api.state import cart_store
+
+class TestCartEventsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        sku_map_path = os.path.join(self.temp_dir.name, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({
+                "apple": {"sku": "SKU00101", "price": 1.50},
+                "orange": {"sku": "SKU00102", "price": 0.75}
+            }, f)
+
+        self.original_paths = (database.DATABASE_FILE, database.SKU_MAP_PATH)
+        database.DATABASE_FILE = os.path.join(self.temp_dir.name, "billing.db")
+        database.SKU_MAP_PATH = sku_map_path
+        database.initialize_db()
+        cart_store.clear()
+
+        app = FastAPI()
+        app.include_router(cart_router.router)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        database.close_connections()
+        database.DATABASE_FILE, database.SKU_MAP_PATH = self.original_paths
+        cart_store.clear()
+        self.temp_dir.cleanup()
+
+    def test_batch_applied_in_order(self):
+        events = [
+            {"type": "add", "sku": "SKU00101", "label": "apple", "confidence": 0.9, "timestamp": 1.0},
+            {"type": "add", "sku": "SKU00102", "label": "orange", "confidence": 0.8, "timestamp": 2.0},
+            {"type": "remove", "sku": "SKU00101", "label": "apple", "timestamp": 3.0},
+        ]
+        response = self.client.post("/cart/cart_001/events", json={"events": events})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["applied"], 3)
+
+        summary = self.client.get("/cart/cart_001/summary").json()
+        self.assertEqual([item["label"] for item in summary["items"]], ["orange"])
+        self.assertAlmostEqual(database.get_total_bill(), 2.25)
+
+    def test_rejects_unknown_event_type(self):
+        events = [{"type": "update", "sku": "SKU00101", "label": "apple", "timestamp": 1.0}]
+        response = self.client.post("/cart/cart_001/events", json={"events": events})
+        self.assertEqual(response.status_code, 422)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.api.state import CartStore
+
+class TestCartStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = CartStore()
+
+    def test_quantities_and_counters(self):
+        self.assertEqual(self.store.add("cart_a", "SKU00101", "apple", 0.8, 1.0), 1)
+        self.assertEqual(self.store.add("cart_a", "SKU00101", "apple", 0.9, 2.0), 2)
+        self.store.add("cart_b", "SKU00102", "orange", 0.7, 3.0)
+
+        self.assertEqual(self.store.total_items, 3)
+        self.assertEqual(self.store.item_count("cart_a"), 2)
+        items = self.store.get_items("cart_a")
+        self.assertEqual(items[0]["quantity"], 2)
+        self.assertEqual(items[0]["confidence"], 0.9)
+
+        self.assertEqual(self.store.remove("cart_a", "SKU00101", "apple"), 1)
+        self.assertEqual(self.store.remove("cart_a", "SKU00101", "apple"), 0)
+        self.assertIsNone(self.store.remove("cart_a", "SKU00101", "apple"))
+        self.assertIsNone(self.store.remove("cart_b", "SKU00102", "apple"))
+        self.assertEqual(self.store.get_items("cart_a"), [])
+        self.assertIn("cart_a", self.store)
+        self.assertEqual(self.store.total_items, 1)
+
+    def test_concurrent_updates_keep_counters_consistent(self):
+        carts = [f"cart_{idx}" for idx in range(1000)]
+
+        def worker(offset):
+            for cart_id in carts[offset::8]:
+                for _ in range(3):
+                    self.store.add(cart_id, "SKU00101", "apple", 0.8, 1.0)
+                self.store.remove(cart_id, "SKU00101", "apple")
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.store), 1000)
+        self.assertEqual(self.store.total_items, 2000)
+        self.assertEqual(sum(self.store.item_count(cart_id) for cart_id in carts), 2000)
+
+    def test_running_price_totals(self):
+        self.store.add("cart_a", "SKU00101", "apple", 0.8, 1.0, 1.50)
+        self.store.add("cart_a", "SKU00101", "apple", 0.8, 2.0, 1.50)
+        self.store.add("cart_a", "SKU00102", "orange", 0.7, 3.0, 0.75)
+        self.assertAlmostEqual(self.store.cart_total("cart_a"), 3.75)
+
+        self.store.remove("cart_a", "SKU00101", "apple")
+        self.assertAlmostEqual(self.store.cart_total("cart_a"), 2.25)
+        self.store.remove("cart_a", "SKU00101", "apple")
+        self.store.remove("cart_a", "SKU00102", "orange")
+        self.assertEqual(self.store.cart_total("cart_a"), 0.0)
+
+    def test_snapshot_roundtrip(self):
+        self.store.add("cart_a", "SKU00101", "apple", 0.8, 1.0)
+        self.store.add("cart_a", "SKU00101", "apple", 0.8, 1.0)
+        self.store.add("cart_b", "SKU00102", "orange", 0.7, 2.0, 0.75)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "carts.json")
+            self.store.snapshot(path)
+            self.assertFalse(self.store.dirty)
+
+            restored = CartStore()
+            self.assertTrue(restored.restore(path))
+            self.assertFalse(restored.restore(os.path.join(temp_dir, "missing.json")))
+
+        self.assertEqual(restored.total_items, 3)
+        self.assertAlmostEqual(restored.cart_total("cart_b"), 0.75)
+        self.assertEqual(restored.get_items("cart_a"), self.store.get_items("cart_a"))
+
+if __name__ == '__main__':
+    unittest.main()
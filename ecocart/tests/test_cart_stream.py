@@ -0,0 +1,120 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import threading
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart import database
+from src.ecocart.api.handlers import cart_handler
+from src.ecocart.api.state import cart_store
+from src.ecocart.api.stream import CartStreamHub, cart_event_stream, cart_stream_hub
+
+def parse(chunk):
+    """(event type, data) pairs in a chunk of server-sent events"""
+    events = []
+    for message in chunk.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+class TestCartStreamHub(unittest.TestCase):
+
+    def test_fan_out_from_another_thread(self):
+        hub = CartStreamHub()
+
+        async def scenario():
+            streams = [cart_event_stream(hub, "cart_a", lambda cart_id: {"cart_id": cart_id}) for _ in range(3)]
+            for stream in streams:
+                self.assertEqual(parse(await anext(stream))[0][0], "snapshot")
+            self.assertEqual(hub.subscriber_count("cart_a"), 3)
+
+            publisher = threading.Thread(target=hub.publish, args=("cart_a", [
+                {"type": "add", "sku": "SKU00101", "quantity": 1},
+                {"type": "remove", "sku": "SKU00101", "quantity": 0},
+            ]))
+            publisher.start()
+            publisher.join()
+
+            chunks = [await asyncio.wait_for(anext(stream), 1) for stream in streams]
+            for stream in streams:
+                await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(scenario())
+        for chunk in chunks:
+            self.assertEqual([event[0] for event in parse(chunk)], ["add", "remove"])
+        self.assertEqual(hub.subscriber_count(), 0)
+        self.assertEqual(hub.stats()["delivered"], 6)
+
+    def test_slow_consumer_gets_snapshot(self):
+        hub = CartStreamHub(buffer_size=2)
+
+        async def scenario():
+            stream = cart_event_stream(hub, "cart_a", lambda cart_id: {"cart_id": cart_id, "resync": True})
+            await anext(stream)
+            hub.publish("cart_a", [{"type": "add", "quantity": n} for n in range(5)])
+            await asyncio.sleep(0)
+            chunk = await asyncio.wait_for(anext(stream), 1)
+            stats = hub.stats()
+            await stream.aclose()
+            return chunk, stats
+
+        chunk, stats = asyncio.run(scenario())
+        self.assertEqual(parse(chunk), [("snapshot", {"cart_id": "cart_a", "resync": True})])
+        self.assertEqual(stats["dropped"], 3)
+
+class TestCartHandlerDeltas(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        sku_map_path = os.path.join(self.temp_dir.name, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({
+                "apple": {"sku": "SKU00101", "price": 1.50},
+                "orange": {"sku": "SKU00102", "price": 0.75}
+            }, f)
+
+        self.original_paths = (database.DATABASE_FILE, database.SKU_MAP_PATH)
+        database.DATABASE_FILE = os.path.join(self.temp_dir.name, "billing.db")
+        database.SKU_MAP_PATH = sku_map_path
+        database.initialize_db()
+        cart_store.clear()
+
+    def tearDown(self):
+        database.close_connections()
+        database.DATABASE_FILE, database.SKU_MAP_PATH = self.original_paths
+        cart_store.clear()
+        self.temp_dir.cleanup()
+
+    def test_handlers_publish_deltas_with_totals(self):
+        async def scenario():
+            stream = cart_event_stream(cart_stream_hub, "cart_001", cart_handler.get_cart_summary)
+            snapshot = parse(await anext(stream))
+            await asyncio.to_thread(cart_handler.apply_events, "cart_001", [
+                {"type": "add", "sku": "SKU00101", "label": "apple", "confidence": 0.9, "timestamp": 1.0},
+                {"type": "add", "sku": "SKU00102", "label": "orange", "confidence": 0.8, "timestamp": 2.0},
+            ])
+            await asyncio.to_thread(cart_handler.remove_item, "cart_001", "SKU00101", "apple", 3.0)
+
+            events = []
+            while len(events) < 3:
+                events += parse(await asyncio.wait_for(anext(stream), 1))
+            await stream.aclose()
+            return snapshot, events
+
+        snapshot, events = asyncio.run(scenario())
+        self.assertEqual(snapshot[0][1]["item_count"], 0)
+        self.assertEqual([event[0] for event in events], ["add", "add", "remove"])
+        self.assertEqual(events[1][1]["total"], 2.25)
+        self.assertEqual(events[2][1], {
+            "type": "remove", "sku": "SKU00101", "label": "apple",
+            "quantity": 0, "item_count": 1, "total": 0.75
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.catalog import SkuCatalog, get_catalog
+
+class TestSkuCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "sku_map.json")
+        self.write({
+            "apple": {"sku": "SKU00101", "price": 1.50},
+            "orange": "SKU00102"
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, data, mtime=None):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_indexes_by_label_and_sku(self):
+        catalog = SkuCatalog(self.path)
+        self.assertEqual(len(catalog), 2)
+        self.assertIn("apple", catalog)
+        self.assertEqual(catalog.get("apple").price, 1.50)
+        self.assertEqual(catalog.get_by_sku("SKU00102").label, "orange")
+        self.assertIsNone(catalog.get("orange").price)
+        self.assertIsNone(catalog.get("banana"))
+
+    def test_hot_reload_on_change(self):
+        catalog = SkuCatalog(self.path, check_interval=0)
+        version = catalog.version
+        self.assertFalse(catalog.refresh())
+
+        self.write({"banana": {"sku": "SKU00107", "price": 0.25}}, mtime=1_000_000)
+        self.assertTrue(catalog.refresh())
+        self.assertNotEqual(catalog.version, version)
+        self.assertIn("banana", catalog)
+        self.assertNotIn("apple", catalog)
+
+    def test_class_table_by_class_id(self):
+        catalog = SkuCatalog(self.path)
+        table = catalog.class_table({0: "person", 1: "orange", 3: "apple"})
+
+        np.testing.assert_array_equal(table.sku_index, [-1, 1, -1, 0])
+        np.testing.assert_array_equal(table.mapped(np.array([3, 0, 1])), [True, False, True])
+        self.assertEqual(table.item(1).sku, "SKU00102")
+        self.assertIsNone(table.item(0))
+        self.assertEqual(table.unmapped, ("person",))
+        self.assertEqual(table.version, catalog.version)
+
+    def test_invalid_file_keeps_previous_version(self):
+        catalog = SkuCatalog(self.path, check_interval=0)
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        os.utime(self.path, (1_000_000, 1_000_000))
+
+        self.assertFalse(catalog.refresh())
+        self.assertIn("apple", catalog)
+
+    def test_shared_instance_per_path(self):
+        self.assertIs(get_catalog(self.path), get_catalog(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.vector_db import VectorDB, StubBackend
+from src.vector_db.cache import QueryCache
+from src.vector_db.index import HashEmbeddingFunction, plan_sync
+
+class TestCatalogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sku_map = {
+            "apple": {"sku": "SKU00101", "price": 1.50},
+            "orange": {"sku": "SKU00102", "price": 0.75},
+            "carrot": {"sku": "SKU00104", "price": 0.50}
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open_index(self, sku_map):
+        embedding_function = HashEmbeddingFunction()
+        vector_db = VectorDB(
+            sku_map,
+            llm_backend=StubBackend(),
+            cache=QueryCache(),
+            index_path=self.temp_dir.name,
+            embedding_function=embedding_function
+        )
+        return vector_db, embedding_function
+
+    def test_plan_sync(self):
+        upserts, deletes = plan_sync({"a": "1", "b": "2", "c": "3"}, {"a": "1", "b": "9", "d": "4"})
+        self.assertEqual(sorted(upserts), ["b", "d"])
+        self.assertEqual(deletes, ["c"])
+
+    def test_restart_only_embeds_changes(self):
+        vector_db, embedder = self.open_index(self.sku_map)
+        self.assertEqual(vector_db.sync_stats["embedded"], 3)
+        self.assertEqual(embedder.embedded, 3)
+
+        vector_db, embedder = self.open_index(self.sku_map)
+        self.assertEqual(vector_db.sync_stats, {"total": 3, "embedded": 0, "deleted": 0})
+        self.assertEqual(embedder.embedded, 0)
+
+        changed = dict(self.sku_map)
+        changed["apple"] = {"sku": "SKU00101", "price": 1.75}
+        del changed["carrot"]
+        changed["broccoli"] = {"sku": "SKU00103", "price": 2.00}
+        vector_db, embedder = self.open_index(changed)
+        self.assertEqual(vector_db.sync_stats, {"total": 3, "embedded": 2, "deleted": 1})
+        self.assertEqual(vector_db.collection.count(), 3)
+
+    def test_missing_manifest_falls_back_to_collection(self):
+        self.open_index(self.sku_map)
+        os.remove(os.path.join(self.temp_dir.name, "manifest.json"))
+
+        vector_db, embedder = self.open_index(self.sku_map)
+        self.assertEqual(vector_db.sync_stats["embedded"], 0)
+        self.assertEqual(embedder.embedded, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "manifest.json")))
+
+    def test_query_uses_backend(self):
+        vector_db, _ = self.open_index(self.sku_map)
+        self.assertIn("apple", vector_db.query("apple", top_k=2))
+        self.assertEqual(vector_db.llm_backend.calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
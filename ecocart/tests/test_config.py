@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.config import (
+    Config, ConfigError, class_confidence_table, load_config, load_fleet_config, validate_config
+)
+
+class TestLoadConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_yaml_keys_fill_config_fields(self):
+        path = self.write("tracker.yaml", "confidence_threshold: 0.6\nremoval_timeout: 4\ndisplay_window: false\n")
+        config = load_config(path, environ={})
+
+        self.assertEqual(config.CONFIDENCE_THRESHOLD, 0.6)
+        self.assertEqual(config.REMOVAL_TIMEOUT, 4)
+        self.assertFalse(config.DISPLAY_WINDOW)
+        self.assertEqual(config.IOU_THRESHOLD, Config.IOU_THRESHOLD)
+
+    def test_environment_then_overrides_win(self):
+        path = self.write("tracker.yaml", "confidence_threshold: 0.6\nbackend_url: http://file\n")
+        environ = {"ECOCART_CONFIDENCE_THRESHOLD": "0.7", "ECOCART_BACKEND_URL": "http://env", "PATH": "/bin"}
+        config = load_config(path, overrides={"CONFIDENCE_THRESHOLD": 0.8, "BACKEND_URL": None}, environ=environ)
+
+        self.assertEqual(config.CONFIDENCE_THRESHOLD, 0.8)
+        self.assertEqual(config.BACKEND_URL, "http://env")
+
+    def test_environment_values_are_typed(self):
+        environ = {
+            "ECOCART_CART_ID": "007",
+            "ECOCART_ROI": "[0, 0, 640, 480]",
+            "ECOCART_PIPELINE_MODE": "true",
+            "ECOCART_VIDEO_SOURCE": "videos/cart.mp4",
+        }
+        config = load_config(self.write("empty.yaml", ""), environ=environ)
+
+        self.assertEqual(config.CART_ID, "007")
+        self.assertEqual(config.ROI, [0, 0, 640, 480])
+        self.assertTrue(config.PIPELINE_MODE)
+        self.assertEqual(config.VIDEO_SOURCE, "videos/cart.mp4")
+
+    def test_other_modules_variables_are_not_settings(self):
+        environ = {"ECOCART_SKU_MAP": "config/sku_map.json", "ECOCART_LLM_BACKEND": "stub"}
+        config = load_config(self.write("empty.yaml", ""), environ=environ)
+        self.assertEqual(config.LABEL_MAP_PATH, Config.LABEL_MAP_PATH)
+
+    def test_cart_section_and_file_override_shared_settings(self):
+        cart_dir = os.path.join(self.temp_dir.name, "carts")
+        os.makedirs(cart_dir)
+        self.write("carts/cart_002.yaml", "roi: [0, 0, 320, 240]\nconfidence_threshold: 0.5\n")
+        path = self.write(
+            "tracker.yaml",
+            f"inference_size: 512\ncart_config_dir: {cart_dir}\n"
+            "carts:\n"
+            "  cart_001:\n"
+            "    roi: [160, 60, 1120, 700]\n"
+            "  cart_002:\n"
+            "    inference_size: 416\n"
+            "    roi_mask: [[0, 0], [100, 0], [0, 100]]\n"
+        )
+
+        first = load_config(path, cart_id="cart_001", environ={})
+        self.assertEqual((first.INFERENCE_SIZE, first.ROI, first.ROI_MASK), (512, [160, 60, 1120, 700], None))
+        second = load_config(path, overrides={"CART_ID": "cart_002"}, environ={})
+        self.assertEqual(second.CART_ID, "cart_002")
+        self.assertEqual((second.INFERENCE_SIZE, second.ROI), (416, [0, 0, 320, 240]))
+        self.assertEqual(second.ROI_MASK, [[0, 0], [100, 0], [0, 100]])
+        self.assertEqual(second.CONFIDENCE_THRESHOLD, 0.5)
+        other = load_config(path, cart_id="cart_003", environ={})
+        self.assertEqual((other.INFERENCE_SIZE, other.ROI), (512, None))
+
+    def test_fleet_config_keeps_cart_settings_out_of_shared(self):
+        path = self.write(
+            "tracker.yaml",
+            "inference_size: 512\ncarts:\n  cart_001:\n    roi: [160, 60, 1120, 700]\n    inference_size: 416\n"
+        )
+        shared, cart_overrides = load_fleet_config(
+            path, ["cart_001", "cart_002"], overrides={"CONFIDENCE_THRESHOLD": 0.5}, environ={}
+        )
+
+        self.assertEqual((shared.INFERENCE_SIZE, shared.ROI, shared.CONFIDENCE_THRESHOLD), (512, None, 0.5))
+        self.assertEqual(cart_overrides, {"cart_001": {"ROI": [160, 60, 1120, 700], "INFERENCE_SIZE": 416}, "cart_002": {}})
+
+    def test_every_problem_is_reported(self):
+        path = self.write(
+            "tracker.yaml",
+            "confidence_treshold: 0.5\nremoval_timeout: soon\ninference_size: 500\n"
+            "carts:\n  cart_001:\n    roi: [160, 60, 1120]\n"
+        )
+        with self.assertRaises(ConfigError) as raised:
+            load_config(path, environ={"ECOCART_FRAME_SKP": "2"})
+
+        message = str(raised.exception)
+        self.assertIn("did you mean 'confidence_threshold'", message)
+        self.assertIn("removal_timeout should be int", message)
+        self.assertIn("ECOCART_FRAME_SKP", message)
+        self.assertEqual(len(raised.exception.problems), 3)
+
+        with self.assertRaises(ConfigError) as raised:
+            load_config(self.write("ranges.yaml", "inference_size: 500\ncarts:\n  cart_001:\n    roi: [1, 2, 3]\n"), environ={})
+        self.assertEqual(len(raised.exception.problems), 2)
+
+    def test_validate_cross_field_constraints(self):
+        validate_config(Config())
+        with self.assertRaises(ConfigError) as raised:
+            validate_config(Config(
+                TRACK_LOW_CONFIDENCE=0.5, CONFIDENCE_THRESHOLD=0.4, MIN_FRAME_SKIP=20, MATCHING_METHOD="best",
+                LABEL_MAP_PATH="missing.json",
+            ))
+        self.assertEqual(len(raised.exception.problems), 4)
+
+    def test_hungarian_needs_scipy(self):
+        with patch("src.ecocart.matching.linear_sum_assignment", None), self.assertRaises(ConfigError) as raised:
+            validate_config(Config(MATCHING_METHOD="hungarian"))
+        self.assertIn("needs scipy", str(raised.exception))
+        with patch("src.ecocart.matching.linear_sum_assignment", Mock()):
+            validate_config(Config(MATCHING_METHOD="hungarian"))
+
+class TestClassConfidenceTable(unittest.TestCase):
+
+    def test_table_by_class_id(self):
+        config = Config(CONFIDENCE_THRESHOLD=0.4, CLASS_CONFIDENCE={"orange": 0.7, "kiwi": 0.5})
+        table, unknown = class_confidence_table(config, {0: "apple", 1: "orange", 3: "carrot"})
+
+        np.testing.assert_allclose(table, [0.4, 0.7, 0.4, 0.4])
+        self.assertEqual(unknown, ["kiwi"])
+        self.assertEqual(class_confidence_table(Config(), {0: "apple"}), (None, []))
+
+if __name__ == '__main__':
+    unittest.main()
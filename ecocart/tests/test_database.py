@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+import threading
+import sqlite3
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart import database
+
+class TestBillingDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        sku_map_path = os.path.join(self.temp_dir.name, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({"apple": {"sku": "SKU00101", "price": 1.50}}, f)
+
+        self.original_paths = (database.DATABASE_FILE, database.SKU_MAP_PATH)
+        database.DATABASE_FILE = os.path.join(self.temp_dir.name, "billing.db")
+        database.SKU_MAP_PATH = sku_map_path
+        database.initialize_db()
+
+    def tearDown(self):
+        database.close_connections()
+        database.DATABASE_FILE, database.SKU_MAP_PATH = self.original_paths
+        self.temp_dir.cleanup()
+
+    def test_connection_is_reused_per_thread(self):
+        conn = database.get_connection()
+        self.assertIs(database.get_connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(database.get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+
+    def test_concurrent_inserts_are_group_committed(self):
+        transactions_before = database._writer.transactions
+
+        def worker():
+            for _ in range(50):
+                self.assertTrue(database.add_item_to_bill("apple"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(database.get_all_billed_items()), 400)
+        self.assertAlmostEqual(database.get_total_bill(), 600.0)
+        self.assertLessEqual(database._writer.transactions - transactions_before, 400)
+
+    def test_remove_and_clear(self):
+        database.add_items_to_bill(["apple", "apple", "unknown"])
+        item_id = database.get_all_billed_items()[0][0]
+        database.remove_item_from_bill(item_id)
+        self.assertAlmostEqual(database.get_total_bill(), 1.5)
+
+        database.clear_bill()
+        self.assertEqual(database.get_total_bill(), 0.0)
+
+    def test_running_totals_per_cart(self):
+        database.add_items_to_bill(["apple", "apple"], "cart_a")
+        database.add_item_to_bill("apple", "cart_b")
+        self.assertAlmostEqual(database.get_total_bill("cart_a"), 3.0)
+        self.assertAlmostEqual(database.get_total_bill("cart_b"), 1.5)
+        self.assertAlmostEqual(database.get_total_bill(), 4.5)
+        self.assertEqual(database.get_total_bill("cart_missing"), 0.0)
+
+        item_id = database.get_all_billed_items("cart_a")[0][0]
+        database.remove_item_from_bill(item_id)
+        self.assertAlmostEqual(database.get_total_bill("cart_a"), 1.5)
+
+        database.clear_bill("cart_a")
+        self.assertEqual(database.get_total_bill("cart_a"), 0.0)
+        self.assertAlmostEqual(database.get_total_bill(), 1.5)
+
+    def test_keyset_pagination(self):
+        database.add_items_to_bill(["apple"] * 5, "cart_a")
+        database.add_item_to_bill("apple", "cart_b")
+
+        cursor = lambda row: (row[3], row[0])
+        first = database.get_billed_items("cart_a", limit=2)
+        second = database.get_billed_items("cart_a", limit=2, before=cursor(first[-1]))
+        third = database.get_billed_items("cart_a", limit=2, before=cursor(second[-1]))
+
+        ids = [row[0] for row in first + second + third]
+        self.assertEqual(ids, [row[0] for row in database.get_all_billed_items("cart_a")])
+        self.assertEqual(len(third), 1)
+
+    def test_keyset_page_survives_deleted_cursor_row(self):
+        database.add_items_to_bill(["apple"] * 4, "cart_a")
+        first = database.get_bill_lines("cart_a", limit=2)
+        database.remove_item_from_bill(first[-1][0])
+
+        second = database.get_bill_lines("cart_a", limit=2, before=(first[-1][3], first[-1][0]))
+        self.assertEqual([row[0] for row in second], [row[0] for row in database.get_all_billed_items("cart_a")[1:]])
+
+    def test_migrates_legacy_table(self):
+        database.close_connections()
+        database.DATABASE_FILE = os.path.join(self.temp_dir.name, "legacy.db")
+        conn = sqlite3.connect(database.DATABASE_FILE)
+        conn.execute("""
+            CREATE TABLE billing (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_name TEXT NOT NULL,
+                price REAL NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany("INSERT INTO billing (item_name, price) VALUES (?, ?)", [("apple", 1.5), ("orange", 0.75)])
+        conn.commit()
+        conn.close()
+
+        database.initialize_db()
+        database.initialize_db()  # idempotent
+        self.assertAlmostEqual(database.get_total_bill(database.DEFAULT_CART_ID), 2.25)
+        self.assertEqual(len(database.get_all_billed_items(database.DEFAULT_CART_ID)), 2)
+
+        database.add_item_to_bill("apple", "cart_a")
+        self.assertAlmostEqual(database.get_total_bill(), 3.75)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.config import Config
+from src.ecocart.detection_log import DetectionLog, DetectionRecorder
+from src.ecocart.inference import Boxes, Detections
+
+NAMES = {0: "apple", 1: "person"}
+
+def make_frames(count):
+    """Two drifting apples and a person box, with every fourth frame empty"""
+    frames = []
+    for frame in range(count):
+        if frame % 4 == 3:
+            frames.append((frame * 0.1, np.empty((0, 4)), np.empty(0), np.empty(0)))
+            continue
+        boxes = np.array([[10 + frame, 10, 50 + frame, 50], [100, 100, 150, 150], [0, 0, 5, 5]], dtype=np.float32)
+        frames.append((frame * 0.1, boxes, np.array([0.9, 0.8, 0.9], dtype=np.float32), np.array([0, 0, 1])))
+    return frames
+
+class TestDetectionLog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "log")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def record(self, frames):
+        recorder = DetectionRecorder(self.path, NAMES)
+        for frame in frames:
+            recorder.append(*frame)
+        recorder.close()
+
+    def test_round_trip(self):
+        frames = make_frames(8)
+        self.record(frames)
+        log = DetectionLog(self.path)
+
+        self.assertEqual(log.names, NAMES)
+        self.assertEqual(len(log), 8)
+        self.assertEqual(log.detections, 18)
+        for (frame_time, boxes, conf, cls), replayed in zip(frames, log):
+            self.assertEqual(replayed[0], frame_time)
+            np.testing.assert_array_equal(replayed[1], boxes.reshape(-1, 4))
+            np.testing.assert_array_equal(replayed[2], conf)
+            np.testing.assert_array_equal(replayed[3], cls)
+
+    def test_truncated_frame_is_dropped(self):
+        self.record(make_frames(3))
+        with open(os.path.join(self.path, "xyxy.bin"), "r+b") as f:
+            f.truncate(os.path.getsize(f.name) - 8)
+
+        log = DetectionLog(self.path)
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log[1][1].shape, (3, 4))
+
+class TestTrackerReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sku_map = os.path.join(self.temp_dir.name, "sku_map.json")
+        with open(self.sku_map, "w") as f:
+            json.dump({"apple": {"sku": "SKU00101", "price": 1.50}}, f)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_tracker(self, **overrides):
+        api_client = Mock()
+        config = Config(DISPLAY_WINDOW=False, STABILIZATION_FRAMES=3, LABEL_MAP_PATH=self.sku_map, **overrides)
+        with patch("src.ecocart.main.create_api_client", return_value=api_client), \
+                patch("src.ecocart.main.create_backend", return_value=SimpleNamespace(names=NAMES)) as backend:
+            tracker = GroceryCartTracker(config)
+        return tracker, backend
+
+    def test_replay_matches_live_run_without_model(self):
+        log_path = os.path.join(self.temp_dir.name, "{cart_id}")
+        live, _ = self.make_tracker(RECORD_DETECTIONS=log_path)
+        for frame_time, boxes, conf, cls in make_frames(12):
+            live.process_detections(Detections(Boxes(boxes, conf, cls), NAMES, (480, 640)), frame_time)
+        live.stop_recording()
+
+        replayed, backend = self.make_tracker(REPLAY_DETECTIONS=log_path.format(cart_id="cart_001"))
+        backend.assert_not_called()
+        self.assertEqual(replayed.replay(), 12)
+        self.assertEqual(replayed.api_client.add_item.call_args_list, live.api_client.add_item.call_args_list)
+        self.assertEqual(sorted(replayed.cart_inventory), sorted(live.cart_inventory))
+
+    def test_replay_keeps_configured_roi(self):
+        log_path = os.path.join(self.temp_dir.name, "log")
+        live, _ = self.make_tracker(RECORD_DETECTIONS=log_path)
+        live.stop_recording()
+
+        tracker, _ = self.make_tracker(REPLAY_DETECTIONS=log_path, ROI=[100, 50, 600, 400])
+        roi = tracker.roi
+        tracker.replay()
+        self.assertIs(tracker.roi, roi)
+        self.assertEqual(tracker.roi.box, (100, 50, 600, 400))
+
+if __name__ == '__main__':
+    unittest.main()
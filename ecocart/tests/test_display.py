@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+from collections import Counter
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.catalog import SkuCatalog
+from src.ecocart.display import CANDIDATE_COLOR, CONFIRMED_COLOR, AnnotationRenderer
+
+NAMES = {0: "apple", 1: "orange", 2: "person"}
+
+class TestAnnotationRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_sku_map = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump({"apple": {"sku": "SKU00101", "price": 1.50}, "orange": {"sku": "SKU00102", "price": 0.75}},
+                  self.temp_sku_map)
+        self.temp_sku_map.close()
+        self.catalog = SkuCatalog(self.temp_sku_map.name)
+        self.renderer = AnnotationRenderer("test_cart", confidence_threshold=0.4)
+        self.frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        self.xyxy = np.array([[20, 40, 80, 100], [120, 40, 180, 100], [220, 40, 280, 100]], dtype=np.float32)
+        self.confs = np.array([0.9, 0.8, 0.9], dtype=np.float32)
+        self.classes = np.array([0, 1, 2])
+
+    def tearDown(self):
+        os.unlink(self.temp_sku_map.name)
+
+    def render(self, confs=None, in_place=False):
+        confs = self.confs if confs is None else confs
+        return self.renderer.render(self.frame, self.xyxy, confs, self.classes, self.catalog.class_table(NAMES),
+                                    Counter({"apple": 1}), in_place=in_place)
+
+    def test_colors_follow_cart_labels(self):
+        canvas = self.render()
+        self.assertEqual(tuple(canvas[70, 20]), CONFIRMED_COLOR)
+        self.assertEqual(tuple(canvas[70, 120]), CANDIDATE_COLOR)
+        self.assertEqual(canvas[70, 220].tolist(), [0, 0, 0])  # not in the catalog
+
+    def test_weak_detections_are_not_drawn(self):
+        canvas = self.render(confs=np.array([0.9, 0.2, 0.9], dtype=np.float32))
+        self.assertEqual(canvas[70, 120].tolist(), [0, 0, 0])
+
+    def test_buffer_is_reused_and_frame_untouched(self):
+        first = self.render()
+        second = self.render()
+        self.assertIs(first, second)
+        self.assertEqual(np.count_nonzero(self.frame), 0)
+        self.assertIs(self.render(in_place=True), self.frame)
+
+    def test_label_cache_follows_catalog_version(self):
+        self.render()
+        self.assertEqual(self.renderer._prefixes[0], "apple (SKU00101)")
+        with open(self.temp_sku_map.name, "w") as f:
+            json.dump({"apple": {"sku": "SKU00999", "price": 1.50}}, f)
+        self.catalog.reload()
+
+        self.render()
+        self.assertEqual(self.renderer._prefixes, {0: "apple (SKU00999)"})
+
+    def test_display_rate_cap(self):
+        renderer = AnnotationRenderer("test_cart", 0.4, max_fps=10)
+        shown = [renderer.due(now=t / 30) for t in range(30)]
+        self.assertEqual(sum(shown), 10)
+        self.assertEqual(renderer.get_stats(), {"shown": 10, "skipped": 20})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart import database
+from src.ecocart.api.enrichment import EnrichmentService, enrichment_service
+from src.ecocart.api.executors import create_executors
+from src.ecocart.api.handlers import cart_handler
+from src.ecocart.api.routers import cart_router
+from src.ecocart.api.state import cart_store
+from src.ecocart.catalog import SkuCatalog
+
+class CountingVectorDB:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.queries = []
+
+    def query(self, query_text):
+        self.queries.append(query_text)
+        return f"{query_text}: low footprint"
+
+class TestBillEnrichment(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        sku_map_path = os.path.join(self.temp_dir.name, "sku_map.json")
+        with open(sku_map_path, "w") as f:
+            json.dump({
+                "apple": {"sku": "SKU00101", "price": 1.50},
+                "orange": {"sku": "SKU00102", "price": 0.75}
+            }, f)
+
+        self.original_paths = (database.DATABASE_FILE, database.SKU_MAP_PATH)
+        database.DATABASE_FILE = os.path.join(self.temp_dir.name, "billing.db")
+        database.SKU_MAP_PATH = sku_map_path
+        database.initialize_db()
+        cart_store.clear()
+
+        self.vector_db = CountingVectorDB(SkuCatalog(sku_map_path))
+        enrichment_service.start(self.vector_db)
+
+    def tearDown(self):
+        enrichment_service.stop()
+        database.close_connections()
+        database.DATABASE_FILE, database.SKU_MAP_PATH = self.original_paths
+        cart_store.clear()
+        self.temp_dir.cleanup()
+
+    def test_each_item_enriched_once(self):
+        for _ in range(3):
+            cart_handler.add_item("cart_001", "SKU00101", "apple", 0.9, 1.0)
+        cart_handler.apply_events("cart_001", [
+            {"type": "add", "sku": "SKU00102", "label": "orange", "confidence": 0.8, "timestamp": 2.0},
+            {"type": "add", "sku": "SKU00101", "label": "apple", "confidence": 0.8, "timestamp": 3.0},
+        ])
+        self.assertTrue(enrichment_service.wait_idle(2))
+
+        self.assertEqual(sorted(self.vector_db.queries), ["apple", "orange"])
+        self.assertEqual(database.get_enriched_items(), {"apple", "orange"})
+
+    def test_bill_joins_enrichment(self):
+        cart_handler.add_item("cart_001", "SKU00101", "apple", 0.9, 1.0)
+        self.assertTrue(enrichment_service.wait_idle(2))
+
+        app = FastAPI()
+        app.include_router(cart_router.router)
+        app.state.executors = create_executors()
+        response = TestClient(app).get("/bill", params={"cart_id": "cart_001"})
+
+        items = response.json()["items"]
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0][1], "apple")
+        self.assertEqual(items[0][4], "apple: low footprint")
+
+    def test_backfills_billed_items_on_start(self):
+        enrichment_service.stop()
+        database.add_items_to_bill(["apple", "orange"], "cart_001")
+        database.save_enrichment("apple", "SKU00101", "cached")
+
+        service = EnrichmentService()
+        service.start(self.vector_db)
+        self.assertTrue(service.wait_idle(2))
+        service.stop()
+
+        self.assertEqual(self.vector_db.queries, ["orange"])
+        lines = database.get_bill_lines("cart_001")
+        self.assertEqual(sorted(line[4] for line in lines), ["cached", "orange: low footprint"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.api.executors import create_executors
+from src.ecocart.api.routers import cart_router, health_router
+
+class BlockingVectorDB:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def query(self, query_text):
+        self.started.set()
+        self.release.wait(5)
+        return f"info for {query_text}"
+
+class TestBoundedExecutors(unittest.TestCase):
+
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(cart_router.router)
+        app.include_router(health_router.router)
+        app.state.vector_db = BlockingVectorDB()
+        app.state.executors = create_executors({"db": (1, 0, 1.0), "llm": (1, 0, 1.0)})
+        self.app = app
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.app.state.vector_db.release.set()
+        for executor in self.app.state.executors.values():
+            executor.shutdown()
+
+    def start_slow_request(self):
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(self.client.get("/item_info/apple")))
+        thread.start()
+        self.assertTrue(self.app.state.vector_db.started.wait(2))
+        return thread, responses
+
+    def test_health_responds_while_llm_call_in_flight(self):
+        thread, responses = self.start_slow_request()
+
+        start = time.perf_counter()
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        self.app.state.vector_db.release.set()
+        thread.join()
+        self.assertEqual(responses[0].json()["info"], "info for apple")
+
+    def test_saturated_pool_returns_429(self):
+        thread, _ = self.start_slow_request()
+
+        response = self.client.get("/item_info/orange")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["retry-after"], "1")
+
+        self.app.state.vector_db.release.set()
+        thread.join()
+        stats = self.client.get("/metrics/executors").json()
+        self.assertEqual(stats["llm"]["rejected"], 1)
+        self.assertEqual(stats["llm"]["in_flight"], 0)
+
+    def test_slow_call_times_out(self):
+        self.app.state.executors = create_executors({"llm": (1, 0, 0.1)})
+        response = self.client.get("/item_info/apple")
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(self.app.state.executors["llm"].timeouts, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.fleet import MultiCartRunner
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.config import Config
+
+def load_dependencies(tracker):
+    tracker.api_client = Mock()
+
+class TestMultiCartRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.model = Mock(side_effect=lambda frames, **kwargs: [f"result_{frame}" for frame in frames])
+        config = Config(MAX_BATCH_SIZE=4, BATCH_MAX_WAIT_MS=30, DISPLAY_WINDOW=False)
+        with patch.object(GroceryCartTracker, "load_dependencies", load_dependencies):
+            self.runner = MultiCartRunner(
+                [("cart_a", 0), ("cart_b", 1), ("cart_c", 2)], config, model=self.model
+            )
+        for stream in self.runner.streams:
+            stream.alive = True
+            stream.tracker.process_detections = Mock()
+
+    def test_trackers_share_model(self):
+        for stream in self.runner.streams:
+            self.assertIs(stream.tracker.model, self.model)
+        self.assertEqual(
+            [stream.tracker.config.CART_ID for stream in self.runner.streams],
+            ["cart_a", "cart_b", "cart_c"]
+        )
+
+    def test_full_batch_returns_immediately(self):
+        for idx, stream in enumerate(self.runner.streams):
+            stream.offer(idx, 100.0 + idx)
+
+        start = time.perf_counter()
+        batch = self.runner.collect_batch()
+        self.assertLess(time.perf_counter() - start, 0.02)
+        self.assertEqual([frame for _, frame, _ in batch], [0, 1, 2])
+
+    def test_batches_rotate_when_more_carts_are_ready(self):
+        self.runner.config = Config(MAX_BATCH_SIZE=2, BATCH_MAX_WAIT_MS=30, DISPLAY_WINDOW=False)
+        served = []
+        for step in range(3):
+            for stream in self.runner.streams:
+                stream.offer(stream.cart_id, float(step))
+            served.append([stream.cart_id for stream, _, _ in self.runner.collect_batch()])
+
+        self.assertEqual(served, [["cart_a", "cart_b"], ["cart_c", "cart_a"], ["cart_b", "cart_c"]])
+
+    def test_partial_batch_waits_for_deadline(self):
+        self.runner.streams[1].offer("b", 1.0)
+
+        start = time.perf_counter()
+        batch = self.runner.collect_batch()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.025)
+        self.assertEqual(len(batch), 1)
+
+    def test_results_fan_out_to_carts(self):
+        self.runner.streams[0].offer("a", 1.0)
+        self.runner.streams[2].offer("c", 2.0)
+        self.runner.streams[2].offer("c2", 3.0)
+        self.runner.process_batch(self.runner.collect_batch())
+
+        self.model.assert_called_once_with(["a", "c2"], imgsz=640, conf=0.1, verbose=False)
+        self.runner.streams[0].tracker.process_detections.assert_called_once_with("result_a", 1.0)
+        self.runner.streams[2].tracker.process_detections.assert_called_once_with("result_c2", 3.0)
+        self.runner.streams[1].tracker.process_detections.assert_not_called()
+        self.assertEqual(self.runner.get_stats()["dropped_frames"]["cart_c"], 1)
+
+    def test_shutdown_flushes_every_cart(self):
+        for stream in self.runner.streams:
+            stream.start = Mock(return_value=True)
+            stream.stop = Mock()
+            stream.alive = False
+        self.runner.run()
+
+        for stream in self.runner.streams:
+            stream.stop.assert_called_once()
+            stream.tracker.api_client.flush.assert_called_once_with(timeout=self.runner.config.API_TIMEOUT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.config import Config
+from src.ecocart.inference import Boxes, OnnxBackend, create_backend, decode_predictions, export_shared_weights, letterbox, ort
+from src.ecocart.matching import extract_detections
+
+def make_output(rows, classes=3):
+    """Raw head output (4 + classes, anchors) from (cx, cy, w, h, cls, score) rows"""
+    output = np.zeros((4 + classes, len(rows)), dtype=np.float32)
+    for anchor, (cx, cy, w, h, cls, score) in enumerate(rows):
+        output[:4, anchor] = (cx, cy, w, h)
+        output[4 + cls, anchor] = score
+    return output
+
+class TestLetterbox(unittest.TestCase):
+
+    def test_pads_shorter_side_centered(self):
+        image = np.full((720, 1280, 3), 255, dtype=np.uint8)
+        padded, scale, pad = letterbox(image, (640, 640))
+
+        self.assertEqual(padded.shape, (640, 640, 3))
+        self.assertEqual(scale, 0.5)
+        self.assertEqual(pad, (0, 140))
+        self.assertEqual(padded[139, 0].tolist(), [114, 114, 114])
+        self.assertEqual(padded[140, 0].tolist(), [255, 255, 255])
+
+class TestDecodePredictions(unittest.TestCase):
+
+    def test_nms_is_class_aware_and_maps_to_image(self):
+        output = make_output([
+            (100, 240, 40, 40, 0, 0.9),
+            (102, 240, 40, 40, 0, 0.8),  # overlaps the first, suppressed
+            (102, 240, 40, 40, 1, 0.7),  # same place, other class, kept
+            (300, 300, 20, 20, 2, 0.1),  # under the confidence threshold
+        ])
+        boxes = decode_predictions(output, scale=0.5, pad=(0, 140), orig_shape=(720, 1280))
+
+        self.assertEqual(boxes.cls.tolist(), [0, 1])
+        np.testing.assert_allclose(boxes.conf, [0.9, 0.7])
+        np.testing.assert_allclose(boxes.xyxy[0], [160, 160, 240, 240])
+
+    def test_no_detections(self):
+        boxes = decode_predictions(make_output([(0, 0, 1, 1, 0, 0.01)]), 1.0, (0, 0), (640, 640))
+        self.assertEqual(len(boxes), 0)
+        self.assertEqual(extract_detections(type("Result", (), {"boxes": boxes})())[0].shape, (0, 4))
+
+    def test_boxes_iterate_like_ultralytics(self):
+        boxes = Boxes(np.array([[1, 2, 3, 4], [5, 6, 7, 8]], dtype=np.float32),
+                      np.array([0.9, 0.5], dtype=np.float32), np.array([0, 2], dtype=np.float32))
+        self.assertEqual([(int(box.cls[0]), box.xyxy[0].tolist()) for box in boxes], [(0, [1, 2, 3, 4]), (2, [5, 6, 7, 8])])
+
+class TestCreateBackend(unittest.TestCase):
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_backend(Config(INFERENCE_BACKEND="tensorrt"))
+
+    def test_onnx_backend_reports_missing_dependency_or_model(self):
+        expected = ImportError if ort is None else FileNotFoundError
+        with self.assertRaises(expected):
+            create_backend(Config(INFERENCE_BACKEND="onnx", ONNX_MODEL_PATH="missing.onnx"))
+
+    def test_onnx_backend_needs_class_names(self):
+        session = MagicMock()
+        session.get_modelmeta.return_value.custom_metadata_map = {}
+        runtime = MagicMock(InferenceSession=MagicMock(return_value=session))
+        with tempfile.NamedTemporaryFile(suffix=".onnx") as model_file, patch("src.ecocart.inference.ort", runtime):
+            with self.assertRaisesRegex(ValueError, "no class names"):
+                OnnxBackend(model_file.name)
+            self.assertEqual(OnnxBackend(model_file.name, names={0: "apple"}).names, {0: "apple"})
+
+            session.get_modelmeta.return_value.custom_metadata_map = {"names": "{0: 'apple', 1: 'banana'}"}
+            self.assertEqual(OnnxBackend(model_file.name).names, {0: "apple", 1: "banana"})
+
+    @unittest.skipUnless(os.path.exists("/proc/self/maps"), "needs /proc to inspect memory mappings")
+    def test_shared_weights_predict_from_the_mapped_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = export_shared_weights("yolov8n.yaml", os.path.join(temp_dir, "yolov8n.shared.pt"))
+            model = create_backend(Config(SHARED_WEIGHTS_PATH=path))
+
+            self.assertIs(model.predictor.model.backend.model, model.model)
+            with open("/proc/self/maps") as f:
+                mapped = [line.split()[0] for line in f if line.rstrip().endswith(path)]
+            start, end = (int(address, 16) for address in mapped[0].split("-"))
+            for param in model.model.parameters():
+                self.assertTrue(start <= param.untyped_storage().data_ptr() < end)
+            self.assertEqual(len(model(np.zeros((96, 128, 3), dtype=np.uint8), imgsz=64, verbose=False)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
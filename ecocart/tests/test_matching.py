@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.matching import iou_matrix, greedy_assign, hungarian_assign, extract_detections, linear_sum_assignment
+
+def random_boxes(rng, count):
+    xy = rng.integers(0, 600, size=(count, 2))
+    wh = rng.integers(-5, 120, size=(count, 2))  # includes degenerate boxes
+    return np.hstack([xy, xy + wh])
+
+class FakeBoxes(SimpleNamespace):
+    def __len__(self):
+        return len(self.conf)
+
+class TestIoUMatrix(unittest.TestCase):
+
+    def test_matches_pairwise_calculate_iou(self):
+        rng = np.random.default_rng(7)
+        boxes_a = random_boxes(rng, 40)
+        boxes_b = np.vstack([random_boxes(rng, 30), boxes_a[:10] + 3])
+
+        matrix = iou_matrix(boxes_a, boxes_b)
+        self.assertEqual(matrix.shape, (40, 40))
+        for i, box_a in enumerate(boxes_a.tolist()):
+            for j, box_b in enumerate(boxes_b.tolist()):
+                expected = GroceryCartTracker.calculate_iou(None, box_a, box_b)
+                self.assertAlmostEqual(matrix[i, j], expected, places=12)
+
+    def test_empty_inputs(self):
+        self.assertEqual(iou_matrix(np.empty((0, 4)), [(0, 0, 1, 1)]).shape, (0, 1))
+
+class TestAssignment(unittest.TestCase):
+
+    def test_greedy_is_one_to_one(self):
+        iou = np.array([
+            [0.9, 0.6],
+            [0.8, 0.7],
+            [0.1, 0.2],
+        ])
+        rows, cols = greedy_assign(iou, 0.5)
+        self.assertEqual(sorted(zip(rows.tolist(), cols.tolist())), [(0, 0), (1, 1)])
+
+    @unittest.skipIf(linear_sum_assignment is None, "scipy not installed")
+    def test_hungarian_finds_optimal_assignment(self):
+        # Greedy takes the single best pair (0, 0) and strands row 1, the optimum pairs both rows
+        iou = np.array([
+            [0.9, 0.8],
+            [0.8, 0.0],
+        ])
+        self.assertEqual(list(zip(*greedy_assign(iou, 0.5))), [(0, 0)])
+        rows, cols = hungarian_assign(iou, 0.5)
+        self.assertEqual(list(zip(rows.tolist(), cols.tolist())), [(0, 1), (1, 0)])
+
+    @unittest.skipIf(linear_sum_assignment is not None, "scipy installed")
+    def test_hungarian_without_scipy_raises(self):
+        with self.assertRaises(ImportError):
+            hungarian_assign(np.array([[0.9]]), 0.5)
+
+    @unittest.skipIf(linear_sum_assignment is None, "scipy not installed")
+    def test_hungarian_respects_threshold(self):
+        iou = np.array([
+            [0.9, 0.0],
+            [0.0, 0.4],
+        ])
+        rows, cols = hungarian_assign(iou, 0.5)
+        self.assertEqual(list(zip(rows.tolist(), cols.tolist())), [(0, 0)])
+
+    def test_extract_detections(self):
+        boxes = FakeBoxes(
+            xyxy=np.array([[1.5, 2.5, 10.0, 20.0]]),
+            conf=np.array([0.7]),
+            cls=np.array([3.0])
+        )
+        xyxy, conf, cls = extract_detections(SimpleNamespace(boxes=boxes))
+        self.assertEqual(xyxy.shape, (1, 4))
+        self.assertEqual(cls.tolist(), [3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import time
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.pipeline import FrameQueue, EventDispatcher, StageStats, TrackerPipeline
+from src.ecocart.config import Config
+from src.ecocart.main import DetectedItem
+
+class TestFrameQueue(unittest.TestCase):
+
+    def test_drops_oldest_when_full(self):
+        frames = FrameQueue(2)
+        self.assertTrue(frames.put(1))
+        self.assertTrue(frames.put(2))
+        self.assertFalse(frames.put(3))
+
+        self.assertEqual(frames.dropped, 1)
+        self.assertEqual(frames.get(timeout=0), 2)
+        self.assertEqual(frames.get(timeout=0), 3)
+
+    def test_closed_queue_drains(self):
+        frames = FrameQueue(2)
+        frames.put(1)
+        frames.close()
+        self.assertFalse(frames.closed)
+        self.assertEqual(frames.get(), 1)
+        self.assertTrue(frames.closed)
+        self.assertIsNone(frames.get())
+
+class TestEventDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.item = DetectedItem(
+            label="apple",
+            sku="SKU00101",
+            confidence=0.8,
+            bbox=(10, 10, 50, 50),
+            last_seen=0.0
+        )
+
+    def test_submit_does_not_block_on_slow_backend(self):
+        api_client = Mock()
+        api_client.add_item.side_effect = lambda *args: time.sleep(0.2) or True
+        dispatcher = EventDispatcher(api_client, "test_cart")
+        dispatcher.start()
+
+        start = time.perf_counter()
+        for _ in range(5):
+            self.assertTrue(dispatcher.submit("add", self.item))
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        dispatcher.stop()
+        self.assertEqual(api_client.add_item.call_count, 5)
+        self.assertEqual(dispatcher.latency.count, 5)
+
+    def test_failed_remove_is_retried_until_delivered(self):
+        api_client = Mock()
+        api_client.remove_item.side_effect = [False, False, True]
+        dispatcher = EventDispatcher(api_client, "test_cart", retry_delay=0.01)
+        dispatcher.start()
+        self.assertTrue(dispatcher.submit("remove", self.item))
+
+        deadline = time.monotonic() + 2.0
+        while api_client.remove_item.call_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        dispatcher.stop()
+        self.assertEqual(api_client.remove_item.call_count, 3)
+        self.assertEqual((dispatcher.failed, len(dispatcher.retries)), (2, 0))
+
+    def test_submit_rejects_when_queue_full(self):
+        dispatcher = EventDispatcher(Mock(), "test_cart", maxsize=1)
+        self.assertTrue(dispatcher.submit("remove", self.item))
+        self.assertFalse(dispatcher.submit("remove", self.item))
+
+    def test_stage_stats_snapshot(self):
+        stats = StageStats()
+        for ms in range(1, 101):
+            stats.record(ms / 1000)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        self.assertEqual(snapshot["max_ms"], 100.0)
+        self.assertEqual(snapshot["p50_ms"], 51.0)
+        self.assertEqual(snapshot["p95_ms"], 96.0)
+        self.assertEqual(snapshot["p99_ms"], 100.0)
+
+class TestTrackerPipeline(unittest.TestCase):
+
+    def make_pipeline(self):
+        tracker = Mock(config=Config(CART_ID="test_cart"), frame_count=0)
+        tracker.should_display.return_value = True
+        return TrackerPipeline(tracker)
+
+    def test_preview_follows_capture_not_inference(self):
+        pipeline = self.make_pipeline()
+        pipeline.tracker.should_infer.side_effect = [True, False, False]
+        cap = Mock()
+        cap.read.side_effect = [(True, "f1"), (True, "f2"), (True, "f3"), (False, None)]
+
+        with patch("src.ecocart.pipeline.cv2.imshow") as imshow:
+            pipeline._capture_loop(cap)
+
+        # Capture only hands frames over, drawing happens on the main thread
+        imshow.assert_not_called()
+        pipeline.tracker.draw_annotations.assert_not_called()
+        self.assertEqual(pipeline.tracker.should_display.call_count, 3)
+        self.assertEqual(pipeline.preview, "f3")
+        self.assertEqual(pipeline.frames.get(timeout=0)[0], "f1")
+
+    def test_display_loop_shows_preview_and_stops_on_q(self):
+        pipeline = self.make_pipeline()
+        pipeline.preview = "f1"
+        pipeline._preview_ready.set()
+        inference_thread = Mock(**{"is_alive.return_value": True})
+
+        with patch("src.ecocart.pipeline.cv2.imshow") as imshow, \
+                patch("src.ecocart.pipeline.cv2.waitKey", return_value=ord("q")):
+            pipeline._display_loop(inference_thread)
+
+        pipeline.tracker.draw_annotations.assert_called_once_with("f1")
+        imshow.assert_called_once()
+        self.assertTrue(pipeline._stop.is_set())
+
+if __name__ == '__main__':
+    unittest.main()
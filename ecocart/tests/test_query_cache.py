@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.vector_db.cache import QueryCache
+from src.vector_db import StubBackend
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalized_queries_share_entry(self):
+        cache = QueryCache()
+        compute = Mock(return_value="info")
+        self.assertEqual(cache.get_or_compute("Apple", "v1", compute), "info")
+        self.assertEqual(cache.get_or_compute("  apple ", "v1", compute), "info")
+        compute.assert_called_once()
+
+        cache.get_or_compute("apple", "v2", compute)
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(cache.stats()["hit_rate"], round(1 / 3, 3))
+
+    def test_lru_eviction_and_ttl(self):
+        cache = QueryCache(max_entries=2, ttl=0.05)
+        backend = StubBackend()
+        for query in ("apple", "orange", "carrot", "apple"):
+            cache.get_or_compute(query, "v1", lambda: backend.generate(query, []))
+        self.assertEqual(backend.calls, 4)
+
+        time.sleep(0.06)
+        cache.get_or_compute("apple", "v1", lambda: backend.generate("apple", []))
+        self.assertEqual(backend.calls, 5)
+
+    def test_disk_tier_survives_restart(self):
+        QueryCache(self.path).get_or_compute("apple", "v1", lambda: "info")
+
+        cache = QueryCache(self.path)
+        compute = Mock(return_value="fresh")
+        self.assertEqual(cache.get_or_compute("apple", "v1", compute), "info")
+        compute.assert_not_called()
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = QueryCache()
+        backend = StubBackend(delay=0.1)
+        results = []
+
+        def worker():
+            results.append(cache.get_or_compute("apple", "v1", lambda: backend.generate("apple", [])))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(cache.stats()["coalesced"] + cache.stats()["memory_hits"], 7)
+
+    def test_errors_are_not_cached(self):
+        cache = QueryCache()
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("apple", "v1", Mock(side_effect=RuntimeError("LLM down")))
+        self.assertEqual(cache.get_or_compute("apple", "v1", lambda: "info"), "info")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.roi import RegionOfInterest
+
+class TestRegionOfInterest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = np.arange(720 * 1280 * 3, dtype=np.uint32).reshape(720, 1280, 3).astype(np.uint8)
+
+    def test_disabled_roi_passes_frames_through(self):
+        roi = RegionOfInterest()
+        self.assertFalse(roi.enabled)
+        self.assertIs(roi.apply(self.frame), self.frame)
+        boxes = np.array([[1, 2, 3, 4]], dtype=np.float32)
+        self.assertIs(roi.to_frame(boxes), boxes)
+
+    def test_crop_is_a_view_and_boxes_map_back(self):
+        roi = RegionOfInterest(box=(160, 60, 1120, 700))
+        cropped = roi.apply(self.frame)
+
+        self.assertEqual(cropped.shape, (640, 960, 3))
+        self.assertTrue(np.shares_memory(cropped, self.frame))
+        mapped = roi.to_frame(np.array([[0, 0, 10, 20]], dtype=np.float32))
+        self.assertEqual(mapped.tolist(), [[160, 60, 170, 80]])
+
+    def test_box_is_clipped_to_frame(self):
+        roi = RegionOfInterest(box=(-50, 600, 2000, 900))
+        self.assertEqual(roi.crop(self.frame).shape, (120, 1280, 3))
+        self.assertEqual(roi.offset.tolist(), [0, 600, 0, 600])
+
+    def test_polygon_masks_pixels_outside(self):
+        frame = np.full((100, 100, 3), 255, dtype=np.uint8)
+        roi = RegionOfInterest(polygon=[(10, 10), (60, 10), (10, 60)])
+        masked = roi.apply(frame)
+
+        self.assertEqual(roi.box, (10, 10, 61, 61))
+        self.assertEqual(masked[2, 2].tolist(), [255, 255, 255])
+        self.assertEqual(masked[48, 48].tolist(), [0, 0, 0])
+        self.assertEqual(frame[58, 58].tolist(), [255, 255, 255])
+
+    def test_prepare_builds_mask_before_first_frame(self):
+        roi = RegionOfInterest(box=(0, 0, 200, 200), polygon=[(10, 10), (60, 10), (10, 60)])
+        roi.prepare(width=100, height=80)
+        prepared = roi.prepared
+
+        self.assertEqual(prepared.mask.shape, (80, 100))
+        roi.apply(np.full((80, 100, 3), 255, dtype=np.uint8))
+        self.assertIs(roi.prepared, prepared)
+
+    def test_box_outside_frame_falls_back_to_full_frame(self):
+        roi = RegionOfInterest(box=(2000, 100, 2400, 500))
+        with self.assertLogs("src.ecocart.roi", "WARNING"):
+            cropped = roi.apply(self.frame)
+        self.assertEqual(cropped.shape, self.frame.shape)
+        self.assertEqual(roi.offset.tolist(), [0, 0, 0, 0])
+
+    def test_offset_is_fixed_once_prepared(self):
+        roi = RegionOfInterest(box=(160, 60, 1120, 700))
+        roi.prepare(width=1280, height=720)
+        offset = roi.offset
+        for _ in range(3):
+            roi.crop(self.frame)
+        self.assertIs(roi.offset, offset)
+        self.assertEqual(offset.tolist(), [160, 60, 160, 60])
+
+if __name__ == '__main__':
+    unittest.main()
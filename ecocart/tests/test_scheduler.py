@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.config import Config
+from src.ecocart.scheduler import FrameScheduler
+
+def static_frame():
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[60:180, 80:240] = 120
+    return frame
+
+def moving_frame(step):
+    frame = static_frame()
+    x = (step * 30) % 240
+    frame[80:160, x:x + 80] = 255
+    return frame
+
+class TestFrameScheduler(unittest.TestCase):
+
+    def test_fixed_skip(self):
+        scheduler = FrameScheduler.from_config(Config(FRAME_SKIP=3))
+        decisions = [scheduler.should_infer(static_frame()) for _ in range(9)]
+        self.assertEqual(decisions, [False, False, True] * 3)
+
+    def test_static_scene_backs_off_to_max_skip(self):
+        scheduler = FrameScheduler(adaptive=True, min_skip=1, max_skip=5)
+        decisions = [scheduler.should_infer(static_frame()) for _ in range(60)]
+
+        self.assertTrue(decisions[0])
+        self.assertEqual(scheduler.interval, 5)
+        self.assertLessEqual(sum(decisions), 16)
+        gaps = np.diff(np.flatnonzero(decisions))
+        self.assertLessEqual(gaps.max(), 5)
+        self.assertGreater(scheduler.get_stats()["saved_vs_fixed"], 0)
+
+    def test_motion_ramps_up_to_every_frame(self):
+        scheduler = FrameScheduler(adaptive=True, min_skip=1, max_skip=10)
+        for _ in range(60):
+            scheduler.should_infer(static_frame())
+        self.assertEqual(scheduler.interval, 10)
+
+        decisions = [scheduler.should_infer(moving_frame(step)) for step in range(10)]
+        self.assertEqual(decisions, [True] * 10)
+        self.assertEqual(scheduler.interval, 1)
+
+    def test_min_skip_caps_rate_during_motion(self):
+        scheduler = FrameScheduler(adaptive=True, min_skip=2, max_skip=10)
+        decisions = [scheduler.should_infer(moving_frame(step)) for step in range(12)]
+        self.assertEqual(sum(decisions), 6)
+
+if __name__ == '__main__':
+    unittest.main()
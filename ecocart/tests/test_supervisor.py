@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import time
+import urllib.request
+from collections import Counter
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.supervisor import FleetSupervisor, MetricsReporter, WorkerSpec, load_fleet, plan_workers
+from src.ecocart.config import Config
+
+def crashing_worker(spec, config, cart_overrides, reports):
+    reports.put({"worker": spec.name, "pid": os.getpid(), "time": time.time(), "carts": {
+        cart_id: {"fps": 10.0, "inference_fps": 5.0, "events_per_min": 2.0} for cart_id, _ in spec.carts
+    }})
+    sys.exit(3)
+
+def finishing_worker(spec, config, cart_overrides, reports):
+    pass
+
+def sleeping_worker(spec, config, cart_overrides, reports):
+    time.sleep(30)
+
+class TestWorkerPlan(unittest.TestCase):
+
+    def test_groups_share_a_worker_and_cores_go_round_robin(self):
+        carts = [
+            {"cart_id": "a", "source": 0},
+            {"cart_id": "b", "source": 1, "group": "lane"},
+            {"cart_id": "c", "source": "c.mp4", "group": "lane"},
+            {"cart_id": "d", "source": 2},
+        ]
+        workers = plan_workers(carts, cores=[0, 1, 2], cores_per_worker=2)
+
+        self.assertEqual([worker.name for worker in workers], ["a", "lane", "d"])
+        self.assertEqual(workers[1].carts, [("b", 1), ("c", "c.mp4")])
+        self.assertEqual([worker.cores for worker in workers], [[0, 1], [2, 0], [1, 2]])
+
+    def test_load_fleet_rejects_duplicate_carts(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as f:
+            f.write("carts:\n  - {cart_id: a, source: 0}\n  - {cart_id: a, source: 1}\n")
+        self.addCleanup(os.remove, f.name)
+        with self.assertRaises(ValueError):
+            load_fleet(f.name, cores=[0])
+
+class TestMetricsReporter(unittest.TestCase):
+
+    def test_rates_since_previous_sample(self):
+        tracker = SimpleNamespace(frame_count=0, cart_events=Counter(), cart_inventory={})
+        stream = SimpleNamespace(cart_id="a", tracker=tracker, processed=0, dropped=0, alive=True)
+        reporter = MetricsReporter("w", SimpleNamespace(streams=[stream]), None, interval=1.0)
+        reporter.sample(now=100.0)
+
+        tracker.frame_count, stream.processed = 60, 20
+        tracker.cart_events.update(add=3, remove=1)
+        metrics = reporter.sample(now=102.0)["carts"]["a"]
+
+        self.assertEqual(metrics["fps"], 30.0)
+        self.assertEqual(metrics["inference_fps"], 10.0)
+        self.assertEqual(metrics["events_per_min"], 120.0)
+        self.assertEqual((metrics["adds"], metrics["removes"]), (3, 1))
+
+class TestFleetSupervisor(unittest.TestCase):
+
+    def make_supervisor(self, target, **overrides):
+        config = Config(WORKER_RESTART_DELAY=0.2, WORKER_RESTART_MAX_DELAY=1.0, **overrides)
+        workers = [WorkerSpec("w1", [("a", 0)], []), WorkerSpec("w2", [("b", 1)], [])]
+        supervisor = FleetSupervisor(workers, config, target=target, start_method="fork")
+        self.addCleanup(supervisor.shutdown, 2.0)
+        return supervisor
+
+    def wait_for(self, supervisor, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            supervisor.poll()
+            if condition():
+                return
+            time.sleep(0.02)
+        self.fail("condition not reached")
+
+    def test_crashed_workers_restart_with_backoff(self):
+        supervisor = self.make_supervisor(crashing_worker)
+        for handle in supervisor.workers:
+            supervisor.start_worker(handle)
+        handle = supervisor.workers[0]
+
+        self.wait_for(supervisor, lambda: handle.state == "restarting")
+        self.assertEqual(handle.exitcode, 3)
+        self.assertAlmostEqual(handle.next_start - time.monotonic(), 0.2, delta=0.1)
+
+        self.wait_for(supervisor, lambda: handle.restarts == 1 and handle.state == "restarting")
+        self.assertAlmostEqual(handle.next_start - time.monotonic(), 0.4, delta=0.1)
+
+    def test_clean_exit_is_not_restarted(self):
+        supervisor = self.make_supervisor(finishing_worker)
+        for handle in supervisor.workers:
+            supervisor.start_worker(handle)
+
+        self.wait_for(supervisor, lambda: all(handle.state == "stopped" for handle in supervisor.workers))
+        self.assertEqual([handle.restarts for handle in supervisor.workers], [0, 0])
+
+    def test_status_endpoint_aggregates_cart_metrics(self):
+        supervisor = self.make_supervisor(crashing_worker)
+        port = supervisor.serve_status(0)
+        for handle in supervisor.workers:
+            supervisor.start_worker(handle)
+        self.wait_for(supervisor, lambda: len(supervisor.cart_metrics) == 2)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/status", timeout=2) as response:
+            status = json.loads(response.read())
+        self.assertEqual(status["carts"]["b"]["worker"], "w2")
+        self.assertEqual(status["totals"]["fps"], 20.0)
+        self.assertEqual(status["totals"]["events_per_min"], 4.0)
+        self.assertEqual(set(status["workers"]), {"w1", "w2"})
+
+    def test_shutdown_stops_running_workers(self):
+        supervisor = self.make_supervisor(sleeping_worker)
+        port = supervisor.serve_status(0)
+        for handle in supervisor.workers:
+            supervisor.start_worker(handle)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as response:
+            self.assertEqual(response.status, 200)
+        supervisor.shutdown(timeout=2.0)
+        self.assertEqual([handle.state for handle in supervisor.workers], ["stopped", "stopped"])
+        self.assertTrue(all(handle.exitcode != 0 for handle in supervisor.workers))
+
+if __name__ == '__main__':
+    unittest.main()
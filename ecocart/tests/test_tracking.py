@@ -0,0 +1,180 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ecocart.main import GroceryCartTracker
+from src.ecocart.config import Config
+from src.ecocart.catalog import SkuCatalog
+from src.ecocart.roi import RegionOfInterest
+from src.ecocart.tracking import MultiObjectTracker
+
+class FakeBoxes(SimpleNamespace):
+    def __len__(self):
+        return len(self.conf)
+
+def make_results(boxes, confs, classes):
+    return SimpleNamespace(boxes=FakeBoxes(
+        xyxy=np.asarray(boxes, dtype=np.float32),
+        conf=np.asarray(confs, dtype=np.float32),
+        cls=np.asarray(classes, dtype=np.float32)
+    ))
+
+class TestMultiObjectTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = MultiObjectTracker(iou_threshold=0.3, confirm_hits=3, max_age=1.0)
+
+    def test_ids_survive_detection_reordering(self):
+        boxes = np.array([[10, 10, 50, 50], [100, 100, 150, 150]])
+        self.tracker.update(boxes, [0.9, 0.9], [0, 0], 0.0)
+        ids = {tuple(track.box.tolist()): tid for tid, track in self.tracker.tracks.items()}
+
+        confirmed = []
+        for step in range(1, 4):
+            shifted = boxes[::-1] + step
+            confirmed += self.tracker.update(shifted, [0.9, 0.9], [0, 0], step * 0.1)[0]
+
+        self.assertEqual(len(self.tracker.tracks), 2)
+        self.assertEqual(sorted(track.track_id for track in confirmed), sorted(ids.values()))
+        self.assertEqual(self.tracker.tracks[ids[(10.0, 10.0, 50.0, 50.0)]].box.tolist(), [13, 13, 53, 53])
+
+    def test_constant_velocity_follows_fast_motion(self):
+        # After a slow start the box moves 30 px per frame, too far for IoU with the last box alone
+        for smoothing, expected_ids in ((0.5, 1), (0.0, 12)):
+            tracker = MultiObjectTracker(iou_threshold=0.3, max_age=1.0, velocity_smoothing=smoothing)
+            x = 0
+            for frame in range(15):
+                x += 10 if frame < 4 else 30
+                tracker.update([[x, 0, x + 40, 40]], [0.9], [0], frame * 0.1)
+            self.assertEqual(tracker.next_track_id - 1, expected_ids)
+
+    def test_low_confidence_only_extends_tracks(self):
+        self.tracker.update([[0, 0, 40, 40]], [0.9], [0], 0.0)
+        self.tracker.update([[1, 1, 41, 41], [200, 200, 240, 240]], [0.2, 0.2], [0, 0], 0.1)
+
+        self.assertEqual(list(self.tracker.tracks), [1])
+        self.assertEqual(self.tracker.tracks[1].hits, 2)
+
+    def test_class_confidence_sets_per_class_threshold(self):
+        tracker = MultiObjectTracker(class_confidence=np.array([0.8, 0.3], dtype=np.float32))
+        tracker.update([[0, 0, 40, 40], [100, 100, 140, 140]], [0.5, 0.5], [0, 1], 0.0)
+        self.assertEqual([track.cls for track in tracker.tracks.values()], [1])
+
+    def test_classes_do_not_match_each_other(self):
+        self.tracker.update([[0, 0, 40, 40]], [0.9], [0], 0.0)
+        self.tracker.update([[0, 0, 40, 40]], [0.9], [1], 0.1)
+        self.assertEqual(sorted(track.cls for track in self.tracker.tracks.values()), [0, 1])
+
+    def test_stale_tentative_tracks_are_pruned(self):
+        self.tracker.update([[0, 0, 40, 40], [100, 100, 140, 140]], [0.9, 0.9], [0, 0], 0.0)
+        for step in range(1, 4):
+            self.tracker.update([[0, 0, 40, 40]], [0.9], [0], step * 0.1)
+
+        # The one-off box is gone after two misses, well before max_age, and was never reported
+        self.assertEqual(list(self.tracker.tracks), [1])
+        self.assertTrue(self.tracker.tracks[1].confirmed)
+
+    def test_track_state_is_compact(self):
+        boxes = np.array([[0, 0, 40, 40]], dtype=np.float64)
+        self.tracker.update(boxes, [0.9], [0], 0.0)
+        track = self.tracker.tracks[1]
+        self.assertFalse(hasattr(track, "__dict__"))
+        self.assertFalse(np.shares_memory(track.box, boxes))
+
+        box = track.box
+        self.tracker.update([[2, 2, 42, 42]], [0.9], [0], 0.1)
+        self.assertIs(track.box, box)
+        self.assertEqual(box.tolist(), [2, 2, 42, 42])
+
+    def test_tracks_expire_after_max_age(self):
+        self.tracker.update([[0, 0, 40, 40]], [0.9], [0], 0.0)
+        _, expired = self.tracker.update(np.empty((0, 4)), [], [], 1.5)
+        self.assertEqual([track.track_id for track in expired], [1])
+        self.assertEqual(self.tracker.tracks, {})
+
+class TestProcessDetections(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_sku_map = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+        json.dump({"apple": {"sku": "SKU00101", "price": 1.50}}, self.temp_sku_map)
+        self.temp_sku_map.close()
+
+        def load_dependencies(tracker):
+            tracker.catalog = SkuCatalog(self.temp_sku_map.name)
+            tracker.model = SimpleNamespace(names={0: "apple", 1: "person"})
+            tracker.api_client = Mock()
+
+        config = Config(CART_ID="test_cart", DISPLAY_WINDOW=False, STABILIZATION_FRAMES=3, REMOVAL_TIMEOUT=1)
+        with patch.object(GroceryCartTracker, "load_dependencies", load_dependencies):
+            self.tracker = GroceryCartTracker(config)
+
+    def tearDown(self):
+        os.unlink(self.temp_sku_map.name)
+
+    def test_cart_keyed_by_track_without_churn(self):
+        apples = [[10, 10, 50, 50], [100, 100, 150, 150]]
+        for frame in range(6):
+            # Detection order flips every frame, a person box is ignored
+            order = apples if frame % 2 else apples[::-1]
+            boxes = [[x + frame for x in box] for box in order] + [[0, 0, 5, 5]]
+            self.tracker.process_detections(make_results(boxes, [0.9, 0.8, 0.9], [0, 0, 1]), frame * 0.1)
+
+        self.assertEqual(self.tracker.api_client.add_item.call_count, 2)
+        self.tracker.api_client.remove_item.assert_not_called()
+        self.assertEqual(sorted(self.tracker.cart_inventory), [1, 2])
+        self.assertEqual(self.tracker.cart_inventory[1].track_id, 1)
+        self.assertEqual(self.tracker.cart_inventory[1].last_seen, 0.5)
+
+    def test_expired_track_removes_item(self):
+        for frame in range(3):
+            self.tracker.process_detections(make_results([[10, 10, 50, 50]], [0.9], [0]), frame * 0.1)
+        self.tracker.api_client.remove_item.return_value = False
+        self.tracker.process_detections(make_results([], [], []), 2.0)
+        self.assertIn(1, self.tracker.cart_inventory)
+
+        self.tracker.api_client.remove_item.return_value = True
+        self.tracker.process_detections(make_results([], [], []), 2.1)
+        self.assertEqual(self.tracker.cart_inventory, {})
+        self.assertEqual(self.tracker.api_client.remove_item.call_count, 2)
+
+    def test_unmapped_classes_reported_at_load(self):
+        with patch("src.ecocart.main.get_catalog", return_value=self.tracker.catalog), \
+                patch("src.ecocart.main.create_api_client"), self.assertLogs("src.ecocart.main", "WARNING") as logs:
+            GroceryCartTracker.load_dependencies(self.tracker)
+        self.assertIn("1 of 2 model classes have no SKU and are ignored: ['person']", logs.output[0])
+
+    def test_class_table_follows_catalog_reload(self):
+        self.tracker.process_detections(make_results([[0, 0, 5, 5]], [0.9], [1]), 0.0)
+        self.assertEqual(self.tracker.frame_detections[2].tolist(), [])
+
+        with open(self.temp_sku_map.name, 'w') as f:
+            json.dump({"apple": {"sku": "SKU00101"}, "person": {"sku": "SKU00999"}}, f)
+        self.tracker.catalog.reload()
+        self.tracker.process_detections(make_results([[0, 0, 5, 5]], [0.9], [1]), 0.1)
+        self.assertEqual(self.tracker.frame_detections[2].tolist(), [1])
+        self.assertEqual(self.tracker.class_table.item(1).sku, "SKU00999")
+
+    def test_infer_keeps_low_confidence_boxes(self):
+        self.tracker.model = Mock(return_value=["result"])
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        self.assertEqual(self.tracker.infer(frame), "result")
+        self.tracker.model.assert_called_once_with(frame, imgsz=640, conf=0.1, verbose=False)
+
+    def test_roi_boxes_mapped_to_frame(self):
+        self.tracker.roi = RegionOfInterest(box=(100, 50, 600, 400))
+        self.tracker.roi.crop(np.zeros((480, 640, 3), dtype=np.uint8))
+        for frame in range(3):
+            self.tracker.process_detections(make_results([[10, 10, 50, 50]], [0.9], [0]), frame * 0.1)
+        self.assertEqual(self.tracker.cart_inventory[1].bbox, (110, 60, 150, 100))
+
+if __name__ == '__main__':
+    unittest.main()